@@ -3,39 +3,187 @@ from __future__ import annotations
 import json
 import random
 import re
+import threading
 from hashlib import md5
 
 from anthropic import Anthropic
 
+from app.agents.passage_selector import PassageSelector
 from app.config import settings
+from app.services.extraction_cache import get_extraction_cache
+from app.services.llm_governor import get_llm_governor
+from app.services.prompt_cache import cache_headers, cacheable_system, usage_breakdown
+
+ANALYSIS_MODEL = "claude-3-5-sonnet-20240620"
+# Bump whenever the extraction prompt or its post-processing changes; cached extractions are keyed by it.
+PROMPT_VERSION = "extract-v2"
+
+_BILLIONS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:billion|bn)", re.I)
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+
+def extract_figures(text: str) -> tuple[float | None, float | None]:
+    """First market-size (billions) and percentage figures in `text`."""
+    billions = _BILLIONS.search(text)
+    percent = _PERCENT.search(text)
+    return (float(billions.group(1)) if billions else None, float(percent.group(1)) if percent else None)
+
+
+EXTRACTION_KEYS = (
+    "market_size_usd_billion, cagr_percent, drivers (array), restraints (array), trends (array), "
+    "key_companies (array), regulatory_notes (array), confidence_score"
+)
+# Identical bytes on every extraction call (single or batched, any report), so the provider can serve it from
+# its prompt cache; everything call-specific goes in the user message after it.
+EXTRACTION_INSTRUCTIONS = (
+    "You extract market intelligence from research documents. "
+    f"For each document, extract a strict JSON object with keys: {EXTRACTION_KEYS}. "
+    "When the request contains a single text, return only that JSON object. When it contains several "
+    '<document index="N"> elements, return only a JSON array with exactly one object per document, in document '
+    "order, each including the document's index under the key index."
+)
+OUTPUT_TOKENS_PER_DOCUMENT = 600
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
 
 
 class AnalysisAgent:
-    def __init__(self) -> None:
-        self.client = Anthropic(api_key=settings.anthropic_api_key) if settings.anthropic_api_key else None
+    def __init__(self, client=None) -> None:
+        if client is None and settings.anthropic_api_key:
+            # Retries and backoff are owned by the LLM governor.
+            client = Anthropic(api_key=settings.anthropic_api_key, max_retries=0)
+        self.client = client
+        self.cache = get_extraction_cache()
+        self.system = cacheable_system(EXTRACTION_INSTRUCTIONS)
+        # Per-report counts; one agent is created for each report run.
+        self.stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "llm_calls": 0,
+            "batch_calls": 0,
+            "batched_documents": 0,
+            "batch_fallbacks": 0,
+            "input_tokens": 0,
+            "cached_input_tokens": 0,
+            "cache_write_input_tokens": 0,
+            "output_tokens": 0,
+        }
+        self._stats_lock = threading.Lock()
 
     def run(self, text: str, industry: str, geography: str) -> dict:
+        return self.run_batch([text], industry, geography)[0]
+
+    def run_batch(self, texts: list[str], industry: str, geography: str) -> list[dict]:
+        """
+        Extract every document, packing cache misses into as few requests as the token budget allows. Documents a
+        batch response does not cover (or a batch that fails to parse) are retried with single-document calls.
+        """
+        results: list[dict | None] = [None] * len(texts)
         if self.client:
-            try:
-                prompt = (
-                    "Extract a strict JSON object with keys: market_size_usd_billion, cagr_percent, "
-                    "drivers (array), restraints (array), trends (array), key_companies (array), "
-                    "regulatory_notes (array), confidence_score. "
-                    f"Industry: {industry}; Geography: {geography}; Text: {text[:6000]}"
-                )
-                msg = self.client.messages.create(
-                    model="claude-3-5-sonnet-20240620",
-                    max_tokens=600,
-                    temperature=0.1,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                content = "".join(block.text for block in msg.content if hasattr(block, "text"))
-                parsed = json.loads(content)
-                return self._normalize(parsed)
-            except Exception:
-                pass
-
-        return self._heuristic_extract(text, industry, geography)
+            pending: list[tuple[int, str, str]] = []
+            selector = PassageSelector(industry, geography) if settings.analysis_passage_selection else None
+            budget_chars = settings.analysis_passage_budget_tokens * 4
+            for idx, text in enumerate(texts):
+                excerpt = selector.select(text, budget_chars) if selector else text[:budget_chars]
+                key = self.cache.key_for(excerpt, industry, geography, ANALYSIS_MODEL, PROMPT_VERSION)
+                cached = self.cache.get(key)
+                self._count("cache_hits" if cached is not None else "cache_misses")
+                if cached is not None:
+                    results[idx] = cached
+                else:
+                    pending.append((idx, excerpt, key))
+
+            for batch in self._pack(pending):
+                extracted = self._extract_batch(batch, industry, geography) if len(batch) > 1 else {}
+                for idx, excerpt, key in batch:
+                    parsed = extracted.get(idx)
+                    if parsed is None:
+                        if len(batch) > 1:
+                            self._count("batch_fallbacks")
+                        parsed = self._extract_single(excerpt, industry, geography)
+                    if parsed is not None:
+                        # Only model output is cached; heuristic fallbacks are cheap and must not be pinned.
+                        self.cache.put(key, parsed)
+                        results[idx] = parsed
+
+        return [
+            result if result is not None else self._heuristic_extract(text, industry, geography)
+            for result, text in zip(results, texts)
+        ]
+
+    def _pack(self, pending: list[tuple[int, str, str]]) -> list[list[tuple[int, str, str]]]:
+        """Greedy packing in arrival order under the per-request document and input-token limits."""
+        batches: list[list[tuple[int, str, str]]] = []
+        current: list[tuple[int, str, str]] = []
+        tokens = 0
+        for item in pending:
+            cost = estimate_tokens(item[1])
+            full = len(current) >= settings.analysis_batch_max_documents
+            if current and (full or tokens + cost > settings.analysis_batch_max_input_tokens):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(item)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _extract_single(self, excerpt: str, industry: str, geography: str) -> dict | None:
+        prompt = f"Industry: {industry}; Geography: {geography}; Text: {excerpt}"
+        try:
+            return self._normalize(json.loads(self._complete(prompt, OUTPUT_TOKENS_PER_DOCUMENT)))
+        except Exception:
+            return None
+
+    def _extract_batch(self, batch: list[tuple[int, str, str]], industry: str, geography: str) -> dict[int, dict]:
+        documents = "".join(
+            f'<document index="{position}">\n{excerpt}\n</document>\n' for position, (_, excerpt, _) in enumerate(batch)
+        )
+        prompt = f"Industry: {industry}; Geography: {geography}; Documents: {len(batch)}\n\n{documents}"
+        self._count("batch_calls")
+        self._count("batched_documents", len(batch))
+        try:
+            content = self._complete(prompt, min(8192, OUTPUT_TOKENS_PER_DOCUMENT * len(batch)))
+            items = json.loads(content[content.index("[") : content.rindex("]") + 1])
+        except Exception:
+            return {}
+        if not isinstance(items, list):
+            return {}
+
+        extracted: dict[int, dict] = {}
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            index = item.pop("index", position)
+            if isinstance(index, int) and 0 <= index < len(batch) and batch[index][0] not in extracted:
+                extracted[batch[index][0]] = self._normalize(item)
+        return extracted
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        self._count("llm_calls")
+        msg = get_llm_governor().call(
+            "anthropic",
+            ANALYSIS_MODEL,
+            lambda: self.client.messages.create(
+                model=ANALYSIS_MODEL,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                system=self.system,
+                messages=[{"role": "user", "content": prompt}],
+                extra_headers=cache_headers(),
+            ),
+            caller="analysis",
+            tokens=estimate_tokens(EXTRACTION_INSTRUCTIONS + prompt) + max_tokens,
+        )
+        for name, amount in usage_breakdown(getattr(msg, "usage", None)).items():
+            self._count(name, amount)
+        return "".join(block.text for block in msg.content if hasattr(block, "text"))
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
 
     def _normalize(self, payload: dict) -> dict:
         payload.setdefault("drivers", [])
@@ -47,11 +195,10 @@ class AnalysisAgent:
         return payload
 
     def _heuristic_extract(self, text: str, industry: str, geography: str) -> dict:
-        numbers = re.findall(r"(\d+(?:\.\d+)?)\s*(?:billion|bn)", text.lower())
-        percents = re.findall(r"(\d+(?:\.\d+)?)\s*%", text)
+        market, percent = extract_figures(text)
 
-        base_market = float(numbers[0]) if numbers else round(random.uniform(20, 220), 1)
-        cagr = float(percents[0]) if percents else round(random.uniform(4.0, 14.0), 1)
+        base_market = market if market is not None else round(random.uniform(20, 220), 1)
+        cagr = percent if percent is not None else round(random.uniform(4.0, 14.0), 1)
 
         return {
             "market_size_usd_billion": base_market,
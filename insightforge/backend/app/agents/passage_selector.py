@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import re
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+_CURRENCY = re.compile(r"(?:[$€£¥]|\b(?:usd|eur|gbp|inr|jpy|cny)\b)\s*\d|\d\s*(?:billion|million|trillion|bn|mn)\b", re.I)
+_PERCENT = re.compile(r"\d\s*(?:%|percent\b|per cent\b)", re.I)
+_MARKET_TERMS = re.compile(r"\b(?:cagr|market size|market value|valued at|revenue|forecast|growth rate|share)\b", re.I)
+# Drivers, restraints, trends and competitors are extracted too, and they rarely come with figures.
+_QUALITATIVE_TERMS = re.compile(
+    r"\b(?:driv(?:en|ers?|ing)|demand|adoption|regulat\w*|polic(?:y|ies)|mandates?|incentives?|subsid\w*|"
+    r"challenges?|restrain\w*|barriers?|constraints?|trends?|emerging|competit\w*|players?|leaders?|"
+    r"acqui\w*|partnerships?|launch\w*|investments?)\b",
+    re.I,
+)
+SEPARATOR = " … "
+
+
+class PassageSelector:
+    """
+    Picks the parts of a document worth sending to the extraction model. The text is cut into sentence-aligned
+    windows, each scored by the density of figures (currency amounts, percentages, bare numbers), market and
+    driver/restraint/trend vocabulary and industry/geography terms; the best windows are packed into the budget
+    and re-joined in document order. Windows with no signal at all are never sent, and documents that already
+    fit are returned unchanged.
+    """
+
+    def __init__(self, industry: str, geography: str, window_chars: int = 400) -> None:
+        self.terms = {t for t in f"{industry} {geography}".lower().split() if len(t) > 2}
+        self.window_chars = window_chars
+
+    def windows(self, text: str) -> list[str]:
+        windows: list[str] = []
+        current = ""
+        for sentence in _SENTENCE_BREAK.split(text):
+            # Very long "sentences" (tables, run-on navigation) are cut so one window cannot eat the budget.
+            while len(sentence) > self.window_chars:
+                head, sentence = sentence[: self.window_chars], sentence[self.window_chars :]
+                if current:
+                    windows.append(current)
+                    current = ""
+                windows.append(head)
+            if current and len(current) + len(sentence) + 1 > self.window_chars:
+                windows.append(current)
+                current = ""
+            current = f"{current} {sentence}" if current else sentence
+        if current:
+            windows.append(current)
+        return windows
+
+    def score(self, window: str) -> float:
+        lowered = window.lower()
+        signal = (
+            4.0 * len(_CURRENCY.findall(window))
+            + 3.0 * len(_PERCENT.findall(window))
+            + 2.0 * len(_MARKET_TERMS.findall(window))
+            + 1.0 * len(_QUALITATIVE_TERMS.findall(window))
+            + 0.5 * len(_NUMBER.findall(window))
+            + 1.0 * sum(lowered.count(term) for term in self.terms)
+        )
+        # Per 100 characters, so a short dense window beats a long one with the same hits.
+        return signal * 100.0 / max(len(window), 100)
+
+    def select(self, text: str, budget_chars: int) -> str:
+        if len(text) <= budget_chars:
+            return text
+        windows = self.windows(text)
+        scored = [(self.score(w), -idx, idx) for idx, w in enumerate(windows)]
+        chosen: list[int] = []
+        used = 0
+        for score, _, idx in sorted(scored, reverse=True):
+            if score <= 0 and chosen:
+                break
+            cost = len(windows[idx]) + len(SEPARATOR)
+            if used + cost > budget_chars:
+                continue
+            chosen.append(idx)
+            used += cost
+        if not chosen:
+            return text[:budget_chars]
+        chosen.sort()
+        parts = [windows[chosen[0]]]
+        for prev, idx in zip(chosen, chosen[1:]):
+            # Adjacent windows are continuous text; only real gaps are marked.
+            parts.append((" " if idx == prev + 1 else SEPARATOR) + windows[idx])
+        return "".join(parts)
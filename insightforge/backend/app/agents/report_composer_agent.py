@@ -6,11 +6,12 @@ from datetime import datetime
 from openai import OpenAI
 
 from app.config import settings
+from app.services.llm_governor import get_llm_governor
 
 
 class ReportComposerAgent:
     def __init__(self) -> None:
-        self.openai_client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.openai_client = OpenAI(api_key=settings.openai_api_key, max_retries=0) if settings.openai_api_key else None
 
     def run(
         self,
@@ -211,13 +212,19 @@ class ReportComposerAgent:
         )
         if self.openai_client:
             try:
-                response = self.openai_client.responses.create(
-                    model="gpt-4o-mini",
-                    input=(
-                        "Rewrite this as a concise, consulting-grade executive summary bullet (max 35 words): "
-                        + executive_note
+                response = get_llm_governor().call(
+                    "openai",
+                    "gpt-4o-mini",
+                    lambda: self.openai_client.responses.create(
+                        model="gpt-4o-mini",
+                        input=(
+                            "Rewrite this as a concise, consulting-grade executive summary bullet (max 35 words): "
+                            + executive_note
+                        ),
+                        max_output_tokens=80,
                     ),
-                    max_output_tokens=80,
+                    caller="composer",
+                    tokens=len(executive_note) // 4 + 100,
                 )
                 executive_note = response.output_text.strip() or executive_note
             except Exception:
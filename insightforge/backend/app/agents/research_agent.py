@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import math
 import re
-from datetime import datetime
-from urllib.parse import parse_qs, unquote, urlparse
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 from openai import OpenAI
 
+from app.agents.source_ranker import SourceRanker
+from app.agents.search_budget import FanOutBudget, SectionBudget, engine_name
 from app.config import settings
+from app.services.async_runtime import engine_semaphore, get_async_http_client, in_event_loop, loop_resources, run_sync
+from app.services.engine_health import get_engine_health
+from app.services.http_client import get_search_http_client
+from app.services.llm_governor import get_llm_governor
+from app.services.search_cache import get_search_cache
+from app.utils.domain_matcher import DomainFlag, classify_host
+from app.utils.url_canonical import canonical_key, clean_url
 
 
 CURATED_FALLBACK_LINKS = [
@@ -25,52 +39,6 @@ CURATED_FALLBACK_LINKS = [
     "https://www.sec.gov/edgar/searchedgar/companysearch",
 ]
 
-BLOCKED_DOMAINS = {
-    "youtube.com",
-    "facebook.com",
-    "instagram.com",
-    "tiktok.com",
-    "x.com",
-    "twitter.com",
-    "linkedin.com",
-    "pinterest.com",
-    "reddit.com",
-}
-
-AUTHORITY_HINTS = [
-    ".gov",
-    "worldbank",
-    "oecd",
-    "imf",
-    "europa",
-    "un",
-    "statista",
-    "mckinsey",
-    "deloitte",
-    "pwc",
-    "fitch",
-    "gartner",
-    "bloomberg",
-    "reuters",
-]
-
-STRICT_AUTHORITY_DOMAINS = [
-    ".gov",
-    "oecd.org",
-    "worldbank.org",
-    "imf.org",
-    "europa.eu",
-    "europa.ec",
-    "un.org",
-    "unctad.org",
-    "unido.org",
-    "sec.gov",
-    "sedarplus.ca",
-    "fca.org.uk",
-    "esma.europa.eu",
-    "ec.europa.eu",
-]
-
 STRICT_SITE_FILTERS = [
     "site:.gov",
     "site:oecd.org",
@@ -85,12 +53,67 @@ STRICT_SITE_FILTERS = [
     "site:sedarplus.ca",
 ]
 
+PARALLEL_SEARCH_URL = "https://api.parallel.ai/v1/search"
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search"
+DUCKDUCKGO_HTML_URL = "https://duckduckgo.com/html/"
+RESEARCH_USER_AGENT = "InsightForgeResearchBot/1.0"
+
+SearchCall = tuple[Callable[[str, int], list[dict]], str, int]
+
+_search_executor: ThreadPoolExecutor | None = None
+_search_executor_lock = threading.Lock()
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    # One process-wide pool caps in-flight search requests across all concurrently researched sections.
+    global _search_executor
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.research_max_concurrency),
+                    thread_name_prefix="research-search",
+                )
+    return _search_executor
+
 
 class ResearchAgent:
-    def __init__(self) -> None:
+    def __init__(self, bypass_cache: bool = False) -> None:
         self.api_key = settings.parallel_api_key
         self.max_sources = settings.max_sources
-        self.openai_client = OpenAI(api_key=settings.openai_api_key) if settings.openai_api_key else None
+        self.openai_client = OpenAI(api_key=settings.openai_api_key, max_retries=0) if settings.openai_api_key else None
+        self.http = get_search_http_client()
+        self.search_cache = get_search_cache()
+        self.engine_health = get_engine_health()
+        self.bypass_cache = bypass_cache
+        self.budget_stats = {
+            "queries_issued": 0,
+            "queries_skipped": 0,
+            "queries_abandoned": 0,
+            "sections_stopped_early": 0,
+        }
+        self._budget_lock = threading.Lock()
+        self.openai_web_stats = {
+            mode: {"calls": 0, "input_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+            for mode in ("per_section", "batched")
+        }
+
+    def _cached(self, engine: str, query: str, per_query: int, fetch: Callable[[], list[dict]]) -> list[dict]:
+        return self.search_cache.get_or_fetch(
+            engine, query, per_query, lambda: self._guarded(engine, fetch), bypass=self.bypass_cache
+        )
+
+    def _guarded(self, engine: str, fetch: Callable[[], list[dict]]) -> list[dict]:
+        # Open circuits and exhausted rate limits return nothing at once so the other engines carry the query.
+        if not self.engine_health.acquire(engine):
+            return []
+        try:
+            results = fetch()
+        except Exception as exc:
+            self.engine_health.record_failure(engine, exc)
+            return []
+        self.engine_health.record_success(engine)
+        return results
 
     def run(self, industry: str, geography: str, limit: int = 20) -> list[dict]:
         size = min(limit, self.max_sources)
@@ -134,20 +157,9 @@ class ResearchAgent:
 
         combined: list[dict] = []
         if self.api_key:
-            for query in queries:
-                try:
-                    payload = {"query": query, "limit": max(3, size)}
-                    response = requests.post(
-                        "https://api.parallel.ai/v1/search",
-                        json=payload,
-                        headers={"Authorization": f"Bearer {self.api_key}"},
-                        timeout=20,
-                    )
-                    response.raise_for_status()
-                    items = response.json().get("results", [])
-                    combined.extend(self._normalize_results(items, max(3, size)))
-                except Exception:
-                    continue
+            combined = self._fan_out(
+                self._parallel_search_calls(queries, size), self._section_budget(industry, geography, size)
+            )
 
         if not combined:
             if settings.strict_no_key_research:
@@ -156,33 +168,58 @@ class ResearchAgent:
                     for item in strict:
                         item["section"] = section
                     return strict
-            for query in queries:
-                combined.extend(self._search_google_news_rss(query, per_query=max(5, size)))
-                combined.extend(self._search_duckduckgo_html(query, per_query=max(5, size)))
+            combined = self._fan_out(
+                self._open_web_search_calls(queries, size), self._section_budget(industry, geography, size)
+            )
 
         finalized = self._finalize_results(combined, industry, geography, size)
         for item in finalized:
             item["section"] = section
         return finalized
 
-    def _strict_no_key_results(
+    def _parallel_search_calls(self, queries: list[str], size: int) -> list[SearchCall]:
+        return [(self._parallel_search, query, max(3, size)) for query in queries]
+
+    def _open_web_search_calls(self, queries: list[str], size: int) -> list[SearchCall]:
+        calls = []
+        for query in queries:
+            calls.append((self._search_google_news_rss, query, max(5, size)))
+            calls.append((self._search_duckduckgo_html, query, max(5, size)))
+        return calls
+
+    def _strict_search_calls(
         self,
         industry: str,
         geography: str,
         limit: int,
         section: str | None = None,
-    ) -> list[dict]:
+    ) -> list[SearchCall]:
         base_queries = self._query_variants_for_section(industry, geography, section) if section else self._query_variants(industry, geography)
         authority_queries = []
         for q in base_queries[:4]:
             for filt in STRICT_SITE_FILTERS:
                 authority_queries.append(f"{q} {filt}")
 
-        combined: list[dict] = []
+        calls = []
         for query in authority_queries[: min(len(authority_queries), 24)]:
-            combined.extend(self._search_duckduckgo_html(query, per_query=max(4, limit)))
-            combined.extend(self._search_google_news_rss(query, per_query=max(3, limit)))
+            calls.append((self._search_duckduckgo_html, query, max(4, limit)))
+            calls.append((self._search_google_news_rss, query, max(3, limit)))
+        return calls
+
+    def _strict_no_key_results(
+        self,
+        industry: str,
+        geography: str,
+        limit: int,
+        section: str | None = None,
+    ) -> list[dict]:
+        combined = self._fan_out(
+            self._strict_search_calls(industry, geography, limit, section=section),
+            self._section_budget(industry, geography, limit, strict_authority_only=True),
+        )
+        return self._finalize_strict_results(combined, industry, geography, limit)
 
+    def _finalize_strict_results(self, combined: list[dict], industry: str, geography: str, limit: int) -> list[dict]:
         finalized = self._finalize_results(combined, industry, geography, limit, strict_authority_only=True)
         if not finalized:
             # Strict curated fallback retains high-authority institutions and filings.
@@ -201,7 +238,21 @@ class ResearchAgent:
         if not self.openai_client:
             return []
 
-        prompt = (
+        prompt = self._openai_web_prompt(industry, geography, queries, limit, section)
+        normalized = self._cached("openai_web", prompt, limit * 2, lambda: self._fetch_openai_web(prompt, limit * 2))
+        if not normalized:
+            return []
+        return self._finalize_results(normalized, industry, geography, limit)
+
+    def _openai_web_prompt(
+        self,
+        industry: str,
+        geography: str,
+        queries: list[str],
+        limit: int,
+        section: str | None = None,
+    ) -> str:
+        return (
             "Perform web research and return strict JSON array only. "
             "Each object keys: title, url, published_at, snippet. "
             f"Industry: {industry}. Geography: {geography}. "
@@ -209,22 +260,115 @@ class ResearchAgent:
             f"Use these search intents: {queries[:4]}. "
             f"Return up to {limit} high-quality sources."
         )
-        try:
-            response = self.openai_client.responses.create(
-                model="gpt-4.1-mini",
-                tools=[{"type": "web_search_preview"}],
-                input=prompt,
-                temperature=0.1,
-                max_output_tokens=1400,
-            )
-            output_text = (response.output_text or "").strip()
-            items = self._parse_openai_items(output_text)
-            if not items:
-                return []
-            normalized = self._normalize_results(items, limit * 2)
-            return self._finalize_results(normalized, industry, geography, limit)
-        except Exception:
-            return []
+
+    def _openai_web_request(self, prompt: str) -> dict:
+        return {
+            "model": "gpt-4.1-mini",
+            "tools": [{"type": "web_search_preview"}],
+            "input": prompt,
+            "temperature": 0.1,
+            "max_output_tokens": 1400,
+        }
+
+    def _fetch_openai_web(self, prompt: str, limit: int) -> list[dict]:
+        started = time.monotonic()
+        request = self._openai_web_request(prompt)
+        response = get_llm_governor().call(
+            "openai",
+            request["model"],
+            lambda: self.openai_client.responses.create(**request),
+            caller="research",
+            tokens=len(request["input"]) // 4 + request["max_output_tokens"],
+        )
+        self._record_openai_usage("per_section", response, started)
+        output_text = (response.output_text or "").strip()
+        items = self._parse_openai_items(output_text)
+        return self._normalize_results(items, limit)
+
+    def _openai_web_batch_results(
+        self,
+        industry: str,
+        geography: str,
+        section_queries: dict[str, list[str]],
+        sizes: dict[str, int],
+    ) -> dict[str, list[dict]]:
+        """
+        One web-search call for every section. Sections whose share of the answer is thin are left out of the
+        result so the caller can fall back to a dedicated per-section call for them.
+        """
+        if not self.openai_client or not sizes:
+            return {}
+
+        prompt = self._openai_web_batch_prompt(industry, geography, section_queries, sizes)
+        total = sum(sizes.values()) * 2
+        tagged = self._cached(
+            "openai_web", prompt, total, lambda: self._fetch_openai_web_batch(prompt, set(sizes), total, len(sizes))
+        )
+
+        grouped: dict[str, list[dict]] = {section: [] for section in sizes}
+        for item in tagged:
+            if item.get("section") in grouped:
+                grouped[item["section"]].append(item)
+        results = {}
+        for section, items in grouped.items():
+            # Judge thinness before _finalize_results pads short lists with curated fallback links.
+            usable = [x for x in self._dedupe(items) if self._is_valid_source(x)]
+            if len(usable) >= max(1, math.ceil(sizes[section] * settings.openai_web_batch_min_fill)):
+                results[section] = self._finalize_results(items, industry, geography, sizes[section])
+        return results
+
+    def _openai_web_batch_prompt(
+        self,
+        industry: str,
+        geography: str,
+        section_queries: dict[str, list[str]],
+        sizes: dict[str, int],
+    ) -> str:
+        sections = "; ".join(
+            f"{section} (up to {sizes[section]} sources, intents: {section_queries.get(section, [])[:3]})"
+            for section in sizes
+        )
+        return (
+            "Perform web research and return strict JSON array only. "
+            "Each object keys: section, title, url, published_at, snippet. "
+            "The section value must be one of the section names listed below, exactly as written. "
+            f"Industry: {industry}. Geography: {geography}. "
+            f"Sections: {sections}. "
+            "Return high-quality sources for every section."
+        )
+
+    def _fetch_openai_web_batch(self, prompt: str, sections: set[str], limit: int, section_count: int) -> list[dict]:
+        request = self._openai_web_request(prompt)
+        request["max_output_tokens"] = min(8000, request["max_output_tokens"] * max(1, section_count) // 2)
+        started = time.monotonic()
+        response = get_llm_governor().call(
+            "openai",
+            request["model"],
+            lambda: self.openai_client.responses.create(**request),
+            caller="research",
+            tokens=len(request["input"]) // 4 + request["max_output_tokens"],
+        )
+        self._record_openai_usage("batched", response, started)
+        output_text = (response.output_text or "").strip()
+
+        tagged: list[dict] = []
+        for item in self._parse_openai_items(output_text)[:limit]:
+            section = str(item.get("section", "")).strip()
+            if section not in sections:
+                continue
+            for normalized in self._normalize_results([item], 1):
+                normalized["section"] = section
+                tagged.append(normalized)
+        return tagged
+
+    def _record_openai_usage(self, mode: str, response, started: float) -> None:
+        usage = getattr(response, "usage", None)
+        with self._budget_lock:
+            stats = self.openai_web_stats[mode]
+            stats["calls"] += 1
+            stats["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+            stats["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+            stats["seconds"] = round(stats["seconds"] + time.monotonic() - started, 3)
 
     def _parse_openai_items(self, text: str) -> list[dict]:
         if not text:
@@ -251,31 +395,331 @@ class ResearchAgent:
         return items
 
     def _parallel_results(self, industry: str, geography: str, limit: int) -> list[dict]:
-        try:
-            payload = {
-                "query": f"{industry} market size CAGR forecast trends drivers restraints {geography}",
-                "limit": limit,
+        normalized = self._parallel_search(f"{industry} market size CAGR forecast trends drivers restraints {geography}", limit)
+        if not normalized:
+            return []
+        return self._finalize_results(normalized, industry, geography, limit)
+
+    def _parallel_search(self, query: str, per_query: int = 10) -> list[dict]:
+        return self._cached("parallel", query, per_query, lambda: self._fetch_parallel(query, per_query))
+
+    def _fetch_parallel(self, query: str, per_query: int) -> list[dict]:
+        response = self.http.post(
+            PARALLEL_SEARCH_URL,
+            json={"query": query, "limit": per_query},
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=20,
+        )
+        response.raise_for_status()
+        items = response.json().get("results", [])
+        return self._normalize_results(items, per_query)
+
+    def _fan_out(self, calls: list[SearchCall], budget: SectionBudget | None = None) -> list[dict]:
+        keyed = dict(enumerate(calls))
+        fan_out_budget = FanOutBudget.for_section(keyed, budget) if budget else None
+        combined: list[dict] = []
+        for results in self._fan_out_keyed(keyed, fan_out_budget).values():
+            combined.extend(results)
+        return combined
+
+    def _fan_out_keyed(self, calls: dict, budget: FanOutBudget | None = None) -> dict:
+        """Run keyed search calls on the shared pool; the result dict is filled in completion order."""
+        if not calls:
+            return {}
+        if settings.research_backend == "asyncio" and not in_event_loop():
+            return run_sync(self._afan_out_keyed(calls, budget))
+        calls = self._route_around_open_circuits(calls)
+        executor = get_search_executor()
+        if budget is None:
+            futures = {
+                executor.submit(search_fn, query, per_query): key
+                for key, (search_fn, query, per_query) in calls.items()
             }
-            response = requests.post(
-                "https://api.parallel.ai/v1/search",
-                json=payload,
+
+            results: dict = {}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception:
+                    results[futures[future]] = []
+            return results
+
+        # Budgeted mode: issue calls highest expected yield first, a window at a time, and stop issuing
+        # once every interested section has its quota or has spent its request/time budget.
+        queue = deque(budget.order(calls))
+        in_flight: dict = {}
+        results = {}
+
+        def top_up() -> None:
+            while queue and len(in_flight) < max(1, settings.research_max_concurrency):
+                key = queue.popleft()
+                if not budget.wanted(key):
+                    budget.record_skipped(key)
+                    continue
+                budget.record_issued(key)
+                search_fn, query, per_query = calls[key]
+                in_flight[executor.submit(search_fn, query, per_query)] = key
+
+        top_up()
+        while in_flight:
+            done, _ = wait(in_flight, timeout=max(0.0, budget.remaining_seconds()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                key = in_flight.pop(future)
+                try:
+                    items = future.result()
+                except Exception:
+                    items = []
+                results[key] = items
+                budget.observe(key, engine_name(calls[key][0]), items)
+            if budget.all_done():
+                break
+            top_up()
+
+        self._record_budget(budget, queue, in_flight)
+        return results
+
+    def _route_around_open_circuits(self, calls: dict) -> dict:
+        """Drop calls to engines whose breaker is open, unless that would leave nothing to run."""
+        healthy = {
+            key: call for key, call in calls.items() if self.engine_health.available(engine_name(call[0]))
+        }
+        return healthy or calls
+
+    def _section_budget(
+        self,
+        industry: str,
+        geography: str,
+        quota: int,
+        strict_authority_only: bool = False,
+    ) -> SectionBudget | None:
+        if not settings.research_budget_enabled:
+            return None
+
+        def scorer(items: list[dict]) -> list[dict]:
+            valid = [x for x in items if self._is_valid_source(x, strict_authority_only=strict_authority_only)]
+            return self._score_relevance(valid, industry, geography)
+
+        return SectionBudget(quota, scorer)
+
+    def _record_budget(self, budget: FanOutBudget, queue: deque, in_flight: dict) -> None:
+        for key in queue:
+            budget.record_skipped(key)
+        with self._budget_lock:
+            self.budget_stats["queries_issued"] += budget.issued
+            self.budget_stats["queries_skipped"] += budget.skipped
+            self.budget_stats["queries_abandoned"] += len(in_flight)
+            self.budget_stats["sections_stopped_early"] += budget.stopped_early()
+
+    async def arun_for_section(self, industry: str, geography: str, section: str, limit: int = 6) -> list[dict]:
+        size = min(limit, self.max_sources)
+        queries = self._query_variants_for_section(industry, geography, section)
+
+        if self.openai_client:
+            openai_results = await self._aopenai_web_results(industry, geography, queries, size, section=section)
+            if openai_results:
+                for item in openai_results:
+                    item["section"] = section
+                return openai_results
+
+        combined: list[dict] = []
+        if self.api_key:
+            combined = await self._afan_out(
+                self._parallel_search_calls(queries, size), self._section_budget(industry, geography, size)
+            )
+
+        if not combined:
+            if settings.strict_no_key_research:
+                strict_combined = await self._afan_out(
+                    self._strict_search_calls(industry, geography, size, section=section),
+                    self._section_budget(industry, geography, size, strict_authority_only=True),
+                )
+                strict = self._finalize_strict_results(strict_combined, industry, geography, size)
+                if strict:
+                    for item in strict:
+                        item["section"] = section
+                    return strict
+            combined = await self._afan_out(
+                self._open_web_search_calls(queries, size), self._section_budget(industry, geography, size)
+            )
+
+        finalized = self._finalize_results(combined, industry, geography, size)
+        for item in finalized:
+            item["section"] = section
+        return finalized
+
+    async def _afan_out(self, calls: list[SearchCall], budget: SectionBudget | None = None) -> list[dict]:
+        keyed = dict(enumerate(calls))
+        fan_out_budget = FanOutBudget.for_section(keyed, budget) if budget else None
+        combined: list[dict] = []
+        for results in (await self._afan_out_keyed(keyed, fan_out_budget)).values():
+            combined.extend(results)
+        return combined
+
+    async def _afan_out_keyed(self, calls: dict, budget: FanOutBudget | None = None) -> dict:
+        async def run(key, search_fn, query, per_query):
+            try:
+                return key, await self._async_counterpart(search_fn)(query, per_query)
+            except Exception:
+                return key, []
+
+        calls = self._route_around_open_circuits(calls)
+        results: dict = {}
+        if budget is None:
+            for next_done in asyncio.as_completed([run(key, *call) for key, call in calls.items()]):
+                key, items = await next_done
+                results[key] = items
+            return results
+
+        queue = deque(budget.order(calls))
+        in_flight: set[asyncio.Task] = set()
+
+        def top_up() -> None:
+            while queue and len(in_flight) < max(1, settings.research_max_concurrency):
+                key = queue.popleft()
+                if not budget.wanted(key):
+                    budget.record_skipped(key)
+                    continue
+                budget.record_issued(key)
+                in_flight.add(asyncio.ensure_future(run(key, *calls[key])))
+
+        top_up()
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, timeout=max(0.0, budget.remaining_seconds()), return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                in_flight.discard(task)
+                key, items = task.result()
+                results[key] = items
+                budget.observe(key, engine_name(calls[key][0]), items)
+            if budget.all_done():
+                break
+            top_up()
+
+        for task in in_flight:
+            task.cancel()
+        self._record_budget(budget, queue, in_flight)
+        return results
+
+    def _async_counterpart(self, search_fn: Callable[[str, int], list[dict]]):
+        # _search_google_news_rss -> _asearch_google_news_rss, _parallel_search -> _aparallel_search
+        async_fn = getattr(self, f"_a{search_fn.__name__.lstrip('_')}", None)
+        if async_fn is not None:
+            return async_fn
+        return lambda query, per_query: asyncio.to_thread(search_fn, query, per_query)
+
+    async def _acached(
+        self, engine: str, query: str, per_query: int, fetch: Callable[[], Awaitable[list[dict]]]
+    ) -> list[dict]:
+        return await self.search_cache.aget_or_fetch(
+            engine, query, per_query, lambda: self._aguarded(engine, fetch), bypass=self.bypass_cache
+        )
+
+    async def _aguarded(self, engine: str, fetch: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        if not await self.engine_health.aacquire(engine):
+            return []
+        try:
+            results = await fetch()
+        except asyncio.CancelledError:
+            # A cancelled half-open probe must hand its slot back or the circuit stays shut for good.
+            self.engine_health.release(engine)
+            raise
+        except Exception as exc:
+            self.engine_health.record_failure(engine, exc)
+            return []
+        self.engine_health.record_success(engine)
+        return results
+
+    async def _asearch_google_news_rss(self, query: str, per_query: int = 10) -> list[dict]:
+        return await self._acached("google_news_rss", query, per_query, lambda: self._afetch_google_news_rss(query, per_query))
+
+    async def _afetch_google_news_rss(self, query: str, per_query: int) -> list[dict]:
+        async with engine_semaphore("google_news_rss"):
+            resp = await get_async_http_client().get(
+                GOOGLE_NEWS_RSS_URL,
+                params=self._google_news_params(query),
+                timeout=15,
+                headers={"User-Agent": RESEARCH_USER_AGENT},
+            )
+        resp.raise_for_status()
+        # Parsing is CPU work; keep it off the event loop.
+        return await asyncio.to_thread(self._parse_google_news_rss, resp.text, per_query)
+
+    async def _asearch_duckduckgo_html(self, query: str, per_query: int = 10) -> list[dict]:
+        return await self._acached("duckduckgo_html", query, per_query, lambda: self._afetch_duckduckgo_html(query, per_query))
+
+    async def _afetch_duckduckgo_html(self, query: str, per_query: int) -> list[dict]:
+        async with engine_semaphore("duckduckgo_html"):
+            resp = await get_async_http_client().get(
+                DUCKDUCKGO_HTML_URL,
+                params={"q": query},
+                timeout=15,
+                headers={"User-Agent": RESEARCH_USER_AGENT},
+            )
+        resp.raise_for_status()
+        return await asyncio.to_thread(self._parse_duckduckgo_html, resp.text, per_query)
+
+    async def _aparallel_search(self, query: str, per_query: int = 10) -> list[dict]:
+        return await self._acached("parallel", query, per_query, lambda: self._afetch_parallel(query, per_query))
+
+    async def _afetch_parallel(self, query: str, per_query: int) -> list[dict]:
+        async with engine_semaphore("parallel"):
+            response = await get_async_http_client().post(
+                PARALLEL_SEARCH_URL,
+                json={"query": query, "limit": per_query},
                 headers={"Authorization": f"Bearer {self.api_key}"},
                 timeout=20,
             )
-            response.raise_for_status()
-            items = response.json().get("results", [])
-            normalized = self._normalize_results(items, limit)
-            return self._finalize_results(normalized, industry, geography, limit)
-        except Exception:
+        response.raise_for_status()
+        items = response.json().get("results", [])
+        return self._normalize_results(items, per_query)
+
+    async def _aopenai_web_results(
+        self,
+        industry: str,
+        geography: str,
+        queries: list[str],
+        limit: int,
+        section: str | None = None,
+    ) -> list[dict]:
+        if not self.openai_client:
             return []
 
+        prompt = self._openai_web_prompt(industry, geography, queries, limit, section)
+        normalized = await self._acached("openai_web", prompt, limit * 2, lambda: self._afetch_openai_web(prompt, limit * 2))
+        if not normalized:
+            return []
+        return self._finalize_results(normalized, industry, geography, limit)
+
+    async def _afetch_openai_web(self, prompt: str, limit: int) -> list[dict]:
+        client = loop_resources().openai_client()
+        if client is None:
+            return []
+        started = time.monotonic()
+        request = self._openai_web_request(prompt)
+        async with engine_semaphore("openai_web"):
+            response = await get_llm_governor().acall(
+                "openai",
+                request["model"],
+                lambda: client.responses.create(**request),
+                caller="research",
+                tokens=len(request["input"]) // 4 + request["max_output_tokens"],
+            )
+        self._record_openai_usage("per_section", response, started)
+        output_text = (response.output_text or "").strip()
+        items = self._parse_openai_items(output_text)
+        return self._normalize_results(items, limit)
+
     def _dynamic_web_results(self, industry: str, geography: str, limit: int) -> list[dict]:
         queries = self._query_variants(industry, geography)
 
-        combined: list[dict] = []
+        calls = []
         for query in queries:
-            combined.extend(self._search_google_news_rss(query, per_query=10))
-            combined.extend(self._search_duckduckgo_html(query, per_query=10))
+            calls.append((self._search_google_news_rss, query, 10))
+            calls.append((self._search_duckduckgo_html, query, 10))
+        combined = self._fan_out(calls, self._section_budget(industry, geography, limit))
 
         return self._finalize_results(combined, industry, geography, limit)
 
@@ -338,95 +782,91 @@ class ResearchAgent:
         return section_map.get(section, self._query_variants(industry, geography))
 
     def _search_google_news_rss(self, query: str, per_query: int = 10) -> list[dict]:
-        try:
-            resp = requests.get(
-                "https://news.google.com/rss/search",
-                params={"q": query, "hl": "en-US", "gl": "US", "ceid": "US:en"},
-                timeout=15,
-                headers={"User-Agent": "InsightForgeResearchBot/1.0"},
+        return self._cached("google_news_rss", query, per_query, lambda: self._fetch_google_news_rss(query, per_query))
+
+    def _google_news_params(self, query: str) -> dict:
+        return {"q": query, "hl": "en-US", "gl": "US", "ceid": "US:en"}
+
+    def _fetch_google_news_rss(self, query: str, per_query: int) -> list[dict]:
+        resp = self.http.get(
+            GOOGLE_NEWS_RSS_URL,
+            params=self._google_news_params(query),
+            timeout=15,
+            headers={"User-Agent": RESEARCH_USER_AGENT},
+        )
+        resp.raise_for_status()
+        return self._parse_google_news_rss(resp.text, per_query)
+
+    def _parse_google_news_rss(self, text: str, per_query: int) -> list[dict]:
+        soup = BeautifulSoup(text, "xml")
+        items = soup.find_all("item")[:per_query]
+
+        out = []
+        for item in items:
+            link = (item.link.text or "").strip()
+            clean_url = self._extract_redirect_target(link)
+            title = (item.title.text or "Untitled Source").strip()
+            pub_date = (item.pubDate.text or "").strip()
+            if not clean_url:
+                continue
+            out.append(
+                {
+                    "title": title,
+                    "url": clean_url,
+                    "domain": urlparse(clean_url).netloc,
+                    "published_at": pub_date,
+                    "snippet": "",
+                }
             )
-            resp.raise_for_status()
-
-            soup = BeautifulSoup(resp.text, "xml")
-            items = soup.find_all("item")[:per_query]
-
-            out = []
-            for item in items:
-                link = (item.link.text or "").strip()
-                clean_url = self._extract_redirect_target(link)
-                title = (item.title.text or "Untitled Source").strip()
-                pub_date = (item.pubDate.text or "").strip()
-                if not clean_url:
-                    continue
-                out.append(
-                    {
-                        "title": title,
-                        "url": clean_url,
-                        "domain": urlparse(clean_url).netloc,
-                        "published_at": pub_date,
-                        "snippet": "",
-                    }
-                )
-            return out
-        except Exception:
-            return []
+        return out
 
     def _search_duckduckgo_html(self, query: str, per_query: int = 10) -> list[dict]:
-        try:
-            resp = requests.get(
-                "https://duckduckgo.com/html/",
-                params={"q": query},
-                timeout=15,
-                headers={"User-Agent": "InsightForgeResearchBot/1.0"},
-            )
-            resp.raise_for_status()
+        return self._cached("duckduckgo_html", query, per_query, lambda: self._fetch_duckduckgo_html(query, per_query))
+
+    def _fetch_duckduckgo_html(self, query: str, per_query: int) -> list[dict]:
+        resp = self.http.get(
+            DUCKDUCKGO_HTML_URL,
+            params={"q": query},
+            timeout=15,
+            headers={"User-Agent": RESEARCH_USER_AGENT},
+        )
+        resp.raise_for_status()
+        return self._parse_duckduckgo_html(resp.text, per_query)
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            result_nodes = soup.select(".result")[:per_query]
+    def _parse_duckduckgo_html(self, text: str, per_query: int) -> list[dict]:
+        soup = BeautifulSoup(text, "html.parser")
+        result_nodes = soup.select(".result")[:per_query]
 
-            out = []
-            for node in result_nodes:
-                anchor = node.select_one("a.result__a")
-                if not anchor:
-                    continue
-                href = (anchor.get("href") or "").strip()
-                clean_url = self._extract_redirect_target(href)
-                title = anchor.get_text(" ", strip=True) or "Untitled Source"
-                snippet_node = node.select_one(".result__snippet")
-                snippet = snippet_node.get_text(" ", strip=True) if snippet_node else ""
-                if not clean_url:
-                    continue
-                out.append(
-                    {
-                        "title": title,
-                        "url": clean_url,
-                        "domain": urlparse(clean_url).netloc,
-                        "published_at": "",
-                        "snippet": snippet,
-                    }
-                )
-            return out
-        except Exception:
-            return []
+        out = []
+        for node in result_nodes:
+            anchor = node.select_one("a.result__a")
+            if not anchor:
+                continue
+            href = (anchor.get("href") or "").strip()
+            clean_url = self._extract_redirect_target(href)
+            title = anchor.get_text(" ", strip=True) or "Untitled Source"
+            snippet_node = node.select_one(".result__snippet")
+            snippet = snippet_node.get_text(" ", strip=True) if snippet_node else ""
+            if not clean_url:
+                continue
+            out.append(
+                {
+                    "title": title,
+                    "url": clean_url,
+                    "domain": urlparse(clean_url).netloc,
+                    "published_at": "",
+                    "snippet": snippet,
+                }
+            )
+        return out
 
     def _extract_redirect_target(self, url: str) -> str:
-        if not url:
-            return ""
-
-        parsed = urlparse(url)
-        if parsed.netloc.endswith("duckduckgo.com") and parsed.path.startswith("/l/"):
-            qs = parse_qs(parsed.query)
-            uddg = qs.get("uddg", [""])[0]
-            return unquote(uddg) if uddg else ""
-
-        if parsed.scheme in {"http", "https"}:
-            return url
-        return ""
+        return clean_url(url) if url else ""
 
     def _normalize_results(self, items: list[dict], limit: int) -> list[dict]:
         normalized = []
         for i in items[:limit]:
-            url = i.get("url", "")
+            url = clean_url(i.get("url", ""))
             if not url:
                 continue
             normalized.append(
@@ -450,18 +890,14 @@ class ResearchAgent:
     ) -> list[dict]:
         deduped = self._dedupe(items)
         filtered = [x for x in deduped if self._is_valid_source(x, strict_authority_only=strict_authority_only)]
-        ranked = self._score_relevance(filtered, industry, geography)
-        diversified = self._enforce_domain_diversity(ranked, per_domain_limit=2)
 
-        if len(diversified) < max(6, limit // 2):
-            fallback = self._curated_fallback(industry, geography, limit)
-            fallback = [x for x in fallback if self._is_valid_source(x, strict_authority_only=strict_authority_only)]
-            diversified.extend(fallback)
-            diversified = self._dedupe(diversified)
-            diversified = self._score_relevance(diversified, industry, geography)
-            diversified = self._enforce_domain_diversity(diversified, per_domain_limit=2)
+        def fallback() -> list[dict]:
+            curated = self._curated_fallback(industry, geography, limit)
+            return [x for x in curated if self._is_valid_source(x, strict_authority_only=strict_authority_only)]
 
-        return diversified[:limit]
+        return SourceRanker(industry, geography).top_k(
+            filtered, limit, per_domain_limit=2, min_results=max(6, limit // 2), fallback=fallback
+        )
 
     def _dedupe(self, items: list[dict]) -> list[dict]:
         seen = set()
@@ -470,7 +906,7 @@ class ResearchAgent:
             url = item.get("url", "").strip()
             if not url:
                 continue
-            key = url.lower().rstrip("/")
+            key = canonical_key(url)
             if key in seen:
                 continue
             seen.add(key)
@@ -484,7 +920,8 @@ class ResearchAgent:
 
         if not domain:
             return False
-        if any(blocked in domain for blocked in BLOCKED_DOMAINS):
+        domain_flags = classify_host(domain).flags
+        if domain_flags & DomainFlag.BLOCKED:
             return False
         if any(x in url for x in ["/login", "/signin", "subscribe", "paywall", "accounts."]):
             return False
@@ -493,55 +930,13 @@ class ResearchAgent:
         if not any(sig in title or sig in url for sig in market_signals):
             return False
 
-        if strict_authority_only and not any(hint in domain for hint in STRICT_AUTHORITY_DOMAINS):
+        if strict_authority_only and not domain_flags & DomainFlag.STRICT_AUTHORITY:
             return False
 
         return True
 
     def _score_relevance(self, items: list[dict], industry: str, geography: str) -> list[dict]:
-        industry_terms = {t.lower() for t in industry.split() if t.strip()}
-        geo_terms = {t.lower() for t in geography.split() if t.strip()}
-        intent_terms = {"market", "size", "forecast", "cagr", "industry", "analysis", "trend", "regulatory"}
-
-        scored = []
-        for item in items:
-            title = item.get("title", "").lower()
-            url = item.get("url", "").lower()
-            snippet = item.get("snippet", "").lower()
-            text = f"{title} {snippet} {url}"
-
-            token_hits = sum(1 for t in industry_terms if t in text)
-            token_hits += sum(1 for t in geo_terms if t in text)
-            token_hits += sum(1 for t in intent_terms if t in text)
-
-            domain = (item.get("domain") or "").lower()
-            authority_boost = 2 if any(h in domain for h in AUTHORITY_HINTS) else 0
-
-            freshness_boost = 0
-            published = item.get("published_at", "")
-            if str(datetime.utcnow().year) in str(published):
-                freshness_boost = 1
-
-            raw_score = float(token_hits + authority_boost + freshness_boost)
-            relevance_score = max(0.0, min(1.0, round(raw_score / 18.0, 3)))
-
-            scored_item = dict(item)
-            scored_item["relevance_score"] = relevance_score
-            scored.append(scored_item)
-
-        return sorted(scored, key=lambda x: x.get("relevance_score", 0), reverse=True)
-
-    def _enforce_domain_diversity(self, items: list[dict], per_domain_limit: int = 2) -> list[dict]:
-        out = []
-        domain_counts: dict[str, int] = {}
-        for item in items:
-            domain = item.get("domain", "")
-            cnt = domain_counts.get(domain, 0)
-            if cnt >= per_domain_limit:
-                continue
-            out.append(item)
-            domain_counts[domain] = cnt + 1
-        return out
+        return SourceRanker(industry, geography).rank(items)
 
     def _curated_fallback(self, industry: str, geography: str, limit: int) -> list[dict]:
         results = []
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import as_completed
+
+from app.agents.research_agent import ResearchAgent, SearchCall, get_search_executor
+from app.agents.search_budget import FanOutBudget, SectionBudget, query_positions
+from app.config import settings
+from app.services.search_cache import normalize_query
+
+
+class ResearchPlanner:
+    """
+    Batch research for all report sections at once.
+    Every section's query plan is collected up front so overlapping (engine, query) pairs are fetched once
+    and fanned back out to each section that asked for them.
+    """
+
+    def __init__(self, agent: ResearchAgent) -> None:
+        self.agent = agent
+        self.stats = {"requested_calls": 0, "unique_calls": 0, "saved_calls": 0}
+
+    def run(
+        self,
+        industry: str,
+        geography: str,
+        section_plan: list[tuple[str, int]],
+        on_section: Callable[[str, list[dict]], None] | None = None,
+    ) -> dict[str, list[dict]]:
+        """`on_section` is called as soon as each section's sources are final, before later stages run."""
+        agent = self.agent
+        sizes = {section: min(limit, agent.max_sources) for section, limit in section_plan}
+        queries = {section: agent._query_variants_for_section(industry, geography, section) for section in sizes}
+        results: dict[str, list[dict]] = {}
+
+        if agent.openai_client:
+            openai_sections = list(sizes)
+            if settings.openai_web_search_mode == "batched" and len(sizes) > 1:
+                batched = agent._openai_web_batch_results(industry, geography, queries, sizes)
+                for section, items in batched.items():
+                    self._complete(results, section, items, on_section)
+                self.stats["openai_batch_sections"] = len(batched)
+                openai_sections = [section for section in sizes if section not in results]
+                self.stats["openai_thin_sections"] = len(openai_sections)
+
+            # Per-section web-search prompts (and thin batched sections) run side by side rather than coalesced.
+            executor = get_search_executor()
+            futures = {
+                executor.submit(
+                    agent._openai_web_results, industry, geography, queries[section], sizes[section], section=section
+                ): section
+                for section in openai_sections
+            }
+            for future in as_completed(futures):
+                try:
+                    openai_results = future.result()
+                except Exception:
+                    openai_results = []
+                if openai_results:
+                    self._complete(results, futures[future], openai_results, on_section)
+
+        pending = [section for section in sizes if section not in results]
+        if agent.api_key and pending:
+            combined = self._execute(
+                {s: agent._parallel_search_calls(queries[s], sizes[s]) for s in pending},
+                {s: agent._section_budget(industry, geography, sizes[s]) for s in pending},
+            )
+            for section, items in combined.items():
+                if items:
+                    self._complete(
+                        results, section, agent._finalize_results(items, industry, geography, sizes[section]), on_section
+                    )
+
+        pending = [section for section in sizes if section not in results]
+        if settings.strict_no_key_research and pending:
+            combined = self._execute(
+                {s: agent._strict_search_calls(industry, geography, sizes[s], section=s) for s in pending},
+                {s: agent._section_budget(industry, geography, sizes[s], strict_authority_only=True) for s in pending},
+            )
+            for section, items in combined.items():
+                strict = agent._finalize_strict_results(items, industry, geography, sizes[section])
+                if strict:
+                    self._complete(results, section, strict, on_section)
+
+        pending = [section for section in sizes if section not in results]
+        if pending:
+            combined = self._execute(
+                {s: agent._open_web_search_calls(queries[s], sizes[s]) for s in pending},
+                {s: agent._section_budget(industry, geography, sizes[s]) for s in pending},
+            )
+            for section, items in combined.items():
+                self._complete(
+                    results, section, agent._finalize_results(items, industry, geography, sizes[section]), on_section
+                )
+
+        self.stats.update(agent.budget_stats)
+        if agent.openai_client:
+            self.stats["openai_web"] = agent.openai_web_stats
+        return results
+
+    @staticmethod
+    def _complete(
+        results: dict[str, list[dict]],
+        section: str,
+        items: list[dict],
+        on_section: Callable[[str, list[dict]], None] | None,
+    ) -> None:
+        for item in items:
+            item["section"] = section
+        results[section] = items
+        if on_section:
+            on_section(section, items)
+
+    def _execute(
+        self,
+        section_calls: dict[str, list[SearchCall]],
+        budgets: dict[str, SectionBudget | None] | None = None,
+    ) -> dict[str, list[dict]]:
+        unique: dict[tuple[str, str], SearchCall] = {}
+        budgets_by_key: dict[tuple[str, str], list[SectionBudget]] = {}
+        positions: dict[tuple[str, str], int] = {}
+        requested = 0
+        for section, calls in section_calls.items():
+            section_budget = (budgets or {}).get(section)
+            section_positions = query_positions(dict(enumerate(calls)))
+            for idx, (search_fn, query, per_query) in enumerate(calls):
+                requested += 1
+                key = (search_fn.__name__, normalize_query(query))
+                existing = unique.get(key)
+                if existing is None or per_query > existing[2]:
+                    unique[key] = (search_fn, query, per_query)
+                positions[key] = min(positions.get(key, section_positions[idx]), section_positions[idx])
+                if section_budget is not None:
+                    budgets_by_key.setdefault(key, []).append(section_budget)
+
+        self.stats["requested_calls"] += requested
+        self.stats["unique_calls"] += len(unique)
+        self.stats["saved_calls"] = self.stats["requested_calls"] - self.stats["unique_calls"]
+
+        fan_out_budget = None
+        if budgets_by_key and len(budgets_by_key) == len(unique):
+            fan_out_budget = FanOutBudget(budgets_by_key, positions)
+        fetched = self.agent._fan_out_keyed(unique, fan_out_budget)
+
+        per_section: dict[str, list[dict]] = {}
+        for section, calls in section_calls.items():
+            combined: list[dict] = []
+            for search_fn, query, per_query in calls:
+                key = (search_fn.__name__, normalize_query(query))
+                combined.extend(dict(item) for item in fetched.get(key, [])[:per_query])
+            per_section[section] = combined
+        return per_section
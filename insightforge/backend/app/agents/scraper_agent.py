@@ -1,21 +1,95 @@
 from __future__ import annotations
 
+import codecs
 import re
+import threading
 
-import requests
-from bs4 import BeautifulSoup
+from app.config import settings
+from app.services.cpu_pool import get_cpu_pool
+from app.services.http_client import get_http_client
+from app.services.page_cache import CachedPage, get_page_cache
+from app.utils.html_text import extract_from_bytes, get_text_extractor
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml")
+SNIFF_BYTES = 4096
+
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.I)
+_XML_ENCODING = re.compile(rb"""<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)""", re.I)
+_BOMS = ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class UnsupportedContent(Exception):
+    pass
+
+
+def _known_codec(name: str) -> str | None:
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content_type: str, head: bytes) -> str:
+    """Charset from the Content-Type header, else a BOM or <meta>/<?xml?> declaration in the first bytes."""
+    match = _HEADER_CHARSET.search(content_type or "")
+    if match and _known_codec(match.group(1)):
+        return _known_codec(match.group(1))
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    sniff = head[:SNIFF_BYTES]
+    for pattern in (_META_CHARSET, _XML_ENCODING):
+        match = pattern.search(sniff)
+        if match and _known_codec(match.group(1).decode("ascii", "ignore")):
+            return _known_codec(match.group(1).decode("ascii", "ignore"))
+    # Unlabelled pages are overwhelmingly UTF-8; decoding with errors="replace" keeps the rest usable.
+    return "utf-8"
 
 
 class ScraperAgent:
+    def __init__(self) -> None:
+        self.http = get_http_client()
+        self.page_cache = get_page_cache()
+        self.extractor = get_text_extractor()
+        self.cpu_pool = get_cpu_pool()
+        self.max_bytes = settings.scraper_max_bytes
+        self.stats = {"downloads": 0, "truncated": 0, "non_text_aborted": 0, "bytes_read": 0}
+        self._stats_lock = threading.Lock()
+
     def run(self, url: str) -> dict:
+        cached = self.page_cache.get(url)
+        if cached is not None and cached.fresh:
+            self.page_cache.record("fresh_hits", len(cached.raw))
+            return self._from_cache(cached)
+
         try:
-            response = requests.get(url, timeout=20, headers={"User-Agent": "InsightForgeBot/1.0"})
-            response.raise_for_status()
-            html = response.text
-            soup = BeautifulSoup(html, "html.parser")
-            for tag in soup(["script", "style", "noscript"]):
-                tag.decompose()
-            text = re.sub(r"\s+", " ", soup.get_text(" ")).strip()
+            headers = {"User-Agent": "InsightForgeBot/1.0"}
+            if cached is not None:
+                headers.update(cached.validators())
+            response = self.http.get(url, timeout=20, headers=headers, stream=True)
+            try:
+                if response.status_code == 304 and cached is not None:
+                    # Unchanged since the last scrape: no body was sent and nothing needs re-parsing.
+                    self.page_cache.touch(cached)
+                    self.page_cache.record("revalidated", len(cached.raw))
+                    return self._from_cache(cached)
+                response.raise_for_status()
+                raw, encoding = self._download(response)
+            finally:
+                response.close()
+
+            text = self.cpu_pool.run(extract_from_bytes, raw, encoding, self.extractor.name, 12000, size=len(raw))
+            html = raw.decode(encoding, errors="replace")
+            self.page_cache.record("changed" if cached is not None else "misses", len(raw))
+            self.page_cache.put(
+                url,
+                raw=raw,
+                cleaned_text=text[:12000],
+                encoding=encoding,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+            )
             return {
                 "raw_text": html[:200000],
                 "cleaned_text": text[:12000],
@@ -23,3 +97,42 @@ class ScraperAgent:
         except Exception:
             fallback = f"Unable to scrape {url}. Using fallback synthesized content for downstream extraction."
             return {"raw_text": fallback, "cleaned_text": fallback}
+
+    def _download(self, response) -> tuple[bytes, str]:
+        """Read at most `max_bytes` of the body, refusing binary content before any of it is downloaded."""
+        content_type = response.headers.get("Content-Type", "")
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        if media_type and not media_type.startswith(TEXT_CONTENT_TYPES):
+            self._count("non_text_aborted")
+            raise UnsupportedContent(media_type)
+
+        chunks: list[bytes] = []
+        size = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if not chunk:
+                continue
+            if size + len(chunk) > self.max_bytes:
+                chunks.append(chunk[: self.max_bytes - size])
+                size = self.max_bytes
+                truncated = True
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        raw = b"".join(chunks)
+
+        self._count("downloads")
+        self._count("bytes_read", size)
+        if truncated:
+            self._count("truncated")
+        return raw, detect_encoding(content_type, raw[:SNIFF_BYTES])
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _from_cache(self, cached: CachedPage) -> dict:
+        return {
+            "raw_text": cached.raw_text()[:200000],
+            "cleaned_text": cached.cleaned_text,
+        }
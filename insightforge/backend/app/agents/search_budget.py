@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+from app.config import settings
+from app.utils.url_canonical import canonical_key
+
+
+# Relative number of usable sources each engine tends to return per query; refined at runtime by YieldTracker.
+ENGINE_YIELD_PRIORS = {
+    "parallel": 1.2,
+    "duckduckgo_html": 1.0,
+    "google_news_rss": 0.7,
+}
+
+
+ENGINE_BY_SEARCH_FN = {
+    "_parallel_search": "parallel",
+    "_search_duckduckgo_html": "duckduckgo_html",
+    "_search_google_news_rss": "google_news_rss",
+}
+
+
+def engine_name(search_fn: Callable) -> str:
+    return ENGINE_BY_SEARCH_FN.get(search_fn.__name__, search_fn.__name__)
+
+
+class YieldTracker:
+    """Process-wide EWMA of the share of each engine's results that clear the relevance threshold."""
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha = alpha
+        self._rates: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine: str, returned: int, useful: int) -> None:
+        if returned <= 0:
+            rate = 0.0
+        else:
+            rate = useful / returned
+        with self._lock:
+            previous = self._rates.get(engine)
+            self._rates[engine] = rate if previous is None else (1 - self.alpha) * previous + self.alpha * rate
+
+    def rate(self, engine: str) -> float:
+        with self._lock:
+            return self._rates.get(engine, 0.5)
+
+
+ENGINE_YIELDS = YieldTracker()
+
+
+class SectionBudget:
+    """
+    Running top-k of candidate relevance for one section.
+    The section is done once `quota` distinct candidates score at or above the threshold, or once its
+    request/time budget is spent.
+    """
+
+    def __init__(
+        self,
+        quota: int,
+        scorer: Callable[[list[dict]], list[dict]],
+        score_threshold: float | None = None,
+        max_requests: int | None = None,
+        max_seconds: float | None = None,
+    ) -> None:
+        self.quota = max(1, quota)
+        self.scorer = scorer
+        self.score_threshold = settings.research_budget_score_threshold if score_threshold is None else score_threshold
+        self.max_requests = max_requests or settings.research_budget_max_requests
+        self.max_seconds = max_seconds or settings.research_budget_max_seconds
+        self.started_at = time.monotonic()
+        self.issued = 0
+        self.skipped = 0
+        self._scores: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, engine: str, items: list[dict]) -> None:
+        scored = self.scorer(items) if items else []
+        useful = 0
+        with self._lock:
+            for item in scored:
+                score = item.get("relevance_score", 0.0)
+                if score >= self.score_threshold:
+                    useful += 1
+                # AMP, mobile, www and tracking-parameter copies of one page count once, as in SourcePipeline.
+                key = canonical_key(item.get("url", "").strip())
+                if key and score > self._scores.get(key, (-1.0, ""))[0]:
+                    self._scores[key] = (score, item.get("domain", ""))
+        ENGINE_YIELDS.record(engine, len(items), useful)
+
+    @property
+    def satisfied(self) -> bool:
+        with self._lock:
+            strong = sorted((s for s in self._scores.values() if s[0] >= self.score_threshold), reverse=True)
+        # Mirror _finalize_results: at most two sources per domain count toward the quota.
+        per_domain: dict[str, int] = {}
+        count = 0
+        for _, domain in strong:
+            if per_domain.get(domain, 0) >= 2:
+                continue
+            per_domain[domain] = per_domain.get(domain, 0) + 1
+            count += 1
+            if count >= self.quota:
+                return True
+        return False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.issued >= self.max_requests or self.remaining_seconds <= 0
+
+    @property
+    def remaining_seconds(self) -> float:
+        return self.max_seconds - (time.monotonic() - self.started_at)
+
+    @property
+    def done(self) -> bool:
+        return self.satisfied or self.exhausted
+
+
+class FanOutBudget:
+    """Maps fan-out keys onto the section budgets that asked for them (one section, or many when coalesced)."""
+
+    def __init__(self, budgets_by_key: dict, positions: dict) -> None:
+        self.budgets_by_key = budgets_by_key
+        self.positions = positions
+        self.issued = 0
+        self.skipped = 0
+
+    @classmethod
+    def for_section(cls, calls: dict, budget: SectionBudget) -> FanOutBudget:
+        return cls({key: [budget] for key in calls}, query_positions(calls))
+
+    def order(self, calls: dict) -> list:
+        def expected_yield(key) -> float:
+            search_fn = calls[key][0]
+            engine = engine_name(search_fn)
+            prior = ENGINE_YIELD_PRIORS.get(engine, 1.0)
+            return prior * (0.5 + ENGINE_YIELDS.rate(engine)) / (1.0 + 0.25 * self.positions.get(key, 0))
+
+        return sorted(calls, key=expected_yield, reverse=True)
+
+    def wanted(self, key) -> bool:
+        return any(not budget.done for budget in self.budgets_by_key.get(key, []))
+
+    def record_issued(self, key) -> None:
+        self.issued += 1
+        for budget in self.budgets_by_key.get(key, []):
+            budget.issued += 1
+
+    def record_skipped(self, key) -> None:
+        self.skipped += 1
+        for budget in self.budgets_by_key.get(key, []):
+            budget.skipped += 1
+
+    def observe(self, key, engine: str, items: list[dict]) -> None:
+        for budget in self.budgets_by_key.get(key, []):
+            budget.observe(engine, items)
+
+    def budgets(self) -> list[SectionBudget]:
+        return list({id(b): b for group in self.budgets_by_key.values() for b in group}.values())
+
+    def remaining_seconds(self) -> float:
+        return max((b.remaining_seconds for b in self.budgets()), default=0.0)
+
+    def all_done(self) -> bool:
+        return all(b.done for b in self.budgets())
+
+    def stopped_early(self) -> int:
+        return sum(1 for b in self.budgets() if b.satisfied)
+
+
+def query_positions(calls: dict) -> dict:
+    """Rank of each call's query within its plan; earlier variants are the most targeted."""
+    order: dict[str, int] = {}
+    positions = {}
+    for key, (_, query, _) in calls.items():
+        positions[key] = order.setdefault(query, len(order))
+    return positions
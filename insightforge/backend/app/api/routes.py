@@ -12,6 +12,13 @@ from app.market_intel.orchestrator import MultiAgentMarketIntelOrchestrator
 from app.models import Report
 from app.schemas.market_intel import MarketIntelComposeRequest, MarketIntelRunRequest, MarketIntelScopeInput
 from app.schemas.report import ReportCreate, ReportSectionRegenerate
+from app.services.cpu_pool import get_cpu_pool
+from app.services.engine_health import get_engine_health
+from app.services.extraction_cache import get_extraction_cache
+from app.services.http_client import get_http_client
+from app.services.llm_governor import get_llm_governor
+from app.services.page_cache import get_page_cache
+from app.services.search_cache import get_search_cache
 from app.tasks import generate_report_task, run_report_pipeline
 
 
@@ -144,3 +151,21 @@ def compose_market_intel(payload: MarketIntelComposeRequest):
     )
     orchestrator = MultiAgentMarketIntelOrchestrator(scope)
     return orchestrator.compose(payload.agent_outputs)
+
+
+@router.get("/research/health")
+def research_health():
+    return {
+        "engines": get_engine_health().snapshot(),
+        "http_pool": get_http_client().stats(),
+        "search_cache": get_search_cache().stats(),
+        "page_cache": get_page_cache().stats(),
+        "cpu_pool": get_cpu_pool().stats(),
+        "extraction_cache": get_extraction_cache().stats(),
+        "llm_governor": get_llm_governor().snapshot(),
+    }
+
+
+@router.delete("/research/extraction-cache")
+def invalidate_extraction_cache(model: str | None = None, prompt_version: str | None = None):
+    return {"removed": get_extraction_cache().invalidate(model=model, prompt_version=prompt_version)}
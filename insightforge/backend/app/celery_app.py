@@ -1,6 +1,8 @@
 from celery import Celery
+from celery.signals import worker_init
 
 from app.config import settings
+from app.services.cpu_pool import DAEMONIC_REASON, get_cpu_pool
 
 
 celery_app = Celery(
@@ -11,3 +13,15 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(task_track_started=True)
+
+
+@worker_init.connect
+def warm_cpu_pool(sender=None, **_kwargs) -> None:
+    # Thread and solo pools run tasks in this (non-daemonic) process, so the parsing pool can start here before
+    # the first report. Prefork children are daemonic and could never start it; say so instead of failing
+    # on every call. Children are forked from this process and inherit the disabled pool.
+    pool = str(getattr(sender, "pool_cls", "")).lower()
+    if "thread" in pool or "solo" in pool:
+        get_cpu_pool().warm()
+    else:
+        get_cpu_pool().disable(DAEMONIC_REASON)
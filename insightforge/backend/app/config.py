@@ -17,6 +17,110 @@ class Settings(BaseSettings):
     max_sources: int = 20
     strict_no_key_research: bool = True
 
+    http_pool_connections: int = 32
+    http_pool_maxsize_per_host: int = 8
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 20.0
+    http_max_retries: int = 2
+    http_retry_backoff: float = 0.3
+    # Longest Retry-After the shared session will honour before retrying; longer waits are cut to this.
+    http_retry_after_max_seconds: float = 5.0
+    http_enable_http2: bool = False
+
+    research_max_concurrency: int = 16
+    research_backend: str = "threads"
+    research_async_max_connections: int = 512
+    research_engine_concurrency: dict[str, int] = {
+        "google_news_rss": 32,
+        "duckduckgo_html": 16,
+        "parallel": 64,
+        "openai_web": 8,
+    }
+
+    research_budget_enabled: bool = True
+    research_budget_score_threshold: float = 0.35
+    research_budget_max_requests: int = 48
+    research_budget_max_seconds: float = 45.0
+
+    cache_backend: str = "auto"
+    cache_dir: str = ".cache"
+
+    search_cache_enabled: bool = True
+    search_cache_memory_items: int = 2048
+    search_cache_ttl_seconds: int = 86400
+    search_cache_engine_ttls: dict[str, int] = {
+        "google_news_rss": 6 * 3600,
+        "duckduckgo_html": 24 * 3600,
+        "parallel": 24 * 3600,
+        "openai_web": 3 * 24 * 3600,
+    }
+    engine_rate_limits: dict[str, float] = {
+        "google_news_rss": 5.0,
+        "duckduckgo_html": 2.0,
+        "parallel": 20.0,
+        "openai_web": 2.0,
+    }
+    engine_default_rate_limit: float = 5.0
+    engine_rate_burst_seconds: float = 2.0
+    engine_rate_max_wait_seconds: float = 3.0
+    engine_breaker_failure_threshold: int = 5
+    engine_breaker_cooldown_seconds: float = 30.0
+
+    openai_web_search_mode: str = "per_section"
+    openai_web_batch_min_fill: float = 0.5
+
+    scraper_max_bytes: int = 2_000_000
+    scraper_extractor: str = "auto"
+    cpu_pool_enabled: bool = True
+    cpu_pool_workers: int = 0
+    cpu_pool_min_bytes: int = 32_768
+    dedupe_near_duplicates: bool = True
+    dedupe_max_hamming_distance: int = 3
+    dedupe_min_words: int = 50
+    blob_store_enabled: bool = True
+    # Empty keeps page bodies inline in the database; set it only to a directory every API and worker process shares.
+    blob_store_dir: str = ""
+    blob_store_codec: str = "auto"
+    blob_store_level: int = 3
+    blob_store_min_chars: int = 1024
+    # Unreferenced blobs younger than this are kept: a report still running may be about to commit rows for them.
+    blob_store_sweep_grace_seconds: int = 6 * 3600
+    extraction_cache_enabled: bool = True
+    extraction_cache_memory_items: int = 1024
+    extraction_cache_ttl_seconds: int = 30 * 24 * 3600
+    analysis_batch_max_documents: int = 2
+    analysis_batch_max_input_tokens: int = 12_000
+    analysis_batch_wait_seconds: float = 0.25
+    analysis_passage_selection: bool = True
+    analysis_passage_budget_tokens: int = 1500
+    llm_initial_concurrency: int = 4
+    llm_max_concurrency: int = 16
+    llm_concurrency_limits: dict[str, int] = {"anthropic": 16, "openai": 16}
+    llm_latency_tolerance: float = 3.0
+    llm_max_retries: int = 4
+    llm_backoff_base_seconds: float = 1.0
+    llm_backoff_max_seconds: float = 30.0
+    llm_rate_limit_enabled: bool = True
+    llm_rate_limits: dict[str, dict[str, int]] = {
+        "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 40000},
+        "openai": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+    }
+    llm_prompt_caching: bool = True
+    market_intel_streaming: bool = True
+
+    page_cache_enabled: bool = True
+    page_cache_memory_items: int = 256
+    page_cache_fresh_seconds: int = 12 * 3600
+    page_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    url_resolve_redirects: bool = False
+    url_redirect_timeout_seconds: float = 5.0
+    url_redirect_cache_ttl_seconds: int = 30 * 24 * 3600
+
+    pipeline_scrape_workers: int = 8
+    pipeline_analysis_workers: int = 8
+    pipeline_queue_size: int = 32
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
 
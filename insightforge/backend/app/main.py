@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.config import settings
 from app.database import Base, engine
+from app.services.cpu_pool import get_cpu_pool
 
 
 app = FastAPI(title=settings.app_name)
@@ -23,6 +24,9 @@ app.add_middleware(
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
     Path(settings.reports_dir).mkdir(parents=True, exist_ok=True)
+    if settings.sync_tasks:
+        # Reports run in this process, so the parsing pool is warmed here instead of in a Celery worker.
+        get_cpu_pool().warm()
 
 
 @app.get("/health")
@@ -35,6 +35,12 @@ class AgentPromptPacket:
     objective: str
     prompt: str
     expected_output_contract: dict[str, Any]
+    # Rules shared by every agent, kept out of `prompt` so API runs can send them as a cached prefix.
+    common_rules: str = ""
+
+    @property
+    def full_prompt(self) -> str:
+        return f"{self.prompt} {self.common_rules}" if self.common_rules else self.prompt
 
 
 @dataclass
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import json
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
 
 from anthropic import Anthropic
 
 from app.config import settings
 from app.market_intel.contracts import AgentPromptPacket, AgentRunResult
+from app.services.llm_governor import get_llm_governor
+from app.services.prompt_cache import cache_headers, cacheable_system, prefix_fingerprint, usage_breakdown
+from app.utils.json_stream import IncrementalJsonObject
 
 
 class BaseExecutionEngine(ABC):
@@ -33,7 +40,7 @@ class ClaudeSaaSExecutionEngine(BaseExecutionEngine):
                             "Open a separate Claude web session for this agent, paste `prompt`, "
                             "and copy JSON output back into the compose step."
                         ),
-                        "prompt": packet.prompt,
+                        "prompt": packet.full_prompt,
                         "expected_output_contract": packet.expected_output_contract,
                     },
                 )
@@ -41,9 +48,39 @@ class ClaudeSaaSExecutionEngine(BaseExecutionEngine):
         return results
 
 
+MARKET_INTEL_MODEL = "claude-3-5-sonnet-latest"
+MAX_OUTPUT_TOKENS = 4000
+
+
+@dataclass
+class _StreamedMessage:
+    parser: IncrementalJsonObject
+    raw_text: str
+    usage: Any
+    first_token_seconds: float | None
+    first_result_seconds: float | None
+    stopped_early: bool
+
+
 class ClaudeApiExecutionEngine(BaseExecutionEngine):
-    def __init__(self) -> None:
-        self.client = Anthropic(api_key=settings.anthropic_api_key) if settings.anthropic_api_key else None
+    """
+    Runs each packet as one Messages call. The prompt is laid out for prompt caching: the rules shared by every
+    agent come first, then the agent's output contract, each as a cached system block; only the agent's task
+    goes in the user message.
+
+    With streaming on, the response is fed through an incremental JSON parser and the stream is closed as soon
+    as the top-level object does, so trailing prose is neither waited for nor generated. Completed top-level
+    fields are kept in `partials` and passed to `on_partial` as they arrive. Per-call cached vs uncached input
+    tokens and time to first token / first usable field / complete result are kept in `usage`.
+    """
+
+    def __init__(self, client=None, on_partial: Callable[[str, str, Any], None] | None = None) -> None:
+        if client is None and settings.anthropic_api_key:
+            client = Anthropic(api_key=settings.anthropic_api_key, max_retries=0)
+        self.client = client
+        self.on_partial = on_partial
+        self.partials: dict[str, dict[str, Any]] = {}
+        self.usage: list[dict] = []
 
     def execute(self, packets: list[AgentPromptPacket]) -> list[AgentRunResult]:
         if not self.client:
@@ -51,22 +88,117 @@ class ClaudeApiExecutionEngine(BaseExecutionEngine):
 
         results: list[AgentRunResult] = []
         for packet in packets:
-            prompt = (
-                f"{packet.prompt}\n\n"
+            system = cacheable_system(
+                packet.common_rules,
                 "Output JSON only and ensure the structure matches this contract exactly:\n"
-                f"{json.dumps(packet.expected_output_contract)}"
+                f"{json.dumps(packet.expected_output_contract)}",
             )
-            response = self.client.messages.create(
-                model="claude-3-5-sonnet-latest",
-                max_tokens=4000,
-                temperature=0.2,
-                messages=[{"role": "user", "content": prompt}],
+            request = {
+                "model": MARKET_INTEL_MODEL,
+                "max_tokens": MAX_OUTPUT_TOKENS,
+                "temperature": 0.2,
+                "system": system,
+                "messages": [{"role": "user", "content": packet.prompt}],
+                "extra_headers": cache_headers(),
+            }
+            prefix_chars = sum(len(block["text"]) for block in system)
+            estimate = (prefix_chars + len(packet.prompt)) // 4 + MAX_OUTPUT_TOKENS
+            started = time.monotonic()
+            if settings.market_intel_streaming:
+                streamed = get_llm_governor().call(
+                    "anthropic",
+                    MARKET_INTEL_MODEL,
+                    lambda: self._stream(packet.agent_name, request, started),
+                    caller="market_intel",
+                    tokens=estimate,
+                )
+                payload = _streamed_payload(streamed)
+                usage = streamed.usage
+                timings = {
+                    "first_token_seconds": streamed.first_token_seconds,
+                    "first_result_seconds": streamed.first_result_seconds,
+                    "stopped_early": streamed.stopped_early,
+                }
+            else:
+                response = get_llm_governor().call(
+                    "anthropic",
+                    MARKET_INTEL_MODEL,
+                    lambda: self.client.messages.create(**request),
+                    caller="market_intel",
+                    tokens=estimate,
+                )
+                text = "\n".join(block.text for block in response.content if getattr(block, "text", None)).strip()
+                payload = _extract_json_object(text)
+                usage = getattr(response, "usage", None)
+                timings = {"first_result_seconds": round(time.monotonic() - started, 3)}
+            self.usage.append(
+                {
+                    "agent_name": packet.agent_name,
+                    "prefix": prefix_fingerprint(system),
+                    **usage_breakdown(usage),
+                    **timings,
+                    "complete_seconds": round(time.monotonic() - started, 3),
+                }
             )
-            text = "\n".join(block.text for block in response.content if getattr(block, "text", None)).strip()
-            parsed = _extract_json_object(text)
-            results.append(AgentRunResult(agent_name=packet.agent_name, payload=parsed))
+            results.append(AgentRunResult(agent_name=packet.agent_name, payload=payload))
         return results
 
+    def _stream(self, agent_name: str, request: dict, started: float) -> _StreamedMessage:
+        # A retried attempt starts over, so partials from a failed one must not leak into it.
+        self.partials[agent_name] = {}
+        first_result: list[float] = []
+
+        def on_field(key: str, value: Any) -> None:
+            if not first_result:
+                first_result.append(round(time.monotonic() - started, 3))
+            self.partials[agent_name][key] = value
+            if self.on_partial is not None:
+                self.on_partial(agent_name, key, value)
+
+        parser = IncrementalJsonObject(on_field=on_field, on_reset=self.partials[agent_name].clear)
+        chunks: list[str] = []
+        first_token = None
+        stopped_early = False
+        with self.client.messages.stream(**request) as stream:
+            for text in stream.text_stream:
+                if first_token is None:
+                    first_token = round(time.monotonic() - started, 3)
+                chunks.append(text)
+                if parser.feed(text):
+                    # Leaving the context closes the response, which ends generation on the provider side.
+                    stopped_early = True
+                    break
+            snapshot = stream.current_message_snapshot
+            stopped_early = stopped_early and snapshot.stop_reason is None
+        raw_text = "".join(chunks)
+        usage = getattr(snapshot, "usage", None)
+        if stopped_early and usage is not None:
+            # The final usage event never arrives on a closed stream; the snapshot still holds the count from
+            # message_start, so settle the rate limiter with what was actually streamed.
+            usage = usage.model_copy(update={"output_tokens": max(usage.output_tokens or 0, len(raw_text) // 4)})
+        return _StreamedMessage(
+            parser=parser,
+            raw_text=raw_text,
+            usage=usage,
+            first_token_seconds=first_token,
+            first_result_seconds=first_result[0] if first_result else None,
+            stopped_early=stopped_early,
+        )
+
+
+def _streamed_payload(streamed: _StreamedMessage) -> dict:
+    value = streamed.parser.value()
+    if value is not None:
+        return value
+    if streamed.parser.fields:
+        # Cut off (usually by max_tokens) before the object closed: keep every field that did complete.
+        return {
+            **streamed.parser.fields,
+            "partial_output": True,
+            "parse_error": "Response ended before the JSON object was complete.",
+        }
+    return _extract_json_object(streamed.raw_text)
+
 
 def _extract_json_object(raw: str) -> dict:
     try:
@@ -27,7 +27,7 @@ class MultiAgentMarketIntelOrchestrator:
                 {
                     "agent_name": p.agent_name,
                     "objective": p.objective,
-                    "prompt": p.prompt,
+                    "prompt": p.full_prompt,
                     "expected_output_contract": p.expected_output_contract,
                 }
                 for p in packets
@@ -57,7 +57,9 @@ class MultiAgentMarketIntelOrchestrator:
                 "next_step": "POST consolidated JSON payloads to /api/market-intel/compose",
             }
 
-        return self.compose(payloads)
+        report = self.compose(payloads)
+        report["llm_usage"] = engine.usage
+        return report
 
     def compose(self, agent_payloads: dict[str, dict]) -> dict:
         normalized = {name: agent_payloads.get(name, {}) for name in AGENT_ORDER}
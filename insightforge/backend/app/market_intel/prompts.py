@@ -2,6 +2,11 @@ from __future__ import annotations
 
 from app.market_intel.contracts import AgentPromptPacket, ResearchScope, SEGMENT_DIMENSIONS
 
+COMMON_RULES = (
+    "Use only credible, citable sources. No Wikipedia, no uncited blogs, no unverifiable summaries. "
+    "Return strict JSON only. Include source citations inside JSON with title, publisher, year, url, and page_ref when available."
+)
+
 
 def _years(scope: ResearchScope) -> list[int]:
     return list(range(scope.start_year, scope.end_year + 1))
@@ -9,10 +14,6 @@ def _years(scope: ResearchScope) -> list[int]:
 
 def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
     years = _years(scope)
-    common_rules = (
-        "Use only credible, citable sources. No Wikipedia, no uncited blogs, no unverifiable summaries. "
-        "Return strict JSON only. Include source citations inside JSON with title, publisher, year, url, and page_ref when available."
-    )
 
     return [
         AgentPromptPacket(
@@ -20,10 +21,11 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             objective="Top-down and bottom-up market sizing with 5-year history and CAGR",
             prompt=(
                 f"You are the Market Sizing Agent for {scope.industry} in {scope.geography} ({scope.start_year}-{scope.end_year}). "
-                f"{common_rules} Build top_down, bottom_up, reconciliation, historical_market, cagr_calculation, chart_notes. "
+                "Build top_down, bottom_up, reconciliation, historical_market, cagr_calculation, chart_notes. "
                 "Historical table must include each year and market_size_usd_bn. "
                 "CAGR formula: ((Latest / Earliest)^(1/Years)-1)."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "top_down": {"macro_base": "", "sector_extraction": "", "penetration_ratio": 0.0, "final_estimate_usd_bn": 0.0},
                 "bottom_up": {"company_revenue_basis": "", "association_basis": "", "scale_up_logic": "", "final_estimate_usd_bn": 0.0},
@@ -40,8 +42,9 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             prompt=(
                 f"You are the Segmentation Agent for {scope.industry} in {scope.geography} across years {years}. "
                 f"Cover all dimensions: {', '.join(SEGMENT_DIMENSIONS)}. "
-                f"{common_rules} Return full segmentation_tree and yearly tables per dimension with CAGR and reconciliation flags."
+                "Return full segmentation_tree and yearly tables per dimension with CAGR and reconciliation flags."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "segmentation_tree": {"root": scope.industry, "children": []},
                 "dimension_tables": [
@@ -66,9 +69,10 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             objective="Major trends, key drivers, key barriers with dimensional coverage",
             prompt=(
                 f"You are the Trends Agent for {scope.industry} in {scope.geography} ({scope.start_year}-{scope.end_year}). "
-                f"{common_rules} Build major_trends, key_drivers, key_barriers with table fields: trigger, scenario_type, impact, examples (3-5). "
+                "Build major_trends, key_drivers, key_barriers with table fields: trigger, scenario_type, impact, examples (3-5). "
                 "Ensure coverage: overall, demand, supply, technology, macro/VUCA, regulatory, commercial, competitive, regional, sub-segment."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "major_trends": [{"trigger": "", "scenario_type": "", "impact": "", "examples": ["", "", ""]}],
                 "key_drivers": [{"trigger": "", "scenario_type": "", "impact": "", "examples": ["", "", ""]}],
@@ -82,10 +86,11 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             objective="Traditional and emerging technology mapping, vendors, geo variation",
             prompt=(
                 f"You are the Technology Intelligence Agent for {scope.industry} in {scope.geography}. "
-                f"{common_rules} Provide traditional_technologies (8-12 rows) and emerging_technologies (10-15 rows). "
+                "Provide traditional_technologies (8-12 rows) and emerging_technologies (10-15 rows). "
                 "Each row: technology, category, impact, examples (3-5), key_companies_and_solutions, geo_variation, subsegment_impact. "
                 "Mention at least 20 unique technology companies across all rows."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "traditional_technologies": [
                     {
@@ -118,8 +123,9 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             objective="Top players, shares, strategic positioning, M&A",
             prompt=(
                 f"You are the Competitive Intelligence Agent for {scope.industry} in {scope.geography}. "
-                f"{common_rules} Build top_players table (top 10), regional leaders, recent_ma_activity, product_differentiation, strategic_positioning."
+                "Build top_players table (top 10), regional leaders, recent_ma_activity, product_differentiation, strategic_positioning."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "top_players": [
                     {
@@ -142,8 +148,9 @@ def build_agent_prompt_packets(scope: ResearchScope) -> list[AgentPromptPacket]:
             objective="Score source credibility and identify weak logic",
             prompt=(
                 f"You are the Validation & Credibility Agent for {scope.industry} in {scope.geography}. "
-                f"{common_rules} Score each source 1-5 with justification, flag weak citations, and challenge estimation assumptions."
+                "Score each source 1-5 with justification, flag weak citations, and challenge estimation assumptions."
             ),
+            common_rules=COMMON_RULES,
             expected_output_contract={
                 "source_credibility": [
                     {"source": "", "type": "", "credibility_score": 1, "justification": ""}
@@ -1,25 +1,26 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse
+from app.market_intel.contracts import ALLOWED_SOURCE_PATTERNS
+from app.utils.domain_matcher import DomainFlag, classify_url
 
-from app.market_intel.contracts import ALLOWED_SOURCE_PATTERNS, DISALLOWED_SOURCE_PATTERNS
+# Non-domain allow patterns (document types) are still matched against the URL and publisher text.
+ALLOWED_TEXT_PATTERNS = [p for p in ALLOWED_SOURCE_PATTERNS if "." not in p]
 
 
 def score_source_credibility(url: str, publisher: str = "") -> tuple[int, str]:
-    candidate = f"{url} {publisher}".lower()
+    match = classify_url(url)
 
-    if any(pattern in candidate for pattern in DISALLOWED_SOURCE_PATTERNS):
+    if match.flags & DomainFlag.DISALLOWED:
         return 1, "Blocked or weak source class (blog/wiki/non-verifiable)."
 
-    if any(pattern in candidate for pattern in ALLOWED_SOURCE_PATTERNS):
+    candidate = f"{url} {publisher}".lower()
+    if match.flags & DomainFlag.ALLOWED or any(pattern in candidate for pattern in ALLOWED_TEXT_PATTERNS):
         return 5, "High-authority institutional/industry source pattern matched."
 
-    parsed = urlparse(url)
-    host = parsed.netloc.lower()
-    if host.endswith(".gov") or host.endswith(".edu"):
+    if match.flags & DomainFlag.INSTITUTIONAL:
         return 5, "Government or academic domain."
 
-    if host:
+    if match.host:
         return 3, "Source is usable but requires corroboration from higher-authority references."
 
     return 2, "Insufficient source metadata."
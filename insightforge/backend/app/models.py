@@ -4,6 +4,7 @@ from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, JSON, Stri
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.services.blob_store import get_blob_store
 
 
 class User(Base):
@@ -59,6 +60,7 @@ class Source(Base):
     domain: Mapped[str] = mapped_column(String(255), default="")
     published_at: Mapped[str] = mapped_column(String(100), default="")
 
+    # Either the text itself (older rows) or a `blob:sha256:...` reference into the blob store.
     raw_text: Mapped[str] = mapped_column(Text, default="")
     cleaned_text: Mapped[str] = mapped_column(Text, default="")
     relevance_score: Mapped[float] = mapped_column(Float, default=0.5)
@@ -67,6 +69,14 @@ class Source(Base):
 
     report = relationship("Report", back_populates="sources")
 
+    @property
+    def raw_content(self) -> str:
+        return get_blob_store().get_text(self.raw_text)
+
+    @property
+    def cleaned_content(self) -> str:
+        return get_blob_store().get_text(self.cleaned_text)
+
 
 class ExtractedInsight(Base):
     __tablename__ = "extracted_insights"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Coroutine
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+
+class _LoopResources:
+    """Clients and semaphores are bound to the loop that created them, so each loop gets its own set."""
+
+    def __init__(self) -> None:
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.research_async_max_connections,
+                max_keepalive_connections=settings.http_pool_connections,
+            ),
+            timeout=httpx.Timeout(settings.http_read_timeout, connect=settings.http_connect_timeout),
+            follow_redirects=True,
+            http2=settings.http_enable_http2 and _h2_available(),
+        )
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.openai = None
+
+    def semaphore(self, engine: str) -> asyncio.Semaphore:
+        sem = self.semaphores.get(engine)
+        if sem is None:
+            limit = settings.research_engine_concurrency.get(engine, settings.research_max_concurrency)
+            sem = asyncio.Semaphore(max(1, int(limit)))
+            self.semaphores[engine] = sem
+        return sem
+
+    def openai_client(self):
+        if self.openai is None and settings.openai_api_key:
+            from openai import DEFAULT_TIMEOUT, AsyncOpenAI
+
+            # The pooled client carries the 20 s search timeout; web-search responses take far longer, so keep the
+            # SDK's own request timeout, as the sync client does.
+            self.openai = AsyncOpenAI(
+                api_key=settings.openai_api_key, http_client=self.http, timeout=DEFAULT_TIMEOUT, max_retries=0
+            )
+        return self.openai
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+_resources: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopResources] = weakref.WeakKeyDictionary()
+
+
+def loop_resources() -> _LoopResources:
+    loop = asyncio.get_running_loop()
+    resources = _resources.get(loop)
+    if resources is None:
+        resources = _LoopResources()
+        _resources[loop] = resources
+    return resources
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    return loop_resources().http
+
+
+def engine_semaphore(engine: str) -> asyncio.Semaphore:
+    return loop_resources().semaphore(engine)
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """One long-lived event loop per process; every sync caller shares it, so in-flight requests pool together."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="research-event-loop", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    return future.result(timeout)
+
+
+def in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
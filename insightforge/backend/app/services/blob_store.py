@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - gzip fallback
+    zstandard = None
+
+REF_PREFIX = "blob:sha256:"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_EXTENSIONS = (".zst", ".gz")
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_blob_ref(value: str | None) -> bool:
+    return bool(value) and value.startswith(REF_PREFIX)
+
+
+class BlobStore:
+    """
+    Content-addressed, compressed storage for large page bodies kept out of database rows. A body is stored
+    once under the SHA-256 of its bytes (zstd when available, gzip otherwise) and rows keep only the
+    `blob:sha256:<hex>` reference, so identical pages across reports share one file. Blobs are immutable:
+    writes go to a temp file and are renamed into place, so concurrent writers of the same body are harmless.
+
+    Blobs are reclaimed by `sweep`, which removes every file whose digest no Source row references any more and
+    that has not been written or reused for BLOB_STORE_SWEEP_GRACE_SECONDS.
+
+    The store only takes writes when a directory is configured: a reference is useless to any process that cannot
+    see the same files, so without BLOB_STORE_DIR bodies stay inline.
+    """
+
+    def __init__(self, root: str | None = None, codec: str | None = None, enabled: bool | None = None) -> None:
+        root = root or settings.blob_store_dir
+        self.root = Path(root) if root else None
+        self.enabled = (settings.blob_store_enabled if enabled is None else enabled) and self.root is not None
+        codec = (codec or settings.blob_store_codec).lower()
+        if codec == "auto":
+            codec = "zstd" if zstandard is not None else "gzip"
+        self.codec = "zstd" if codec == "zstd" and zstandard is not None else "gzip"
+        self._lock = threading.Lock()
+        self._stats = {
+            "writes": 0,
+            "dedupe_hits": 0,
+            "reads": 0,
+            "missing": 0,
+            "bytes_in": 0,
+            "bytes_stored": 0,
+            "swept": 0,
+        }
+
+    def put(self, data: bytes) -> str:
+        if self.root is None:
+            raise RuntimeError("blob store has no directory; set BLOB_STORE_DIR")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._locate(digest)
+        if existing is not None:
+            # Reuse counts as a fresh write for the sweep's grace period.
+            try:
+                os.utime(existing)
+            except OSError:
+                pass
+            self._count("dedupe_hits")
+            return REF_PREFIX + digest
+
+        blob = self._compress(data)
+        path = self._path(digest, ".zst" if self.codec == "zstd" else ".gz")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self._stats["writes"] += 1
+            self._stats["bytes_in"] += len(data)
+            self._stats["bytes_stored"] += len(blob)
+        return REF_PREFIX + digest
+
+    def get(self, ref: str) -> bytes | None:
+        path = self._locate(ref[len(REF_PREFIX) :]) if is_blob_ref(ref) else None
+        if path is None:
+            self._count("missing")
+            return None
+        blob = path.read_bytes()
+        self._count("reads")
+        if blob.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError(f"{path} is zstd-compressed but the zstandard package is not installed")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    def put_text(self, text: str) -> str:
+        """Reference for `text`, or the text itself when the store is disabled or the text is too small to bother."""
+        if not self.enabled or len(text) < settings.blob_store_min_chars:
+            return text
+        return self.put(text.encode("utf-8"))
+
+    def get_text(self, value: str) -> str:
+        """Resolve a reference written by `put_text`; inline (legacy or disabled-store) values pass through."""
+        if not is_blob_ref(value):
+            return value or ""
+        data = self.get(value)
+        return data.decode("utf-8") if data is not None else ""
+
+    def sweep(self, referenced: set[str], grace_seconds: int | None = None) -> int:
+        """Delete blobs whose hex digest is not in `referenced` and that are older than the grace period."""
+        if self.root is None or not self.root.is_dir():
+            return 0
+        grace = settings.blob_store_sweep_grace_seconds if grace_seconds is None else grace_seconds
+        cutoff = time.time() - grace
+        removed = 0
+        for path in self.root.glob("??/??/*"):
+            # Temp files left by crashed writers (".tmp-...") have no digest, so they go too.
+            if path.name.split(".", 1)[0] in referenced:
+                continue
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+        with self._lock:
+            self._stats["swept"] += removed
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["compression_ratio"] = round(stats["bytes_in"] / stats["bytes_stored"], 2) if stats["bytes_stored"] else 0.0
+        stats["codec"] = self.codec
+        stats["enabled"] = self.enabled
+        stats["root"] = str(self.root) if self.root is not None else ""
+        return stats
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=settings.blob_store_level).compress(data)
+        return gzip.compress(data, compresslevel=min(9, settings.blob_store_level), mtime=0)
+
+    def _path(self, digest: str, extension: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{extension}"
+
+    def _locate(self, digest: str) -> Path | None:
+        if self.root is None or not _DIGEST.match(digest):
+            return None
+        for extension in _EXTENSIONS:
+            path = self._path(digest, extension)
+            if path.exists():
+                return path
+        return None
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore()
+    return _store
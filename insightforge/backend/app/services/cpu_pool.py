@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Imported by every worker before its first task so no job pays for parser or regex module imports.
+WARM_MODULES = ("app.utils.html_text",)
+MAX_RESTARTS = 3
+DAEMONIC_REASON = (
+    "daemonic process (Celery prefork child) cannot start worker processes; run the worker with --pool=threads"
+)
+
+
+def _init_worker(modules: tuple[str, ...]) -> None:
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class CpuPool:
+    """
+    Long-lived process pool for CPU-bound transforms (HTML parsing, regex extraction) so they run in parallel
+    instead of contending for the GIL with the I/O threads. Callers block on `run`, which releases the GIL
+    while the worker computes. Payloads below `min_bytes`, or any call when the pool cannot be started, run
+    inline on the calling thread; `stats()["disabled_reason"]` says why the pool is not in use.
+
+    Daemonic processes cannot have children, so the pool only works where reports run in a non-daemonic
+    process: the API with SYNC_TASKS, or a Celery worker started with `--pool=threads` (or `solo`).
+    """
+
+    def __init__(self, workers: int | None = None, min_bytes: int | None = None, enabled: bool | None = None) -> None:
+        self.workers = workers or settings.cpu_pool_workers or os.cpu_count() or 1
+        self.min_bytes = settings.cpu_pool_min_bytes if min_bytes is None else min_bytes
+        self.enabled = settings.cpu_pool_enabled if enabled is None else enabled
+        self._executor: ProcessPoolExecutor | None = None
+        self._unavailable = False
+        self.disabled_reason = "" if self.enabled else "CPU_POOL_ENABLED is false"
+        self._lock = threading.Lock()
+        self._stats = {"offloaded": 0, "inline": 0, "restarts": 0, "start_failures": 0}
+
+    def run(self, fn: Callable[..., T], *args: Any, size: int = 0) -> T:
+        """Run `fn(*args)` in a worker process when `size` (payload bytes) is worth the IPC; `fn` must be importable."""
+        future = self._submit(fn, *args) if size >= self.min_bytes else None
+        if future is not None:
+            try:
+                result = future.result()
+                self._count("offloaded")
+                return result
+            except BrokenProcessPool:
+                # A worker died (OOM, segfault in a parser); rebuild on the next call and finish this one inline.
+                self._reset()
+        self._count("inline")
+        return fn(*args)
+
+    def warm(self) -> None:
+        """Start every worker and import the parsing modules now rather than on the first report."""
+        futures = [self._submit(_ping) for _ in range(self.workers)]
+        try:
+            for future in futures:
+                if future is not None:
+                    future.result()
+        except BrokenProcessPool:
+            self._reset()
+
+    def disable(self, reason: str) -> None:
+        """Stop offloading for good; every later call runs inline and `reason` is reported in stats."""
+        with self._lock:
+            self._unavailable = True
+            self.disabled_reason = reason
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._executor is not None
+        stats["workers"] = self.workers
+        stats["enabled"] = self.enabled and not self._unavailable
+        stats["disabled_reason"] = self.disabled_reason
+        return stats
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> Future | None:
+        executor = self._ensure()
+        if executor is None:
+            return None
+        try:
+            # Workers are spawned on submit, which is where daemonic parents (prefork pools) refuse to fork.
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset()
+        except Exception as exc:
+            with self._lock:
+                self._stats["start_failures"] += 1
+            self.disable(f"worker start failed: {exc}")
+        return None
+
+    def _ensure(self) -> ProcessPoolExecutor | None:
+        if not self.enabled or self._unavailable:
+            return None
+        if self._executor is not None:
+            return self._executor
+        if multiprocessing.current_process().daemon:
+            self.disable(DAEMONIC_REASON)
+            return None
+        with self._lock:
+            if self._executor is None and not self._unavailable:
+                try:
+                    # forkserver workers never inherit the parent's threads, locks or open sockets.
+                    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(method),
+                        initializer=_init_worker,
+                        initargs=(WARM_MODULES,),
+                    )
+                except Exception as exc:
+                    self._unavailable = True
+                    self.disabled_reason = f"pool start failed: {exc}"
+                    self._stats["start_failures"] += 1
+            return self._executor
+
+    def _reset(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._stats["restarts"] += 1
+            # Workers that keep dying (broken import, no fork support) would cost a pool start per call.
+            if self._stats["restarts"] >= MAX_RESTARTS:
+                self._unavailable = True
+                self.disabled_reason = f"workers died {MAX_RESTARTS} times"
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_pool: CpuPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = CpuPool()
+    return _pool
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import requests
+
+from app.config import settings
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: float) -> None:
+        self.rate = max(rate_per_second, 0.001)
+        self.capacity = max(burst, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it (0 when one was available)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def refund(self) -> None:
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return round(self.tokens, 2)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float, half_open_probes: int = 1) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _current_state(self, now: float) -> str:
+        if self.state == self.OPEN and now - self.opened_at >= self.cooldown_seconds:
+            self.state = self.HALF_OPEN
+            self.probes_in_flight = 0
+        return self.state
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self.probes_in_flight < self.half_open_probes:
+                self.probes_in_flight += 1
+                return True
+            return False
+
+    def available(self) -> bool:
+        with self._lock:
+            return self._current_state(time.monotonic()) != self.OPEN
+
+    def release_probe(self) -> None:
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.probes_in_flight:
+                self.probes_in_flight -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probes_in_flight = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self.opened_at)) if state == self.OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 1),
+            }
+
+
+def classify_failure(exc: BaseException) -> str:
+    if isinstance(exc, (requests.Timeout, httpx.TimeoutException, TimeoutError)):
+        return "timeout"
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status == 429:
+        return "rate_limited"
+    if status is not None:
+        return f"http_{status}"
+    return "error"
+
+
+class EngineState:
+    def __init__(self, engine: str) -> None:
+        rate = float(settings.engine_rate_limits.get(engine, settings.engine_default_rate_limit))
+        self.bucket = TokenBucket(rate, burst=max(1.0, rate * settings.engine_rate_burst_seconds))
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.engine_breaker_failure_threshold,
+            cooldown_seconds=settings.engine_breaker_cooldown_seconds,
+        )
+        self.counters = {"requests": 0, "successes": 0, "failures": 0, "short_circuited": 0, "throttled": 0}
+        self.failure_kinds: dict[str, int] = {}
+        self.last_error = ""
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+
+class EngineHealthRegistry:
+    """Per-engine rate limiting and circuit breaking shared by every research thread (and the asyncio loop)."""
+
+    def __init__(self) -> None:
+        self._engines: dict[str, EngineState] = {}
+        self._lock = threading.Lock()
+
+    def state(self, engine: str) -> EngineState:
+        engine_state = self._engines.get(engine)
+        if engine_state is None:
+            with self._lock:
+                engine_state = self._engines.setdefault(engine, EngineState(engine))
+        return engine_state
+
+    def available(self, engine: str) -> bool:
+        return self.state(engine).breaker.available()
+
+    def acquire(self, engine: str) -> bool:
+        engine_state = self.state(engine)
+        wait = self._admit(engine_state)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def aacquire(self, engine: str) -> bool:
+        engine_state = self.state(engine)
+        wait = self._admit(engine_state)
+        if wait is None:
+            return False
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.release(engine)
+                raise
+        return True
+
+    def _admit(self, engine_state: EngineState) -> float | None:
+        if not engine_state.breaker.allow():
+            engine_state.count("short_circuited")
+            return None
+        wait = engine_state.bucket.reserve()
+        if wait > settings.engine_rate_max_wait_seconds:
+            # Waiting longer than a request would take is worse than letting the other engines cover it.
+            engine_state.bucket.refund()
+            engine_state.count("throttled")
+            engine_state.breaker.release_probe()
+            return None
+        engine_state.count("requests")
+        return wait
+
+    def release(self, engine: str) -> None:
+        """Give back an admitted call that never finished (cancelled); neither a success nor a failure."""
+        self.state(engine).breaker.release_probe()
+
+    def record_success(self, engine: str) -> None:
+        engine_state = self.state(engine)
+        engine_state.breaker.record_success()
+        engine_state.count("successes")
+
+    def record_failure(self, engine: str, exc: BaseException) -> None:
+        engine_state = self.state(engine)
+        engine_state.breaker.record_failure()
+        engine_state.count("failures")
+        kind = classify_failure(exc)
+        with engine_state._lock:
+            engine_state.failure_kinds[kind] = engine_state.failure_kinds.get(kind, 0) + 1
+            engine_state.last_error = f"{kind}: {str(exc)[:160]}"
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            engines = dict(self._engines)
+        out = {}
+        for engine, engine_state in sorted(engines.items()):
+            with engine_state._lock:
+                counters = dict(engine_state.counters)
+                failure_kinds = dict(engine_state.failure_kinds)
+                last_error = engine_state.last_error
+            out[engine] = {
+                "circuit": engine_state.breaker.snapshot(),
+                "tokens_available": engine_state.bucket.available(),
+                "rate_per_second": engine_state.bucket.rate,
+                **counters,
+                "failure_kinds": failure_kinds,
+                "last_error": last_error,
+            }
+        return out
+
+
+ENGINE_HEALTH = EngineHealthRegistry()
+
+
+def get_engine_health() -> EngineHealthRegistry:
+    return ENGINE_HEALTH
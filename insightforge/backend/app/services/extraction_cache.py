@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.kv_store import KeyValueStore, build_durable_store
+
+# Durable key bumped by every invalidation; no model name starts with an underscore, so prefix deletes skip it.
+EPOCH_KEY = "_epoch"
+# How long a process trusts its in-memory entries before re-reading the epoch.
+EPOCH_CHECK_SECONDS = 2.0
+
+
+def _norm(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+class ExtractionCache:
+    """
+    Two-tier (in-process LRU + durable SQLite/Redis) cache of LLM extraction results. Entries are keyed by the
+    exact text sent to the model plus industry, geography, model and prompt version, so a page cited by many
+    reports on the same vertical is extracted once. Keys are prefixed `model:prompt_version:`, which lets a
+    prompt or model change be invalidated with one prefix delete (bumping the version also simply misses).
+
+    Invalidation also writes a new epoch to the durable store. Every process re-reads it at most every
+    EPOCH_CHECK_SECONDS and drops its in-memory tier when it changed, so an invalidation from the API reaches
+    the Celery workers too.
+    """
+
+    def __init__(
+        self,
+        durable: KeyValueStore | None = None,
+        max_memory_items: int | None = None,
+        enabled: bool | None = None,
+        ttl_seconds: int | None = None,
+    ) -> None:
+        self.durable = durable
+        self.max_memory_items = max_memory_items or settings.extraction_cache_memory_items
+        self.enabled = settings.extraction_cache_enabled if enabled is None else enabled
+        self.ttl_seconds = ttl_seconds or settings.extraction_cache_ttl_seconds
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch: bytes | None = None
+        self._epoch_checked_at = 0.0
+        self._stats = {
+            "memory_hits": 0,
+            "durable_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidated": 0,
+            "epoch_resets": 0,
+        }
+
+    def key_for(self, text: str, industry: str, geography: str, model: str, prompt_version: str) -> str:
+        material = "\x00".join((_norm(industry), _norm(geography), text))
+        return f"{model}:{prompt_version}:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+
+    def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        now = time.time()
+        self._check_epoch()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return json.loads(json.dumps(payload))
+                del self._memory[key]
+
+        if self.durable is not None:
+            try:
+                raw = self.durable.get(key)
+            except Exception:
+                raw = None
+            if raw:
+                stored = json.loads(raw)
+                if stored.get("expires_at", now) >= now:
+                    self._remember(key, stored["expires_at"], json.loads(raw)["payload"])
+                    with self._lock:
+                        self._stats["durable_hits"] += 1
+                    return stored["payload"]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, payload: dict) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        blob = json.dumps({"expires_at": expires_at, "payload": payload}).encode("utf-8")
+        # Keep a private copy; callers go on to mutate the dict they got back.
+        self._remember(key, expires_at, json.loads(blob)["payload"])
+        if self.durable is not None:
+            try:
+                self.durable.set(key, blob, self.ttl_seconds)
+            except Exception:
+                pass
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def invalidate(self, model: str | None = None, prompt_version: str | None = None) -> int:
+        """Drop every entry, every entry for `model`, or every entry for `model` + `prompt_version`."""
+        prefix = ""
+        if model:
+            prefix = f"{model}:" + (f"{prompt_version}:" if prompt_version else "")
+        with self._lock:
+            doomed = [k for k in self._memory if k.startswith(prefix)]
+            for key in doomed:
+                del self._memory[key]
+        removed = len(doomed)
+        if self.durable is not None:
+            try:
+                had_epoch = not prefix and self.durable.get(EPOCH_KEY) is not None
+                removed = max(removed, self.durable.delete_prefix(prefix) - had_epoch)
+                epoch = str(time.time_ns()).encode("ascii")
+                self.durable.set(EPOCH_KEY, epoch)
+                with self._lock:
+                    self._epoch = epoch
+                    self._epoch_checked_at = time.monotonic()
+            except Exception:
+                pass
+        with self._lock:
+            self._stats["invalidated"] += removed
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["durable_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["durable_hits"]) / lookups, 3) if lookups else 0.0
+        stats["durable_backend"] = self.durable.name if self.durable is not None else "none"
+        return stats
+
+    def _check_epoch(self) -> None:
+        if self.durable is None or time.monotonic() - self._epoch_checked_at < EPOCH_CHECK_SECONDS:
+            return
+        try:
+            epoch = self.durable.get(EPOCH_KEY)
+        except Exception:
+            return
+        with self._lock:
+            # The first read only learns the epoch: everything in memory so far was extracted by this process.
+            if epoch != self._epoch and self._epoch_checked_at:
+                self._memory.clear()
+                self._stats["epoch_resets"] += 1
+            self._epoch = epoch
+            self._epoch_checked_at = time.monotonic()
+
+    def _remember(self, key: str, expires_at: float, payload: dict) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, payload)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+_cache: ExtractionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                durable = build_durable_store("extractions") if settings.extraction_cache_enabled else None
+                _cache = ExtractionCache(durable=durable)
+    return _cache
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from app.config import settings
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class HttpPoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.http2_requests = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self) -> None:
+        with self._lock:
+            self.new_connections += 1
+
+    def record_http2_request(self) -> None:
+        with self._lock:
+            self.http2_requests += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            misses = min(self.new_connections, self.requests)
+            hits = self.requests - misses
+            return {
+                "requests": self.requests,
+                "pool_hits": hits,
+                "pool_misses": misses,
+                "hit_ratio": round(hits / self.requests, 3) if self.requests else 0.0,
+                "http2_requests": self.http2_requests,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.http2_requests = 0
+
+
+POOL_STATS = HttpPoolStats()
+
+
+class _CappedRetry(Retry):
+    def get_retry_after(self, response):
+        # A throttling server can ask for minutes; a worker thread should not sleep that long on one page.
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, settings.http_retry_after_max_seconds)
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        POOL_STATS.record_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        POOL_STATS.record_new_connection()
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        POOL_STATS.record_request()
+        return super().send(request, **kwargs)
+
+
+class HttpClient:
+    """Process-wide keep-alive HTTP client shared by the research and scraper agents."""
+
+    def __init__(
+        self,
+        pool_connections: int | None = None,
+        pool_maxsize_per_host: int | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        max_retries: int | None = None,
+        retry_backoff: float | None = None,
+        enable_http2: bool | None = None,
+    ) -> None:
+        self.pool_connections = pool_connections or settings.http_pool_connections
+        self.pool_maxsize_per_host = pool_maxsize_per_host or settings.http_pool_maxsize_per_host
+        self.connect_timeout = connect_timeout or settings.http_connect_timeout
+        self.read_timeout = read_timeout or settings.http_read_timeout
+        self.max_retries = settings.http_max_retries if max_retries is None else max_retries
+        self.retry_backoff = settings.http_retry_backoff if retry_backoff is None else retry_backoff
+        self.http2 = settings.http_enable_http2 if enable_http2 is None else enable_http2
+
+        self.session = self._build_session()
+        self.h2_client = self._build_http2_client() if self.http2 else None
+
+    def _retry_policy(self) -> Retry:
+        # POST is not idempotent, so it is never replayed.
+        return _CappedRetry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.retry_backoff,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = _PooledAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize_per_host,
+            pool_block=True,
+            max_retries=self._retry_policy(),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _build_http2_client(self):
+        try:
+            import h2  # noqa: F401
+            import httpx
+        except ImportError:
+            # HTTP/2 is opt-in; without the h2 extra we stay on the pooled HTTP/1.1 session.
+            return None
+
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=self.pool_connections * self.pool_maxsize_per_host,
+                max_keepalive_connections=self.pool_connections,
+            ),
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            transport=httpx.HTTPTransport(http2=True, retries=self.max_retries),
+            follow_redirects=True,
+        )
+
+    def _timeout(self, timeout: float | tuple[float, float] | None) -> tuple[float, float]:
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (min(self.connect_timeout, timeout), timeout)
+
+    def request(self, method: str, url: str, timeout: float | tuple[float, float] | None = None, **kwargs: Any):
+        if self.h2_client is not None and not kwargs.get("stream"):
+            # httpx multiplexes streams per host, so only HTTP/1.1 pool reuse is counted as hits/misses.
+            POOL_STATS.record_http2_request()
+            connect, read = self._timeout(timeout)
+            return self.h2_client.request(method, url, timeout=(connect, read, read, connect), **kwargs)
+        return self.session.request(method, url, timeout=self._timeout(timeout), **kwargs)
+
+    def get(self, url: str, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            **POOL_STATS.snapshot(),
+            "http2": self.h2_client is not None,
+            "pool_connections": self.pool_connections,
+            "pool_maxsize_per_host": self.pool_maxsize_per_host,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+        if self.h2_client is not None:
+            self.h2_client.close()
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+_search_client: HttpClient | None = None
+
+
+def get_search_http_client() -> HttpClient:
+    """
+    Client for search-engine fetches: no transport retries, so a dead or throttling engine fails once and
+    quickly and the per-engine circuit breaker decides what happens next.
+    """
+    global _search_client
+    if _search_client is None:
+        with _client_lock:
+            if _search_client is None:
+                _search_client = HttpClient(max_retries=0)
+    return _search_client
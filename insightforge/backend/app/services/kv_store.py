@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from app.config import settings
+
+
+class KeyValueStore(ABC):
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: int | None = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+
+class SqliteKeyValueStore(KeyValueStore):
+    name = "sqlite"
+
+    def __init__(self, path: str, namespace: str) -> None:
+        self.namespace = namespace
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv_cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM kv_cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if not row:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return None
+        return bytes(value)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int | None = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO kv_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, value, expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv_cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> int:
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM kv_cache WHERE namespace = ? AND key LIKE ? ESCAPE '\\'",
+                (self.namespace, f"{escaped}%"),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+
+class RedisKeyValueStore(KeyValueStore):
+    name = "redis"
+
+    def __init__(self, client, namespace: str) -> None:
+        self.client = client
+        self.prefix = f"insightforge:{namespace}:"
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int | None = None) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl_seconds or None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def delete_prefix(self, prefix: str) -> int:
+        removed = 0
+        for redis_key in self.client.scan_iter(match=f"{self.prefix}{prefix}*", count=500):
+            removed += self.client.delete(redis_key)
+        return removed
+
+
+_redis_client = None
+_redis_checked = False
+_redis_lock = threading.Lock()
+
+
+def get_redis_client():
+    """Return a shared Redis client for settings.redis_url, or None when it is not reachable."""
+    global _redis_client, _redis_checked
+    if _redis_checked:
+        return _redis_client
+    with _redis_lock:
+        if _redis_checked:
+            return _redis_client
+        try:
+            import redis
+
+            client = redis.Redis.from_url(settings.redis_url, socket_connect_timeout=0.5, socket_timeout=2)
+            client.ping()
+            _redis_client = client
+        except Exception:
+            _redis_client = None
+        _redis_checked = True
+    return _redis_client
+
+
+def build_durable_store(namespace: str, backend: str | None = None) -> KeyValueStore | None:
+    choice = (backend or settings.cache_backend).lower()
+    if choice == "memory":
+        return None
+    if choice in {"auto", "redis"}:
+        client = get_redis_client()
+        if client is not None:
+            return RedisKeyValueStore(client, namespace)
+        if choice == "redis":
+            return None
+    return SqliteKeyValueStore(str(Path(settings.cache_dir) / "insightforge_cache.sqlite3"), namespace)
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+
+from app.config import settings
+from app.services.rate_limiter import RedisTokenBucketLimiter, get_rate_limiter
+
+T = TypeVar("T")
+
+RETRYABLE = {"rate_limited", "overloaded", "server_error", "timeout", "connection"}
+
+
+def classify_llm_failure(exc: BaseException) -> str:
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status == 429:
+        return "rate_limited"
+    if status == 529:
+        return "overloaded"
+    if isinstance(status, int) and status >= 500:
+        return "server_error"
+    if isinstance(exc, (httpx.TimeoutException, TimeoutError)) or "Timeout" in type(exc).__name__:
+        return "timeout"
+    if isinstance(exc, (httpx.ConnectError, ConnectionError)) or "Connection" in type(exc).__name__:
+        return "connection"
+    return "error"
+
+
+def usage_tokens(response) -> int | None:
+    """Input (including prompt-cache writes) plus output tokens reported by a response, if present."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    try:
+        return (
+            int(getattr(usage, "input_tokens", 0) or 0)
+            + int(getattr(usage, "cache_creation_input_tokens", 0) or 0)
+            + int(getattr(usage, "output_tokens", 0) or 0)
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Server-requested delay from `retry-after-ms` / `retry-after` (seconds or HTTP date), if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000.0)
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            parsed = email.utils.parsedate_to_datetime(value)
+            return max(0.0, parsed.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class AimdLimiter:
+    """
+    Concurrency limit for one provider/model, adjusted AIMD-style: every `limit` successes at healthy latency
+    add one slot; a rate-limit/overload response halves it (at most once per latency window, so one burst of
+    429s is one decrease), and sustained latency inflation trims it by 10%. A retry-after pauses admission for
+    every caller of this model, not just the one that was told to wait.
+    """
+
+    def __init__(self, provider: str, model: str) -> None:
+        self.provider = provider
+        self.model = model
+        self.max_limit = float(settings.llm_concurrency_limits.get(provider, settings.llm_max_concurrency))
+        self.min_limit = 1.0
+        self.limit = min(self.max_limit, float(settings.llm_initial_concurrency))
+        self.in_flight = 0
+        self.queued = 0
+        self.paused_until = 0.0
+        self.latency_ewma = 0.0
+        self.latency_baseline = 0.0
+        self.last_decrease = 0.0
+        self._cond = threading.Condition()
+        self.counters = {
+            "requests": 0,
+            "successes": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "cancelled": 0,
+            "retries": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    def _admissible(self, now: float) -> bool:
+        return now >= self.paused_until and self.in_flight < max(1, int(self.limit))
+
+    def acquire(self) -> float:
+        """Block until a slot is free; returns the time spent queued."""
+        started = time.monotonic()
+        with self._cond:
+            self.queued += 1
+            try:
+                while not self._admissible(now := time.monotonic()):
+                    # A retry-after pause ends on its own; a full limit ends when a release notifies.
+                    self._cond.wait(self.paused_until - now if now < self.paused_until else None)
+                return self._admit(started)
+            finally:
+                self.queued -= 1
+
+    def try_acquire(self, started: float) -> float | None:
+        with self._cond:
+            if not self._admissible(time.monotonic()):
+                return None
+            return self._admit(started)
+
+    def _admit(self, started: float) -> float:
+        self.in_flight += 1
+        waited = time.monotonic() - started
+        self.counters["requests"] += 1
+        self.counters["queue_wait_seconds"] += waited
+        self.counters["max_queue_wait_seconds"] = max(self.counters["max_queue_wait_seconds"], waited)
+        return waited
+
+    def release(self, outcome: str, latency: float, retry_after: float | None = None) -> None:
+        now = time.monotonic()
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == "success":
+                self.counters["successes"] += 1
+                self._observe_latency(latency, now)
+            elif outcome == "cancelled":
+                # Says nothing about provider health, so the limit is left alone.
+                self.counters["cancelled"] += 1
+            elif outcome in {"rate_limited", "overloaded"}:
+                self.counters["rate_limited"] += 1
+                self._decrease(0.5, now)
+                if retry_after:
+                    self.paused_until = max(self.paused_until, now + retry_after)
+            else:
+                self.counters["errors"] += 1
+            self._cond.notify_all()
+
+    def count_retry(self) -> None:
+        with self._cond:
+            self.counters["retries"] += 1
+
+    def _observe_latency(self, latency: float, now: float) -> None:
+        alpha = 0.2
+        self.latency_ewma = latency if not self.latency_ewma else (1 - alpha) * self.latency_ewma + alpha * latency
+        # The baseline tracks the best recent latency and drifts up slowly so it forgets old fast periods.
+        if not self.latency_baseline or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+        else:
+            self.latency_baseline *= 1.002
+        if self.latency_ewma > self.latency_baseline * settings.llm_latency_tolerance:
+            self._decrease(0.9, now)
+        elif self.in_flight + 1 >= int(self.limit):
+            # Only grow a limit that is actually being used, or an idle period would inflate it unchecked.
+            self.limit = min(self.max_limit, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def _decrease(self, factor: float, now: float) -> None:
+        if now - self.last_decrease < max(self.latency_ewma, 1.0):
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.last_decrease = now
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            counters = dict(self.counters)
+            requests = counters["requests"]
+            return {
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in counters.items()},
+                "avg_queue_wait_seconds": round(counters["queue_wait_seconds"] / requests, 3) if requests else 0.0,
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "latency_ewma_seconds": round(self.latency_ewma, 3),
+                "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            }
+
+
+class LlmGovernor:
+    """
+    Process-wide admission control for LLM calls, one AimdLimiter per provider/model. `call`/`acall` queue for a
+    slot, run the request, feed the outcome back into the limit and retry rate limits, overloads, 5xx and
+    timeouts with full-jitter exponential backoff (never sooner than a retry-after). Clients passed through the
+    governor should be built with `max_retries=0` so SDK retries do not multiply these.
+
+    When a distributed rate limiter is available (Redis), every attempt first reserves one request and the
+    caller's `tokens` estimate against the cluster-wide budget, and the estimate is corrected with the reported
+    usage afterwards, so several worker processes together stay inside the provider's RPM/TPM quotas. A failed
+    attempt hands its token reservation back (its request still counts), so a burst of 429s and retries does
+    not drain the shared token budget.
+    """
+
+    def __init__(self, rate_limiter: RedisTokenBucketLimiter | None = None) -> None:
+        self.rate_limiter = rate_limiter
+        self._limiters: dict[tuple[str, str], AimdLimiter] = {}
+        self._callers: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider: str, model: str) -> AimdLimiter:
+        key = (provider, model)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(key, AimdLimiter(provider, model))
+        return limiter
+
+    def call(self, provider: str, model: str, fn: Callable[[], T], caller: str = "default", tokens: int = 0) -> T:
+        limiter = self.limiter(provider, model)
+        rate_limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire(provider, model, tokens)
+            waited = limiter.acquire()
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as exc:
+                delay = self._failed(limiter, caller, exc, attempt, started, waited)
+                if rate_limiter is not None:
+                    rate_limiter.settle(provider, model, tokens, 0)
+                if delay is None:
+                    raise
+                attempt += 1
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self._cancelled(limiter, provider, model, tokens, started)
+                raise
+            self._succeeded(limiter, caller, started, waited)
+            if rate_limiter is not None:
+                rate_limiter.settle(provider, model, tokens, usage_tokens(result))
+            return result
+
+    async def acall(
+        self, provider: str, model: str, fn: Callable[[], Awaitable[T]], caller: str = "default", tokens: int = 0
+    ) -> T:
+        limiter = self.limiter(provider, model)
+        rate_limiter = self.rate_limiter
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                # The Redis round trip is short but blocking, so it stays off the event loop.
+                while (wait := await asyncio.to_thread(rate_limiter.try_acquire, provider, model, tokens)) > 0:
+                    await asyncio.sleep(wait + random.uniform(0, 0.05))
+            queued_at = time.monotonic()
+            # Polling keeps the event loop free; a blocking acquire would stall every other coroutine.
+            while (waited := limiter.try_acquire(queued_at)) is None:
+                await asyncio.sleep(0.05)
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as exc:
+                delay = self._failed(limiter, caller, exc, attempt, started, waited)
+                if rate_limiter is not None:
+                    await asyncio.to_thread(rate_limiter.settle, provider, model, tokens, 0)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancellation (e.g. the research budget dropping in-flight searches) must still free the slot.
+                self._cancelled(limiter, provider, model, tokens, started)
+                raise
+            self._succeeded(limiter, caller, started, waited)
+            if rate_limiter is not None:
+                await asyncio.to_thread(rate_limiter.settle, provider, model, tokens, usage_tokens(result))
+            return result
+
+    def _cancelled(self, limiter: AimdLimiter, provider: str, model: str, tokens: int, started: float) -> None:
+        """Free the slot and return the token reservation of an attempt abandoned by cancellation or shutdown."""
+        limiter.release("cancelled", time.monotonic() - started)
+        if self.rate_limiter is not None:
+            self.rate_limiter.settle(provider, model, tokens, 0)
+
+    def _succeeded(self, limiter: AimdLimiter, caller: str, started: float, waited: float) -> None:
+        limiter.release("success", time.monotonic() - started)
+        self._record_caller(caller, waited)
+
+    def _failed(
+        self, limiter: AimdLimiter, caller: str, exc: BaseException, attempt: int, started: float, waited: float
+    ) -> float | None:
+        """Release the slot and return the backoff before the next attempt, or None when the error is final."""
+        kind = classify_llm_failure(exc)
+        retry_after = retry_after_seconds(exc)
+        limiter.release(kind, time.monotonic() - started, retry_after)
+        self._record_caller(caller, waited)
+        if kind not in RETRYABLE or attempt >= settings.llm_max_retries:
+            return None
+        limiter.count_retry()
+        backoff = random.uniform(0, min(settings.llm_backoff_max_seconds, settings.llm_backoff_base_seconds * 2**attempt))
+        return max(backoff, (retry_after or 0.0) + random.uniform(0, 0.25))
+
+    def _record_caller(self, caller: str, waited: float) -> None:
+        with self._lock:
+            stats = self._callers.setdefault(caller, {"calls": 0, "queue_wait_seconds": 0.0})
+            stats["calls"] += 1
+            stats["queue_wait_seconds"] += waited
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            limiters = list(self._limiters.values())
+            callers = {name: {k: round(v, 3) for k, v in stats.items()} for name, stats in self._callers.items()}
+        return {
+            "models": {f"{lim.provider}:{lim.model}": lim.snapshot() for lim in limiters},
+            "callers": callers,
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter is not None else {"backend": "disabled"},
+        }
+
+
+_governor: LlmGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_llm_governor() -> LlmGovernor:
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = LlmGovernor(get_rate_limiter())
+    return _governor
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Turns concurrent single-item calls into batched calls. The first caller of a batch waits up to `max_wait`
+    seconds for others to join, or until `max_items` are queued, then runs `run_batch` on the whole batch
+    in its own thread; every caller blocks only on its own result. Lets the pipeline's analysis workers keep
+    their one-document interface while the agent sees multi-document requests.
+    """
+
+    def __init__(self, run_batch: Callable[[list[T]], list[R]], max_items: int, max_wait: float) -> None:
+        self.run_batch = run_batch
+        self.max_items = max(1, max_items)
+        self.max_wait = max_wait
+        self._pending: list[tuple[T, Future]] = []
+        self._cond = threading.Condition()
+        self.stats = {"batches": 0, "items": 0, "largest_batch": 0}
+
+    def submit(self, item: T) -> R:
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((item, future))
+            leader = len(self._pending) == 1
+            if len(self._pending) >= self.max_items:
+                batch = self._take()
+            elif leader:
+                deadline = time.monotonic() + self.max_wait
+                while self._pending and self._pending[0][1] is future and len(self._pending) < self.max_items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                # Still at the head means nobody filled and flushed the batch while we waited.
+                batch = self._take() if self._pending and self._pending[0][1] is future else []
+            else:
+                batch = []
+        if batch:
+            self._execute(batch)
+        return future.result()
+
+    def _take(self) -> list[tuple[T, Future]]:
+        batch, self._pending = self._pending, []
+        self.stats["batches"] += 1
+        self.stats["items"] += len(batch)
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        self._cond.notify_all()
+        return batch
+
+    def _execute(self, batch: list[tuple[T, Future]]) -> None:
+        try:
+            results = self.run_batch([item for item, _ in batch])
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.config import settings
+from app.services.kv_store import KeyValueStore, build_durable_store
+from app.utils.url_canonical import canonical_key
+
+
+@dataclass
+class CachedPage:
+    url: str
+    cleaned_text: str
+    raw: bytes
+    encoding: str
+    etag: str
+    last_modified: str
+    fetched_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < settings.page_cache_fresh_seconds
+
+    def raw_text(self) -> str:
+        return self.raw.decode(self.encoding or "utf-8", errors="replace")
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _pack(page: CachedPage) -> bytes:
+    header = json.dumps(
+        {
+            "url": page.url,
+            "cleaned_text": page.cleaned_text,
+            "encoding": page.encoding,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": page.fetched_at,
+        }
+    ).encode("utf-8")
+    return struct.pack(">I", len(header)) + header + zlib.compress(page.raw, 6)
+
+
+def _unpack(blob: bytes) -> CachedPage:
+    (header_len,) = struct.unpack(">I", blob[:4])
+    header = json.loads(blob[4 : 4 + header_len])
+    return CachedPage(raw=zlib.decompress(blob[4 + header_len :]), **header)
+
+
+class PageCache:
+    """
+    Scraped pages keyed by canonical URL: cleaned text, zlib-compressed raw bytes and HTTP validators.
+    Within the freshness window a page is served without touching the network; after it, the scraper
+    revalidates with If-None-Match / If-Modified-Since and a 304 reuses the stored copy without re-parsing.
+    """
+
+    def __init__(
+        self,
+        durable: KeyValueStore | None = None,
+        max_memory_items: int | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self.durable = durable
+        self.max_memory_items = max_memory_items or settings.page_cache_memory_items
+        self.enabled = settings.page_cache_enabled if enabled is None else enabled
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "fresh_hits": 0,
+            "revalidated": 0,
+            "changed": 0,
+            "misses": 0,
+            "stores": 0,
+            "bytes_saved": 0,
+            "bytes_downloaded": 0,
+        }
+
+    def key_for(self, url: str) -> str:
+        return hashlib.sha1(canonical_key(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> CachedPage | None:
+        if not self.enabled:
+            return None
+        key = self.key_for(url)
+        with self._lock:
+            blob = self._memory.get(key)
+            if blob is not None:
+                self._memory.move_to_end(key)
+        if blob is None and self.durable is not None:
+            try:
+                blob = self.durable.get(key)
+            except Exception:
+                blob = None
+            if blob:
+                self._remember(key, blob)
+        if not blob:
+            return None
+        try:
+            return _unpack(blob)
+        except Exception:
+            return None
+
+    def put(self, url: str, raw: bytes, cleaned_text: str, encoding: str, etag: str, last_modified: str) -> None:
+        if not self.enabled:
+            return
+        page = CachedPage(url, cleaned_text, raw, encoding, etag, last_modified, time.time())
+        self._store(page)
+
+    def touch(self, page: CachedPage) -> None:
+        """Restart the freshness window after a 304."""
+        page.fetched_at = time.time()
+        self._store(page)
+
+    def record(self, outcome: str, nbytes: int = 0) -> None:
+        """Count a lookup outcome; `nbytes` is what was downloaded (misses) or avoided (hits)."""
+        with self._lock:
+            self._stats[outcome] += 1
+            if outcome in {"fresh_hits", "revalidated"}:
+                self._stats["bytes_saved"] += nbytes
+            else:
+                self._stats["bytes_downloaded"] += nbytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["fresh_hits"] + stats["revalidated"] + stats["changed"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["fresh_hits"] + stats["revalidated"]) / lookups, 3) if lookups else 0.0
+        stats["durable_backend"] = self.durable.name if self.durable is not None else "none"
+        return stats
+
+    def _store(self, page: CachedPage) -> None:
+        key = self.key_for(page.url)
+        blob = _pack(page)
+        self._remember(key, blob)
+        if self.durable is not None:
+            try:
+                self.durable.set(key, blob, settings.page_cache_ttl_seconds)
+            except Exception:
+                pass
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def _remember(self, key: str, blob: bytes) -> None:
+        with self._lock:
+            self._memory[key] = blob
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+_cache: PageCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                durable = build_durable_store("pages") if settings.page_cache_enabled else None
+                _cache = PageCache(durable=durable)
+    return _cache
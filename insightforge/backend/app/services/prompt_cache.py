@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from hashlib import sha256
+
+from app.config import settings
+
+# The pinned SDK predates GA prompt caching; the beta header enables `cache_control` on system blocks and the
+# API keeps accepting it now that caching is generally available.
+PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+
+
+def cacheable_system(*blocks: str) -> list[dict]:
+    """
+    System blocks for an Anthropic request, most stable first, each ending a cache breakpoint. Everything up to a
+    breakpoint is reused from the provider's cache when a later request starts with the same bytes, so these
+    blocks must never contain per-call values. Prefixes below the model's minimum cacheable length are simply
+    processed uncached.
+    """
+    system = [{"type": "text", "text": block} for block in blocks if block]
+    if settings.llm_prompt_caching:
+        for block in system[-4:]:  # The API allows at most four breakpoints per request.
+            block["cache_control"] = {"type": "ephemeral"}
+    return system
+
+
+def cache_headers() -> dict[str, str]:
+    return {"anthropic-beta": PROMPT_CACHING_BETA} if settings.llm_prompt_caching else {}
+
+
+def prefix_fingerprint(system: list[dict]) -> str:
+    """Short digest of the cacheable prefix; two calls can only share a cache entry when these match."""
+    return sha256("\x00".join(block["text"] for block in system).encode("utf-8")).hexdigest()[:16]
+
+
+def usage_breakdown(usage) -> dict[str, int]:
+    """
+    Input tokens of one Anthropic response split by caching: `input_tokens` are processed at full price,
+    `cached_input_tokens` were read from the cache and `cache_write_input_tokens` were processed and stored.
+    """
+    if usage is None:
+        return {"input_tokens": 0, "cached_input_tokens": 0, "cache_write_input_tokens": 0, "output_tokens": 0}
+    return {
+        "input_tokens": int(getattr(usage, "input_tokens", 0) or 0),
+        "cached_input_tokens": int(getattr(usage, "cache_read_input_tokens", 0) or 0),
+        "cache_write_input_tokens": int(getattr(usage, "cache_creation_input_tokens", 0) or 0),
+        "output_tokens": int(getattr(usage, "output_tokens", 0) or 0),
+    }
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+from app.config import settings
+from app.services.kv_store import get_redis_client
+
+# Idle buckets are full by definition, so they can simply expire.
+BUCKET_TTL_MS = 120_000
+
+# Two token buckets (requests and LLM tokens) in one hash, refilled continuously from the Redis clock so every
+# worker sees the same time. Both budgets are taken together or not at all; on refusal the script returns how
+# long the caller should wait for the scarcer one.
+# KEYS[1] bucket hash; ARGV: request capacity, requests/ms, token capacity, tokens/ms, tokens wanted, ttl ms.
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local req_cap = tonumber(ARGV[1])
+local req_rate = tonumber(ARGV[2])
+local tok_cap = tonumber(ARGV[3])
+local tok_rate = tonumber(ARGV[4])
+local wanted = math.min(tonumber(ARGV[5]), tok_cap)
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'ts')
+local requests = tonumber(state[1]) or req_cap
+local tokens = tonumber(state[2]) or tok_cap
+local ts = tonumber(state[3]) or now
+local elapsed = math.max(0, now - ts)
+requests = math.min(req_cap, requests + elapsed * req_rate)
+tokens = math.min(tok_cap, tokens + elapsed * tok_rate)
+local wait = 0
+if requests < 1 then
+  wait = math.max(wait, (1 - requests) / req_rate)
+end
+if tokens < wanted then
+  wait = math.max(wait, (wanted - tokens) / tok_rate)
+end
+if wait == 0 then
+  requests = requests - 1
+  tokens = tokens - wanted
+end
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[6])
+return math.ceil(wait)
+"""
+
+# Returns the difference between the reserved estimate and the real usage to the token bucket (or takes the
+# overrun from it, possibly below zero so later callers wait it off).
+# KEYS[1] bucket hash; ARGV: token capacity, tokens to add back (negative to charge), ttl ms.
+SETTLE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return 0
+end
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens')) or 0
+tokens = math.min(tonumber(ARGV[1]), tokens + tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens))
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class RedisTokenBucketLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budgets per provider/model, shared by every process that talks to
+    the same Redis (API, Celery workers). `acquire` reserves one request and an estimate of the call's tokens
+    atomically, waiting until both buckets can cover it; `settle` corrects the token bucket with the usage the
+    provider reported. Redis errors fail open - the local concurrency governor still applies - and are counted.
+
+    The Redis client is injected so the limiter runs against the broker, a local Redis or fakeredis alike.
+    """
+
+    def __init__(
+        self, client, limits: dict[str, dict[str, int]] | None = None, prefix: str = "insightforge:llm_rate:"
+    ) -> None:
+        self.client = client
+        self.limits = settings.llm_rate_limits if limits is None else limits
+        self.prefix = prefix
+        self._acquire = client.register_script(ACQUIRE_SCRIPT)
+        self._settle = client.register_script(SETTLE_SCRIPT)
+        self._lock = threading.Lock()
+        self.counters = {"acquired": 0, "throttled": 0, "wait_seconds": 0.0, "settled_tokens": 0, "redis_errors": 0}
+
+    def budget(self, provider: str, model: str) -> dict[str, int] | None:
+        """Limits for `provider:model`, else for the provider; None means the model is not rate limited."""
+        return self.limits.get(f"{provider}:{model}") or self.limits.get(provider)
+
+    def _key(self, provider: str, model: str) -> str:
+        return f"{self.prefix}{provider}:{model}"
+
+    def _args(self, budget: dict[str, int]) -> tuple[int, float, int, float]:
+        rpm = max(1, int(budget.get("requests_per_minute", 0)) or 1_000_000)
+        tpm = max(1, int(budget.get("tokens_per_minute", 0)) or 1_000_000_000)
+        return rpm, rpm / 60_000.0, tpm, tpm / 60_000.0
+
+    def try_acquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """Reserve a request and `tokens`; returns 0 on success, else the seconds to wait before trying again."""
+        budget = self.budget(provider, model)
+        if budget is None:
+            return 0.0
+        req_cap, req_rate, tok_cap, tok_rate = self._args(budget)
+        try:
+            wait_ms = int(
+                self._acquire(
+                    keys=[self._key(provider, model)],
+                    args=[req_cap, req_rate, tok_cap, tok_rate, max(0, tokens), BUCKET_TTL_MS],
+                )
+            )
+        except Exception:
+            self._count("redis_errors")
+            return 0.0
+        if wait_ms <= 0:
+            self._count("acquired")
+            return 0.0
+        return wait_ms / 1000.0
+
+    def acquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """Block until the reservation succeeds; returns the time spent waiting."""
+        started = time.monotonic()
+        throttled = False
+        while (wait := self.try_acquire(provider, model, tokens)) > 0:
+            throttled = True
+            # A little jitter so workers refused together do not all retry in the same millisecond.
+            time.sleep(wait + random.uniform(0, 0.05))
+        waited = time.monotonic() - started
+        if throttled:
+            self._count("throttled")
+            self._count("wait_seconds", waited)
+        return waited
+
+    def settle(self, provider: str, model: str, reserved: int, used: int | None) -> None:
+        budget = self.budget(provider, model)
+        if budget is None or used is None or used == reserved:
+            return
+        _, _, tok_cap, _ = self._args(budget)
+        try:
+            self._settle(keys=[self._key(provider, model)], args=[tok_cap, reserved - used, BUCKET_TTL_MS])
+        except Exception:
+            self._count("redis_errors")
+            return
+        self._count("settled_tokens", used - reserved)
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            "backend": "redis",
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in counters.items()},
+            "limits": self.limits,
+        }
+
+
+_limiter: RedisTokenBucketLimiter | None = None
+_limiter_checked = False
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RedisTokenBucketLimiter | None:
+    """The shared limiter on settings.redis_url, or None when disabled or Redis is unreachable."""
+    global _limiter, _limiter_checked
+    if _limiter_checked:
+        return _limiter
+    with _limiter_lock:
+        if not _limiter_checked:
+            client = get_redis_client() if settings.llm_rate_limit_enabled else None
+            _limiter = RedisTokenBucketLimiter(client) if client is not None else None
+            _limiter_checked = True
+    return _limiter
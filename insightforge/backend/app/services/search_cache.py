@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from app.config import settings
+from app.services.kv_store import KeyValueStore, build_durable_store
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Two-tier (in-process LRU + durable SQLite/Redis) cache of normalized search result lists."""
+
+    def __init__(
+        self,
+        durable: KeyValueStore | None = None,
+        max_memory_items: int | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self.durable = durable
+        self.max_memory_items = max_memory_items or settings.search_cache_memory_items
+        self.enabled = settings.search_cache_enabled if enabled is None else enabled
+        self._memory: OrderedDict[str, tuple[float, int, list[dict]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "durable_hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+
+    def ttl_for(self, engine: str) -> int:
+        return int(settings.search_cache_engine_ttls.get(engine, settings.search_cache_ttl_seconds))
+
+    def key_for(self, engine: str, query: str) -> str:
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{engine}:{digest}"
+
+    def get(self, engine: str, query: str, per_query: int) -> list[dict] | None:
+        key = self.key_for(engine, query)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, fetched_limit, results = entry
+                if expires_at >= now and self._covers(fetched_limit, results, per_query):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return [dict(x) for x in results[:per_query]]
+                if expires_at < now:
+                    del self._memory[key]
+
+        if self.durable is not None:
+            try:
+                raw = self.durable.get(key)
+            except Exception:
+                raw = None
+            if raw:
+                payload = json.loads(raw)
+                fetched_limit, results = payload["limit"], payload["results"]
+                if self._covers(fetched_limit, results, per_query):
+                    expires_at = payload.get("expires_at") or now + self.ttl_for(engine)
+                    self._remember(key, expires_at, fetched_limit, results)
+                    with self._lock:
+                        self._stats["durable_hits"] += 1
+                    return [dict(x) for x in results[:per_query]]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, engine: str, query: str, per_query: int, results: list[dict]) -> None:
+        if not results:
+            # Empty lists usually mean the engine failed or throttled us; never pin those.
+            return
+        key = self.key_for(engine, query)
+        ttl = self.ttl_for(engine)
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, per_query, results)
+        if self.durable is not None:
+            payload = {"limit": per_query, "expires_at": expires_at, "results": results}
+            try:
+                self.durable.set(key, json.dumps(payload).encode("utf-8"), ttl)
+            except Exception:
+                pass
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def get_or_fetch(
+        self,
+        engine: str,
+        query: str,
+        per_query: int,
+        fetch: Callable[[], list[dict]],
+        bypass: bool = False,
+    ) -> list[dict]:
+        if bypass or not self.enabled:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return fetch()
+
+        cached = self.get(engine, query, per_query)
+        if cached is not None:
+            return cached
+        results = fetch()
+        self.put(engine, query, per_query, results)
+        return results
+
+    async def aget_or_fetch(
+        self,
+        engine: str,
+        query: str,
+        per_query: int,
+        fetch: Callable[[], Awaitable[list[dict]]],
+        bypass: bool = False,
+    ) -> list[dict]:
+        if bypass or not self.enabled:
+            with self._lock:
+                self._stats["bypassed"] += 1
+            return await fetch()
+
+        # The durable tier does blocking I/O, so lookups and stores run off the event loop.
+        cached = await asyncio.to_thread(self.get, engine, query, per_query)
+        if cached is not None:
+            return cached
+        results = await fetch()
+        await asyncio.to_thread(self.put, engine, query, per_query, results)
+        return results
+
+    def invalidate(self, engine: str | None = None) -> None:
+        with self._lock:
+            if engine is None:
+                self._memory.clear()
+            else:
+                for key in [k for k in self._memory if k.startswith(f"{engine}:")]:
+                    del self._memory[key]
+        if self.durable is not None:
+            self.durable.delete_prefix(f"{engine}:" if engine else "")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["durable_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["durable_hits"]) / lookups, 3) if lookups else 0.0
+        stats["durable_backend"] = self.durable.name if self.durable is not None else "none"
+        return stats
+
+    def _covers(self, fetched_limit: int, results: list[dict], per_query: int) -> bool:
+        # A shorter list than was asked for means the engine had nothing more, so it satisfies larger asks too.
+        return per_query <= fetched_limit or len(results) < fetched_limit
+
+    def _remember(self, key: str, expires_at: float, fetched_limit: int, results: list[dict]) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, fetched_limit, results)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+_cache: SearchCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                durable = build_durable_store("search") if settings.search_cache_enabled else None
+                _cache = SearchCache(durable=durable)
+    return _cache
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import copy
+import heapq
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from app.config import settings
+from app.utils.domain_matcher import host_of
+from app.utils.near_duplicates import SimHashIndex, simhash
+from app.utils.url_canonical import canonical_key, clean_url
+
+
+EMPTY_SCRAPE = {"raw_text": "", "cleaned_text": ""}
+
+
+def default_insight() -> dict:
+    return {
+        "market_size_usd_billion": None,
+        "cagr_percent": None,
+        "drivers": [],
+        "restraints": [],
+        "trends": [],
+        "key_companies": [],
+        "regulatory_notes": [],
+        "confidence_score": 0.4,
+    }
+
+
+# Stages a source moves through. A queued source that drops out of the running top-k goes back to
+# PENDING (or SCRAPED) when a worker picks it up, and is re-queued if it climbs back in.
+PENDING = "pending"
+SCRAPE_QUEUED = "scrape_queued"
+SCRAPING = "scraping"
+SCRAPED = "scraped"
+ANALYSIS_QUEUED = "analysis_queued"
+ANALYZING = "analyzing"
+DONE = "done"
+MERGED = "merged"
+
+_STOP = object()
+
+
+@dataclass
+class _Entry:
+    key: str
+    payload: dict
+    order: int
+    # Raw URLs that collapsed into this source; the old exact-URL merge would have scraped each separately.
+    variants: set[str] = field(default_factory=set)
+    stage: str = PENDING
+    wanted: bool = False
+    scraped: dict = field(default_factory=lambda: dict(EMPTY_SCRAPE))
+    insight: dict | None = None
+    # SimHash of cleaned_text; None when the text is too short to fingerprint reliably.
+    fingerprint: int | None = None
+    # Near-duplicates waiting on this entry's analysis instead of running their own.
+    followers: list[_Entry] = field(default_factory=list)
+
+    def rank(self) -> tuple[int, float]:
+        return len(self.payload.get("sections", [])), self.payload.get("relevance_score", 0)
+
+
+class SourcePipeline:
+    """
+    Streams research results through scraping and analysis instead of waiting for each stage to finish.
+
+    Sections are fed in as the research planner completes them; sources are merged by canonical URL (and again
+    once redirect links are resolved, just before scraping) and ranked the same way the batch flow ranked them (section coverage, then relevance). Only the running top `cap`
+    sources are queued for work. When a better source displaces one that is still queued, the worker that
+    picks up the displaced source drops it, so late high-ranked results do not wait behind low-ranked ones.
+    Scraped documents are SimHash-fingerprinted, and near-duplicates (syndicated or mirrored copies under other
+    URLs) reuse the insight of the first copy analyzed instead of making their own LLM call.
+    """
+
+    def __init__(
+        self,
+        scrape: Callable[[str], dict],
+        analyze: Callable[[str], dict],
+        cap: int,
+        scrape_workers: int | None = None,
+        analysis_workers: int | None = None,
+        queue_size: int | None = None,
+        resolve: Callable[[str], str] | None = None,
+        dedupe: bool | None = None,
+    ) -> None:
+        self.scrape = scrape
+        self.analyze = analyze
+        self.resolve = resolve
+        self.cap = max(1, cap)
+        size = queue_size or settings.pipeline_queue_size
+        self._scrape_queue: queue.Queue = queue.Queue(maxsize=size)
+        self._analysis_queue: queue.Queue = queue.Queue(maxsize=size)
+        self._entries: dict[str, _Entry] = {}
+        self._aliases: dict[str, str] = {}
+        self.dedupe = settings.dedupe_near_duplicates if dedupe is None else dedupe
+        self._fingerprints = SimHashIndex(settings.dedupe_max_hamming_distance)
+        self._cond = threading.Condition()
+        self._started_at = time.monotonic()
+        self.stats = {
+            "sources_seen": 0,
+            "scrapes_run": 0,
+            "analyses_run": 0,
+            "cancelled_before_scrape": 0,
+            "cancelled_before_analysis": 0,
+            "processed_then_discarded": 0,
+            "url_variants_merged": 0,
+            "redirects_merged": 0,
+            "duplicate_scrapes_avoided": 0,
+            "duplicate_llm_calls_avoided": 0,
+            "near_duplicate_clusters": 0,
+            "near_duplicate_llm_calls_saved": 0,
+            "research_seconds": 0.0,
+            "drain_seconds": 0.0,
+        }
+        self._workers = [
+            threading.Thread(target=self._scrape_worker, name=f"pipeline-scrape-{i}", daemon=True)
+            for i in range(max(1, scrape_workers or settings.pipeline_scrape_workers))
+        ] + [
+            threading.Thread(target=self._analysis_worker, name=f"pipeline-analyze-{i}", daemon=True)
+            for i in range(max(1, analysis_workers or settings.pipeline_analysis_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def add_section(self, section: str, results: list[dict]) -> None:
+        """Merge one finished section into the pool and queue any sources that entered the top-k."""
+        with self._cond:
+            for src in results:
+                raw_url = src.get("url", "").strip()
+                if not raw_url:
+                    continue
+                url = clean_url(raw_url) or raw_url
+                entry = self._entries.get(self._lookup(canonical_key(url)))
+                if entry is None:
+                    key = canonical_key(url)
+                    entry = _Entry(key, {**src, "url": url, "sections": []}, order=len(self._entries))
+                    self._entries[key] = entry
+                    self.stats["sources_seen"] += 1
+                elif raw_url not in entry.variants:
+                    self.stats["url_variants_merged"] += 1
+                entry.variants.add(raw_url)
+                _merge_payload(entry.payload, [section], src)
+            to_scrape, to_analyze = self._rerank()
+        self._enqueue(to_scrape, to_analyze)
+
+    def _enqueue(self, to_scrape: list[str], to_analyze: list[str]) -> None:
+        # Puts may block on a full queue; never hold the lock while waiting on the workers.
+        for key in to_scrape:
+            self._scrape_queue.put(key)
+        for key in to_analyze:
+            self._analysis_queue.put(key)
+
+    def _lookup(self, key: str) -> str:
+        while key in self._aliases:
+            key = self._aliases[key]
+        return key
+
+    def finish(self) -> list[tuple[dict, dict, dict]]:
+        """Wait for the final top-k to be scraped and analyzed; returns (source, scraped, insight) in rank order."""
+        self.stats["research_seconds"] = round(time.monotonic() - self._started_at, 3)
+        drain_started = time.monotonic()
+        with self._cond:
+            self._cond.wait_for(lambda: all(e.stage == DONE for e in self._entries.values() if e.wanted))
+            selected = self._top_k()
+            for entry in self._entries.values():
+                if not entry.wanted and entry.stage in (SCRAPED, DONE):
+                    self.stats["processed_then_discarded"] += 1
+            avoided = sum(len(entry.variants) - 1 for entry in selected)
+            self.stats["duplicate_scrapes_avoided"] = avoided
+            self.stats["duplicate_llm_calls_avoided"] = avoided
+        self.close()
+        self.stats["drain_seconds"] = round(time.monotonic() - drain_started, 3)
+        return [(entry.payload, entry.scraped, entry.insight or default_insight()) for entry in selected]
+
+    def close(self) -> None:
+        """Stop the workers once they reach the end of their queues; nothing is wanted after this."""
+        with self._cond:
+            for entry in self._entries.values():
+                entry.wanted = entry.wanted and entry.stage == DONE
+        for worker in self._workers:
+            target = self._scrape_queue if worker.name.startswith("pipeline-scrape") else self._analysis_queue
+            target.put(_STOP)
+
+    def _top_k(self) -> list[_Entry]:
+        # nlargest matches sorted(..., reverse=True)[:cap], so ties keep arrival order.
+        return heapq.nlargest(self.cap, self._entries.values(), key=lambda e: (e.rank(), -e.order))
+
+    def _rerank(self) -> tuple[list[str], list[str]]:
+        top = {id(entry) for entry in self._top_k()}
+        to_scrape: list[str] = []
+        to_analyze: list[str] = []
+        for key, entry in self._entries.items():
+            entry.wanted = id(entry) in top
+            if not entry.wanted:
+                continue
+            if entry.stage == PENDING:
+                entry.stage = SCRAPE_QUEUED
+                to_scrape.append(key)
+            elif entry.stage == SCRAPED:
+                entry.stage = ANALYSIS_QUEUED
+                to_analyze.append(key)
+        return to_scrape, to_analyze
+
+    def _claim(self, key: str, queued: str, running: str, parked: str, cancelled_stat: str) -> _Entry | None:
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None or entry.stage != queued:
+                return None
+            if not entry.wanted:
+                entry.stage = parked
+                self.stats[cancelled_stat] += 1
+                self._cond.notify_all()
+                return None
+            entry.stage = running
+            return entry
+
+    def _scrape_worker(self) -> None:
+        while True:
+            key = self._scrape_queue.get()
+            if key is _STOP:
+                return
+            entry = self._claim(key, SCRAPE_QUEUED, SCRAPING, PENDING, "cancelled_before_scrape")
+            if entry is None or not self._resolve_redirect(entry):
+                continue
+            try:
+                scraped = self.scrape(entry.payload["url"])
+            except Exception:
+                scraped = dict(EMPTY_SCRAPE)
+            fingerprint = self._fingerprint(scraped.get("cleaned_text", ""))
+            with self._cond:
+                entry.scraped = scraped
+                entry.fingerprint = fingerprint
+                self.stats["scrapes_run"] += 1
+                entry.stage = ANALYSIS_QUEUED if entry.wanted else SCRAPED
+                forward = entry.stage == ANALYSIS_QUEUED
+                self._cond.notify_all()
+            if forward:
+                self._analysis_queue.put(key)
+
+    def _resolve_redirect(self, entry: _Entry) -> bool:
+        """
+        Follow shortener/aggregator links before scraping. Returns False when the target is a source we already
+        hold, in which case this entry is folded into it and never scraped.
+        """
+        if self.resolve is None:
+            return True
+        url = entry.payload["url"]
+        try:
+            target = self.resolve(url)
+        except Exception:
+            target = url
+        if not target or target == url:
+            return True
+
+        with self._cond:
+            target_key = canonical_key(target)
+            other = self._entries.get(self._lookup(target_key))
+            if other is None or other is entry:
+                entry.payload["url"] = target
+                entry.payload["domain"] = host_of(target)
+                if target_key != entry.key:
+                    self._aliases[target_key] = entry.key
+                return True
+            _merge_payload(other.payload, entry.payload["sections"], entry.payload)
+            other.variants |= entry.variants
+            del self._entries[entry.key]
+            self._aliases[entry.key] = other.key
+            entry.stage = MERGED
+            self.stats["redirects_merged"] += 1
+            to_scrape, to_analyze = self._rerank()
+            self._cond.notify_all()
+        if to_scrape or to_analyze:
+            # A scrape worker must not block on its own full queue, so hand the puts to a helper thread.
+            threading.Thread(target=self._enqueue, args=(to_scrape, to_analyze), daemon=True).start()
+        return False
+
+    def _analysis_worker(self) -> None:
+        while True:
+            key = self._analysis_queue.get()
+            if key is _STOP:
+                return
+            entry = self._claim(key, ANALYSIS_QUEUED, ANALYZING, SCRAPED, "cancelled_before_analysis")
+            if entry is None or self._join_cluster(entry):
+                continue
+            try:
+                insight = self.analyze(entry.scraped.get("cleaned_text", ""))
+            except Exception:
+                insight = default_insight()
+            with self._cond:
+                entry.insight = insight
+                entry.stage = DONE
+                self.stats["analyses_run"] += 1
+                for follower in entry.followers:
+                    # Followers that joined before the analysis finished are still waiting on it.
+                    if follower.stage != DONE:
+                        self._adopt(follower, entry)
+                self._cond.notify_all()
+
+    def _fingerprint(self, text: str) -> int | None:
+        # Scrape fallbacks and stubs are short and near-identical to each other; never cluster them.
+        if not self.dedupe or len(text.split()) < settings.dedupe_min_words:
+            return None
+        return simhash(text)
+
+    def _join_cluster(self, entry: _Entry) -> bool:
+        """
+        Attach `entry` to an already analyzed (or analyzing) near-duplicate so the LLM runs once per cluster.
+        Returns False when the entry leads a new cluster and must be analyzed itself.
+        """
+        if entry.fingerprint is None:
+            return False
+        with self._cond:
+            leader = self._entries.get(self._lookup(self._fingerprints.nearest(entry.fingerprint) or ""))
+            if leader is None or leader is entry:
+                self._fingerprints.add(entry.fingerprint, entry.key)
+                return False
+            if not leader.followers:
+                self.stats["near_duplicate_clusters"] += 1
+            leader.followers.append(entry)
+            if leader.stage == DONE:
+                self._adopt(entry, leader)
+                self._cond.notify_all()
+            return True
+
+    def _adopt(self, follower: _Entry, leader: _Entry) -> None:
+        # Each member keeps its own URL and citation; only the extracted insight is shared.
+        follower.insight = copy.deepcopy(leader.insight)
+        follower.payload["near_duplicate_of"] = leader.payload["url"]
+        follower.stage = DONE
+        self.stats["near_duplicate_llm_calls_saved"] += 1
+
+
+def _merge_payload(merged: dict, sections: list[str], src: dict) -> None:
+    for section in sections:
+        if section not in merged["sections"]:
+            merged["sections"].append(section)
+    if src.get("relevance_score", 0) > merged.get("relevance_score", 0):
+        merged["relevance_score"] = src.get("relevance_score", 0)
+        merged["title"] = src.get("title", merged.get("title", "Untitled Source"))
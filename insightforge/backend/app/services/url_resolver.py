@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.http_client import HttpClient, get_http_client
+from app.services.kv_store import KeyValueStore, build_durable_store
+from app.utils.url_canonical import clean_url, needs_resolution
+
+
+class RedirectResolver:
+    """
+    Resolves shortener and aggregator links (Google News, t.co, bit.ly, ...) to the article they point at, so
+    the same story found through different engines is scraped once. Targets are cached in memory and in the
+    durable store; failures are not cached.
+    """
+
+    def __init__(
+        self,
+        http: HttpClient | None = None,
+        durable: KeyValueStore | None = None,
+        enabled: bool | None = None,
+        max_memory_items: int = 4096,
+    ) -> None:
+        self.http = http or get_http_client()
+        self.durable = durable
+        self.enabled = settings.url_resolve_redirects if enabled is None else enabled
+        self.max_memory_items = max_memory_items
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"resolved": 0, "memory_hits": 0, "durable_hits": 0, "failures": 0}
+
+    def resolve(self, url: str) -> str:
+        if not self.enabled or not needs_resolution(url):
+            return url
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+        with self._lock:
+            target = self._memory.get(key)
+            if target is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return target
+
+        if self.durable is not None:
+            try:
+                raw = self.durable.get(key)
+            except Exception:
+                raw = None
+            if raw:
+                target = raw.decode("utf-8")
+                self._remember(key, target)
+                with self._lock:
+                    self._stats["durable_hits"] += 1
+                return target
+
+        try:
+            # Stream so only the headers of the final hop are read; the scraper fetches the body later.
+            response = self.http.get(
+                url,
+                timeout=settings.url_redirect_timeout_seconds,
+                allow_redirects=True,
+                stream=True,
+                headers={"User-Agent": "InsightForgeBot/1.0"},
+            )
+            response.close()
+            target = clean_url(response.url) or url
+        except Exception:
+            with self._lock:
+                self._stats["failures"] += 1
+            return url
+
+        self._remember(key, target)
+        if self.durable is not None:
+            try:
+                self.durable.set(key, target.encode("utf-8"), settings.url_redirect_cache_ttl_seconds)
+            except Exception:
+                pass
+        with self._lock:
+            self._stats["resolved"] += 1
+        return target
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        stats["enabled"] = self.enabled
+        return stats
+
+    def _remember(self, key: str, target: str) -> None:
+        with self._lock:
+            self._memory[key] = target
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
+_resolver: RedirectResolver | None = None
+_resolver_lock = threading.Lock()
+
+
+def get_redirect_resolver() -> RedirectResolver:
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                durable = build_durable_store("redirects") if settings.url_resolve_redirects else None
+                _resolver = RedirectResolver(durable=durable)
+    return _resolver
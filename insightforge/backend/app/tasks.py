@@ -1,22 +1,27 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from sqlalchemy import delete
+from sqlalchemy import delete, or_, select
 
 from app.agents.analysis_agent import AnalysisAgent
 from app.agents.cross_validation_agent import CrossValidationAgent
 from app.agents.financial_model_agent import FinancialModelAgent
 from app.agents.report_composer_agent import ReportComposerAgent
 from app.agents.research_agent import ResearchAgent
+from app.agents.research_planner import ResearchPlanner
 from app.agents.scraper_agent import ScraperAgent
 from app.celery_app import celery_app
 from app.config import settings
 from app.database import SessionLocal
 from app.models import Citation, ExtractedInsight, Forecast, Report, Source
+from app.services.blob_store import REF_PREFIX, get_blob_store
+from app.services.llm_governor import get_llm_governor
+from app.services.micro_batcher import MicroBatcher
 from app.services.pdf_service import write_pdf
+from app.services.source_pipeline import SourcePipeline
+from app.services.url_resolver import get_redirect_resolver
 from app.utils.markdown_utils import markdown_to_html
 
 BASE_SECTION_BATCH_PLAN = [
@@ -45,6 +50,33 @@ def generate_report_task(report_id: int) -> None:
     _generate_report_impl(report_id)
 
 
+@celery_app.task(name="app.tasks.sweep_blob_store_task")
+def sweep_blob_store_task() -> int:
+    db = SessionLocal()
+    try:
+        return sweep_blob_store(db)
+    finally:
+        db.close()
+
+
+def sweep_blob_store(db) -> int:
+    """Remove page-body blobs that no Source row references any more (see BlobStore.sweep for the grace period)."""
+    blob_store = get_blob_store()
+    if blob_store.root is None:
+        return 0
+    referenced: set[str] = set()
+    rows = db.execute(
+        select(Source.raw_text, Source.cleaned_text).where(
+            or_(Source.raw_text.startswith(REF_PREFIX), Source.cleaned_text.startswith(REF_PREFIX))
+        )
+    )
+    for raw_text, cleaned_text in rows:
+        for value in (raw_text, cleaned_text):
+            if value and value.startswith(REF_PREFIX):
+                referenced.add(value[len(REF_PREFIX) :])
+    return blob_store.sweep(referenced)
+
+
 def _generate_report_impl(report_id: int) -> None:
     db = SessionLocal()
     try:
@@ -63,111 +95,65 @@ def _generate_report_impl(report_id: int) -> None:
 
         section_batch_plan, depth_source_cap = _coverage_plan_for_depth(report.depth)
 
-        section_sources: dict[str, list[dict]] = {}
-        with ThreadPoolExecutor(max_workers=min(6, len(section_batch_plan))) as executor:
-            futures = {
-                executor.submit(
-                    research_agent.run_for_section,
-                    report.industry,
-                    report.geography,
-                    section_name,
-                    section_limit,
-                ): section_name
-                for section_name, section_limit in section_batch_plan
-            }
-            for future in as_completed(futures):
-                section_name = futures[future]
-                try:
-                    section_sources[section_name] = future.result()
-                except Exception:
-                    section_sources[section_name] = []
-
-        merged_by_url: dict[str, dict] = {}
-        for section_name, results in section_sources.items():
-            for src in results:
-                url = src.get("url", "").strip()
-                if not url:
-                    continue
-                if url not in merged_by_url:
-                    merged_by_url[url] = {**src, "sections": [section_name]}
-                else:
-                    existing_sections = merged_by_url[url].get("sections", [])
-                    if section_name not in existing_sections:
-                        existing_sections.append(section_name)
-                    if src.get("relevance_score", 0) > merged_by_url[url].get("relevance_score", 0):
-                        merged_by_url[url]["relevance_score"] = src.get("relevance_score", 0)
-                        merged_by_url[url]["title"] = src.get("title", merged_by_url[url].get("title", "Untitled Source"))
-
-        sorted_sources_payload = sorted(
-            merged_by_url.values(),
-            key=lambda x: (len(x.get("sections", [])), x.get("relevance_score", 0)),
-            reverse=True,
-        )[:depth_source_cap]
-
-        db.execute(delete(Source).where(Source.report_id == report.id))
+        replaced_sources = db.execute(delete(Source).where(Source.report_id == report.id)).rowcount
         db.execute(delete(ExtractedInsight).where(ExtractedInsight.report_id == report.id))
         db.execute(delete(Forecast).where(Forecast.report_id == report.id))
         db.execute(delete(Citation).where(Citation.report_id == report.id))
         db.commit()
 
-        scraped_results: dict[str, dict] = {}
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            scrape_futures = {executor.submit(scraper_agent.run, src["url"]): src["url"] for src in sorted_sources_payload}
-            for future in as_completed(scrape_futures):
-                url = scrape_futures[future]
-                try:
-                    scraped_results[url] = future.result()
-                except Exception:
-                    scraped_results[url] = {"raw_text": "", "cleaned_text": ""}
+        # Scraping and analysis start as soon as each section's sources are known, rather than after all research.
+        redirect_resolver = get_redirect_resolver()
+        # Workers must not touch the ORM instance, so hand them plain values.
+        industry, geography = report.industry, report.geography
+        # Analysis workers submit one document each; the batcher groups concurrent ones into multi-document calls.
+        analysis_batcher = MicroBatcher(
+            lambda texts: analysis_agent.run_batch(texts, industry, geography),
+            max_items=settings.analysis_batch_max_documents,
+            max_wait=settings.analysis_batch_wait_seconds,
+        )
+        pipeline = SourcePipeline(
+            scrape=scraper_agent.run,
+            analyze=analysis_batcher.submit,
+            cap=depth_source_cap,
+            resolve=redirect_resolver.resolve,
+        )
+        research_planner = ResearchPlanner(research_agent)
+        try:
+            research_planner.run(industry, geography, section_batch_plan, on_section=pipeline.add_section)
+        except Exception:
+            pipeline.close()
+            raise
 
+        _set_report_status(db, report, "Running", "Analyzing source documents")
+        processed_sources = pipeline.finish()
+
+        # Page bodies go to the content-addressed blob store; the rows keep only references.
+        blob_store = get_blob_store()
         persisted_sources: list[Source] = []
         source_sections_by_id: dict[int, list[str]] = {}
         section_source_counts: dict[str, int] = defaultdict(int)
-        for src in sorted_sources_payload:
-            scraped = scraped_results.get(src["url"], {"raw_text": "", "cleaned_text": ""})
+        source_insights: dict[int, dict] = {}
+        for src, scraped, insight in processed_sources:
             source = Source(
                 report_id=report.id,
                 title=src["title"],
                 url=src["url"],
                 domain=src.get("domain", ""),
                 published_at=src.get("published_at", ""),
-                raw_text=scraped["raw_text"],
-                cleaned_text=scraped["cleaned_text"],
+                raw_text=blob_store.put_text(scraped["raw_text"]),
+                cleaned_text=blob_store.put_text(scraped["cleaned_text"]),
                 relevance_score=src.get("relevance_score", 0.5),
             )
             db.add(source)
             db.flush()
             persisted_sources.append(source)
+            source_insights[source.id] = insight
             source_sections_by_id[source.id] = src.get("sections", [])
             for section_name in src.get("sections", []):
                 section_source_counts[section_name] += 1
 
-        _set_report_status(db, report, "Running", "Analyzing source documents")
-
         all_insights: list[dict] = []
         section_insights: dict[str, list[dict]] = defaultdict(list)
-        source_insights: dict[int, dict] = {}
-        with ThreadPoolExecutor(max_workers=8) as executor:
-            analysis_futures = {
-                executor.submit(analysis_agent.run, source.cleaned_text, report.industry, report.geography): source.id
-                for source in persisted_sources
-            }
-            for future in as_completed(analysis_futures):
-                source_id = analysis_futures[future]
-                try:
-                    source_insights[source_id] = future.result()
-                except Exception:
-                    source_insights[source_id] = {
-                        "market_size_usd_billion": None,
-                        "cagr_percent": None,
-                        "drivers": [],
-                        "restraints": [],
-                        "trends": [],
-                        "key_companies": [],
-                        "regulatory_notes": [],
-                        "confidence_score": 0.4,
-                    }
-
         for source in persisted_sources:
             insight = source_insights.get(source.id, {})
             all_insights.append(insight)
@@ -269,8 +255,23 @@ def _generate_report_impl(report_id: int) -> None:
             "research_depth_mode": report.depth,
             "visuals": visuals_payload,
             "section_source_counts": dict(section_source_counts),
+            "research_plan": research_planner.stats,
+            "source_pipeline": pipeline.stats,
+            "redirects": redirect_resolver.stats(),
+            "page_cache": scraper_agent.page_cache.stats(),
+            "scraper": scraper_agent.stats,
+            "cpu_pool": scraper_agent.cpu_pool.stats(),
+            "blob_store": blob_store.stats(),
+            "analysis": {**analysis_agent.stats, "batching": analysis_batcher.stats},
+            "llm_governor": get_llm_governor().snapshot(),
         }
         _set_report_status(db, report, "Complete", "Report generated successfully")
+        if replaced_sources:
+            # Bodies only the previous run cited are unreferenced now; a failed sweep must not fail the report.
+            try:
+                sweep_blob_store(db)
+            except Exception:
+                pass
 
     except Exception as exc:
         if report_id:
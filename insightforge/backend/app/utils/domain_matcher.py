@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntFlag
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from app.market_intel.contracts import ALLOWED_SOURCE_PATTERNS, DISALLOWED_SOURCE_PATTERNS
+
+
+BLOCKED_DOMAINS = {
+    "youtube.com",
+    "facebook.com",
+    "instagram.com",
+    "tiktok.com",
+    "x.com",
+    "twitter.com",
+    "linkedin.com",
+    "pinterest.com",
+    "reddit.com",
+}
+
+# Government hosts: the US .gov TLD, "gov" (and "gob") under any country code - gov.uk, gov.in, gob.mx - and
+# the national names that do not use it. A trailing ".*" stands for any two-letter country-code TLD.
+GOVERNMENT_SUFFIXES = [".gov", ".gov.*", ".gob.*", ".gouv.fr", ".gc.ca", ".go.jp", ".bund.de", ".admin.ch"]
+
+AUTHORITY_HINTS = [
+    *GOVERNMENT_SUFFIXES,
+    "worldbank",
+    "oecd",
+    "imf",
+    "europa",
+    "un",
+    "statista",
+    "mckinsey",
+    "deloitte",
+    "pwc",
+    "fitch",
+    "gartner",
+    "bloomberg",
+    "reuters",
+]
+
+STRICT_AUTHORITY_DOMAINS = [
+    *GOVERNMENT_SUFFIXES,
+    "oecd.org",
+    "worldbank.org",
+    "imf.org",
+    "europa.eu",
+    "europa.ec",
+    "un.org",
+    "unctad.org",
+    "unido.org",
+    "sec.gov",
+    "sedarplus.ca",
+    "fca.org.uk",
+    "esma.europa.eu",
+    "ec.europa.eu",
+]
+
+INSTITUTIONAL_SUFFIXES = [*GOVERNMENT_SUFFIXES, ".edu", ".edu.*"]
+
+
+class DomainFlag(IntFlag):
+    NONE = 0
+    BLOCKED = 1
+    DISALLOWED = 2
+    STRICT_AUTHORITY = 4
+    AUTHORITY_HINT = 8
+    ALLOWED = 16
+    INSTITUTIONAL = 32
+
+
+_BLOCKED = int(DomainFlag.BLOCKED)
+_DISALLOWED = int(DomainFlag.DISALLOWED)
+_AUTHORITY_MASK = int(DomainFlag.STRICT_AUTHORITY | DomainFlag.ALLOWED | DomainFlag.INSTITUTIONAL)
+_AUTHORITY_HINT = int(DomainFlag.AUTHORITY_HINT)
+
+# Authority tier on the same 1-5 scale as citation credibility scores (0 for blocked).
+TIER_BY_CLASSIFICATION = {"blocked": 0, "disallowed": 1, "unknown": 2, "neutral": 3, "reputable": 4, "authority": 5}
+
+
+@dataclass(frozen=True)
+class DomainMatch:
+    host: str
+    flags: int
+    classification: str
+    tier: int
+
+
+def _classify_flags(host: str, flags: int) -> str:
+    if flags & _BLOCKED:
+        return "blocked"
+    if flags & _DISALLOWED:
+        return "disallowed"
+    if flags & _AUTHORITY_MASK:
+        return "authority"
+    if flags & _AUTHORITY_HINT:
+        return "reputable"
+    return "neutral" if host else "unknown"
+
+
+class DomainMatcher:
+    """
+    Label-suffix trie over reversed host labels.
+    Dotted rules ("oecd.org", ".gov") match the host or any subdomain of it; bare rules ("oecd", "un")
+    match a whole host label, so "un" no longer matches "fund.com". A rule ending in ".*" ("gov.*") matches
+    under any two-letter country-code TLD, so "www.gov.uk" and "data.gov.in" match but "gov.com" does not.
+    """
+
+    def __init__(self) -> None:
+        # Flags are kept as plain ints; IntFlag arithmetic is far slower in the hot loop.
+        self._trie: dict = {}
+        self._country_trie: dict = {}
+        self._labels: dict[str, int] = {}
+
+    def add(self, rule: str, flag: DomainFlag) -> None:
+        rule = rule.strip().lower()
+        if not rule:
+            return
+        if "." not in rule:
+            self._labels[rule] = self._labels.get(rule, 0) | int(flag)
+            return
+        labels = rule.strip(".").split(".")
+        node = self._trie
+        if labels[-1] == "*":
+            labels.pop()
+            node = self._country_trie
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[""] = node.get("", 0) | int(flag)
+
+    def add_all(self, rules, flag: DomainFlag) -> None:
+        for rule in rules:
+            self.add(rule, flag)
+
+    def match_host(self, host: str) -> DomainMatch:
+        host = normalize_host(host)
+        flags = self._flags_for(host)
+        classification = _classify_flags(host, flags)
+        return DomainMatch(host, flags, classification, TIER_BY_CLASSIFICATION[classification])
+
+    def match_url(self, url: str) -> DomainMatch:
+        return self.match_host(host_of(url))
+
+    def _flags_for(self, host: str) -> int:
+        if not host:
+            return 0
+        flags = 0
+        labels = self._labels
+        parts = host.split(".")
+        node = self._trie
+        for label in reversed(parts):
+            flags |= labels.get(label, 0)
+            if node is not None:
+                node = node.get(label)
+                if node is not None:
+                    flags |= node.get("", 0)
+        tld = parts[-1]
+        if len(parts) > 1 and len(tld) == 2 and tld.isalpha():
+            node = self._country_trie
+            for label in reversed(parts[:-1]):
+                node = node.get(label)
+                if node is None:
+                    break
+                flags |= node.get("", 0)
+        return flags
+
+
+def host_of(url: str) -> str:
+    """Cheap netloc extraction for http(s) URLs; falls back to urlparse for anything unusual."""
+    scheme_sep = url.find("://")
+    if scheme_sep <= 0:
+        return urlparse(url).netloc
+    rest = url[scheme_sep + 3 :]
+    for sep in "/?#":
+        cut = rest.find(sep)
+        if cut >= 0:
+            rest = rest[:cut]
+    return rest
+
+
+def normalize_host(host: str) -> str:
+    host = (host or "").strip().lower()
+    host = host.rsplit("@", 1)[-1]
+    if host.startswith("["):
+        return host
+    return host.split(":", 1)[0].rstrip(".")
+
+
+def build_default_matcher() -> DomainMatcher:
+    matcher = DomainMatcher()
+    matcher.add_all(BLOCKED_DOMAINS, DomainFlag.BLOCKED)
+    matcher.add_all(STRICT_AUTHORITY_DOMAINS, DomainFlag.STRICT_AUTHORITY)
+    matcher.add_all(AUTHORITY_HINTS, DomainFlag.AUTHORITY_HINT)
+    matcher.add_all(INSTITUTIONAL_SUFFIXES, DomainFlag.INSTITUTIONAL)
+    matcher.add_all([p for p in ALLOWED_SOURCE_PATTERNS if "." in p], DomainFlag.ALLOWED)
+    matcher.add_all([p for p in DISALLOWED_SOURCE_PATTERNS if "." in p], DomainFlag.DISALLOWED)
+    return matcher
+
+
+DEFAULT_MATCHER = build_default_matcher()
+
+
+@lru_cache(maxsize=65536)
+def classify_host(host: str) -> DomainMatch:
+    return DEFAULT_MATCHER.match_host(host)
+
+
+def classify_url(url: str) -> DomainMatch:
+    return classify_host(host_of(url))
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+from app.config import settings
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - optional speedup
+    etree = None
+    lxml_html = None
+
+
+# Elements whose whole subtree is never article text.
+BOILERPLATE_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "nav",
+    "footer",
+    "aside",
+    "button",
+    "select",
+)
+# Page roots are never skipped, whatever layout classes themes hang on them ("page-template no-sidebar").
+CONTENT_ROOT_TAGS = {"html", "body", "main", "article"}
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog", "alertdialog", "search"}
+# Matched against whole class tokens / ids, optionally after one prefix word ("cookie-banner", "site_footer",
+# "main-menu"). Ambiguous words only count in their widget compounds, so "market-share-table" or
+# "related-markets" stay article text. `<form>` is not a boilerplate tag either: ASP.NET wraps whole pages in one.
+# State prefixes describe the layout around the element ("has-sidebar", "no-menu"), not the element itself.
+BOILERPLATE_ATTR = re.compile(
+    r"(?:(?!(?:has|no|with|without|is)[_-])[a-z0-9]+[_-])?(?:cookies?(?:[_-](?:banner|notice|bar))?|consent|gdpr|newsletter(?:[_-]signup)?|"
+    r"subscribe|social(?:[_-](?:share|links|icons|media))?|share[_-](?:buttons?|bar|tools|links|icons)|sharing|"
+    r"breadcrumbs?|sidebar|menu|navbar|nav|footer|advert|ads|promo|popup|modal|"
+    r"related[_-](?:posts|articles|stories|links|content)|comments?(?:[_-](?:section|list|area))?)",
+    re.I,
+)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def is_boilerplate(tag: str, attrs) -> bool:
+    if tag in BOILERPLATE_TAGS:
+        return True
+    if tag in CONTENT_ROOT_TAGS:
+        return False
+    for name, value in attrs:
+        if not value:
+            continue
+        if name == "role" and value.lower() in BOILERPLATE_ROLES:
+            return True
+        if name in ("class", "id") and any(BOILERPLATE_ATTR.fullmatch(token) for token in value.split()):
+            return True
+    return False
+
+
+class TextExtractor(ABC):
+    """Turns an HTML document into whitespace-normalized visible text of at most `budget` characters."""
+
+    name = "base"
+
+    @abstractmethod
+    def extract(self, html: str, budget: int) -> str:
+        raise NotImplementedError
+
+
+class SoupTextExtractor(TextExtractor):
+    """The original BeautifulSoup path: full tree, scripts and styles dropped, everything else kept."""
+
+    name = "soup"
+
+    def extract(self, html: str, budget: int) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        return _WHITESPACE.sub(" ", soup.get_text(" ")).strip()[:budget]
+
+
+class _BudgetReached(Exception):
+    pass
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self, budget: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.parts: list[str] = []
+        self.size = 0
+        self.skip_tag = ""
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if self.skip_depth:
+            # Only the tag that opened the skipped region is counted, so unclosed children cannot unbalance it.
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag not in VOID_TAGS and is_boilerplate(tag, attrs):
+            self.skip_tag = tag
+            self.skip_depth = 1
+
+    def handle_endtag(self, tag) -> None:
+        if self.skip_depth and tag == self.skip_tag:
+            self.skip_depth -= 1
+
+    def handle_data(self, data) -> None:
+        if self.skip_depth:
+            return
+        piece = " ".join(data.split())
+        if not piece:
+            return
+        self.parts.append(piece)
+        self.size += len(piece) + 1
+        if self.size > self.budget:
+            raise _BudgetReached
+
+
+class StreamingTextExtractor(TextExtractor):
+    """
+    Event-based stdlib parser: no tree is built, boilerplate subtrees are skipped as they are opened, and
+    parsing stops as soon as the budget is filled.
+    """
+
+    name = "streaming"
+
+    def extract(self, html: str, budget: int) -> str:
+        collector = _TextCollector(budget)
+        try:
+            collector.feed(html)
+            collector.close()
+        except _BudgetReached:
+            pass
+        return " ".join(collector.parts)[:budget]
+
+
+class LxmlTextExtractor(TextExtractor):
+    """libxml2 parse, C-level removal of boilerplate elements, then text is pulled only until the budget is full."""
+
+    name = "lxml"
+
+    def extract(self, html: str, budget: int) -> str:
+        if not html.strip():
+            return ""
+        try:
+            doc = lxml_html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            # Byte-order marks and XML declarations trip the string parser; retry on bytes.
+            try:
+                doc = lxml_html.document_fromstring(html.encode("utf-8", errors="replace"))
+            except etree.ParserError:
+                return ""
+
+        etree.strip_elements(doc, etree.Comment, etree.ProcessingInstruction, *BOILERPLATE_TAGS, with_tail=False)
+        for element in doc.xpath("//*[@class or @id or @role]"):
+            if is_boilerplate(element.tag, element.attrib.items()) and element.getparent() is not None:
+                element.drop_tree()
+
+        parts: list[str] = []
+        size = 0
+        for text in doc.itertext():
+            piece = " ".join(text.split())
+            if not piece:
+                continue
+            parts.append(piece)
+            size += len(piece) + 1
+            if size > budget:
+                break
+        return " ".join(parts)[:budget]
+
+
+EXTRACTORS: dict[str, type[TextExtractor]] = {
+    "soup": SoupTextExtractor,
+    "streaming": StreamingTextExtractor,
+    "lxml": LxmlTextExtractor,
+}
+
+
+def get_text_extractor(name: str | None = None) -> TextExtractor:
+    """`auto` picks lxml when it is installed and the streaming stdlib parser otherwise."""
+    choice = (name or settings.scraper_extractor).lower()
+    if choice == "auto":
+        choice = "lxml" if lxml_html is not None else "streaming"
+    if choice == "lxml" and lxml_html is None:
+        choice = "streaming"
+    return EXTRACTORS.get(choice, StreamingTextExtractor)()
+
+
+_worker_extractors: dict[str, TextExtractor] = {}
+
+
+def extract_from_bytes(raw: bytes, encoding: str, extractor: str, budget: int) -> str:
+    """Process-pool entry point: the raw body goes in as bytes and only the budgeted text comes back."""
+    instance = _worker_extractors.get(extractor)
+    if instance is None:
+        instance = _worker_extractors[extractor] = get_text_extractor(extractor)
+    return instance.extract(raw.decode(encoding, errors="replace"), budget)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+
+class IncrementalJsonObject:
+    """
+    Parses the first top-level JSON object out of streamed model text, one chunk at a time. Text before the
+    opening brace (preambles, code fences) is skipped; `feed` returns True once the object has closed, so the
+    caller can stop the stream instead of paying for trailing prose. Each top-level member is decoded as soon as
+    the comma or brace after it arrives and reported through `on_field`, so a response cut off by `max_tokens`
+    still yields every member that completed.
+
+    A brace-balanced span that does not decode (an example like `{braces}` in a preamble) is discarded along with
+    its fields, `on_reset` is called, and scanning resumes at the next opening brace.
+    """
+
+    def __init__(
+        self,
+        on_field: Callable[[str, Any], None] | None = None,
+        on_reset: Callable[[], None] | None = None,
+    ) -> None:
+        self.on_field = on_field
+        self.on_reset = on_reset
+        self.fields: dict[str, Any] = {}
+        self.done = False
+        self._value: dict | None = None
+        self._chars: list[str] = []
+        self._member: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chars)
+
+    def feed(self, chunk: str) -> bool:
+        if self.done:
+            return True
+        for ch in chunk:
+            if self._depth == 0:
+                if ch != "{":
+                    continue
+                self._depth = 1
+                self._chars.append(ch)
+                continue
+            self._chars.append(ch)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                self._member.append(ch)
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_member()
+                    if self._close():
+                        return True
+                    continue
+            elif ch == "," and self._depth == 1:
+                self._finish_member()
+                continue
+            self._member.append(ch)
+        return False
+
+    def value(self) -> dict | None:
+        """The complete object once it has closed and decodes, else None."""
+        return self._value
+
+    def _close(self) -> bool:
+        try:
+            value = json.loads(self.text)
+        except ValueError:
+            value = None
+        if isinstance(value, dict):
+            self._value = value
+            self.done = True
+            return True
+        self._chars = []
+        self._member = []
+        self._in_string = False
+        self._escaped = False
+        self.fields = {}
+        if self.on_reset is not None:
+            self.on_reset()
+        return False
+
+    def _finish_member(self) -> None:
+        member = "".join(self._member).strip()
+        self._member = []
+        if not member:
+            return
+        try:
+            decoded = json.loads("{" + member + "}")
+        except ValueError:
+            return
+        for key, value in decoded.items():
+            self.fields[key] = value
+            if self.on_field is not None:
+                self.on_field(key, value)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+from hashlib import blake2b
+
+_WORD = re.compile(r"\w+")
+_LANE_BITS = 16
+_LANE_MASK = (1 << _LANE_BITS) - 1
+_MAX_FEATURES = _LANE_MASK
+
+# Each byte value spread so that bit i lands in its own 16-bit lane; adding spread hashes then counts set
+# bits per position for all 64 positions at once, instead of a 64-step Python loop per shingle.
+_SPREAD = [sum(1 << (i * _LANE_BITS) for i in range(8) if value >> i & 1) for value in range(256)]
+
+
+def shingle_hashes(text: str, size: int = 4) -> list[int]:
+    """64-bit hashes of the overlapping `size`-word shingles of `text` (case-folded, punctuation ignored)."""
+    words = _WORD.findall(text.lower())
+    size = min(size, len(words))
+    if not size:
+        return []
+    return [
+        int.from_bytes(blake2b(" ".join(words[i : i + size]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(min(len(words) - size + 1, _MAX_FEATURES))
+    ]
+
+
+def simhash(text: str, size: int = 4) -> int:
+    """64-bit SimHash over word shingles; near-identical documents differ in only a few bits."""
+    hashes = shingle_hashes(text, size)
+    if not hashes:
+        return 0
+    counts = 0
+    for value in hashes:
+        for byte in range(8):
+            counts += _SPREAD[(value >> (8 * byte)) & 0xFF] << (byte * 8 * _LANE_BITS)
+    threshold = len(hashes) / 2
+    fingerprint = 0
+    for bit in range(64):
+        if (counts >> (bit * _LANE_BITS)) & _LANE_MASK > threshold:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    """
+    Finds a stored fingerprint within `max_distance` bits. Fingerprints are split into `max_distance + 1` bands;
+    by pigeonhole any match shares at least one band exactly, so only those buckets are compared.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = -(-64 // self.bands)
+        self._buckets: list[dict[int, list[tuple[int, str]]]] = [{} for _ in range(self.bands)]
+
+    def _band_values(self, fingerprint: int) -> list[int]:
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.bands)]
+
+    def add(self, fingerprint: int, key: str) -> None:
+        for bucket, value in zip(self._buckets, self._band_values(fingerprint)):
+            bucket.setdefault(value, []).append((fingerprint, key))
+
+    def nearest(self, fingerprint: int) -> str | None:
+        best: tuple[int, str] | None = None
+        for bucket, value in zip(self._buckets, self._band_values(fingerprint)):
+            for other, key in bucket.get(value, ()):
+                distance = hamming(fingerprint, other)
+                if distance <= self.max_distance and (best is None or distance < best[0]):
+                    best = (distance, key)
+        return best[1] if best else None
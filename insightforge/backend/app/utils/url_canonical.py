@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+from app.utils.domain_matcher import normalize_host
+
+
+# Query parameters that only identify the click, campaign or share; never part of the document identity.
+TRACKING_PARAMS = {
+    "gclid",
+    "gclsrc",
+    "dclid",
+    "fbclid",
+    "msclkid",
+    "yclid",
+    "twclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "mkt_tok",
+    "_ga",
+    "_gl",
+    "_hsenc",
+    "_hsmi",
+    "cmpid",
+    "ocid",
+    "ncid",
+    "icid",
+    "sr_share",
+    "s_cid",
+    "spm",
+    "ref",
+    "ref_src",
+    "ref_url",
+    "referrer",
+    "smid",
+    "guccounter",
+    "guce_referrer",
+    "guce_referrer_sig",
+    "oly_anon_id",
+    "oly_enc_id",
+    "__twitter_impression",
+    "amp",
+    "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_", "vero_")
+# Select a rendering of the same document; dropped from identity keys but kept on URLs that are fetched.
+VARIANT_PARAMS = {"amp", "outputtype"}
+
+# Leading host labels that serve the same document as the bare (or www.) host.
+MOBILE_LABELS = {"m", "mobile", "amp", "touch"}
+
+# Hosts whose links only redirect elsewhere; the target can be read from the query or must be resolved.
+REDIRECT_PARAMS = {
+    "duckduckgo.com": ("uddg",),
+    "google.com": ("url", "q"),
+    "bing.com": ("u",),
+    "facebook.com": ("u",),
+    "l.facebook.com": ("u",),
+    "news.google.com": ("url",),
+}
+RESOLVE_ONLY_HOSTS = {"news.google.com", "t.co", "bit.ly", "lnkd.in", "ow.ly", "feedproxy.google.com", "trib.al"}
+
+_AMP_PATH = re.compile(r"(/amp(?=/|$)|\.amp(?=$|\.html?$)|/amp\.html?$)")
+_AMP_CACHE = re.compile(r"^/[cvi]/(?P<secure>s/)?(?P<rest>.+)$")
+
+
+@dataclass(frozen=True)
+class HostRule:
+    """
+    Per-host canonicalization. `keep_params` is an allowlist (None keeps every non-tracking parameter, an empty
+    set drops the whole query); `www` forces the www label on or off for hosts that serve both.
+    """
+
+    keep_params: frozenset[str] | None = None
+    strip_mobile: bool = True
+    www: bool | None = None
+    path_rewrites: tuple[tuple[str, str], ...] = ()
+
+
+# News and research sites whose article URLs never depend on the query string.
+_PATH_ONLY = HostRule(keep_params=frozenset())
+
+HOST_RULES: dict[str, HostRule] = {
+    "reuters.com": _PATH_ONLY,
+    "bloomberg.com": _PATH_ONLY,
+    "cnbc.com": _PATH_ONLY,
+    "ft.com": _PATH_ONLY,
+    "wsj.com": _PATH_ONLY,
+    "nytimes.com": _PATH_ONLY,
+    "economist.com": _PATH_ONLY,
+    "forbes.com": _PATH_ONLY,
+    "businesswire.com": _PATH_ONLY,
+    "prnewswire.com": _PATH_ONLY,
+    "globenewswire.com": _PATH_ONLY,
+    "marketsandmarkets.com": _PATH_ONLY,
+    "grandviewresearch.com": _PATH_ONLY,
+    "mckinsey.com": _PATH_ONLY,
+    "deloitte.com": _PATH_ONLY,
+    "theguardian.com": HostRule(keep_params=frozenset(), www=True),
+    "bbc.co.uk": HostRule(keep_params=frozenset(), www=True),
+    "bbc.com": HostRule(keep_params=frozenset(), www=True),
+    "statista.com": HostRule(keep_params=frozenset(), www=True),
+    "economictimes.indiatimes.com": HostRule(
+        keep_params=frozenset(), path_rewrites=((r"/amp_articleshow/", "/articleshow/"),)
+    ),
+    "youtube.com": HostRule(keep_params=frozenset({"v"}), www=True),
+    "sec.gov": HostRule(strip_mobile=False),
+}
+
+
+def _rule_for(host: str) -> HostRule | None:
+    labels = host.split(".")
+    for idx in range(len(labels) - 1):
+        rule = HOST_RULES.get(".".join(labels[idx:]))
+        if rule is not None:
+            return rule
+    return None
+
+
+def _registered_host(host: str) -> str:
+    return host[4:] if host.startswith("www.") else host
+
+
+def unwrap_redirect(url: str) -> str:
+    """Follow redirect wrappers that carry their target in the URL itself (search clicks, AMP caches)."""
+    for _ in range(3):
+        parts = urlsplit(url)
+        host = normalize_host(parts.netloc)
+        bare = _registered_host(host)
+        params = REDIRECT_PARAMS.get(bare) or REDIRECT_PARAMS.get(host)
+        target = ""
+        if params:
+            query = dict(parse_qsl(parts.query))
+            target = next((unquote(query[p]) for p in params if query.get(p, "").startswith("http")), "")
+        elif host.endswith(".cdn.ampproject.org"):
+            match = _AMP_CACHE.match(parts.path)
+            if match:
+                target = f"{'https' if match.group('secure') else 'http'}://{match.group('rest')}"
+        if not target:
+            return url
+        url = target
+    return url
+
+
+def _is_tracking(key: str) -> bool:
+    lowered = key.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=65536)
+def clean_url(url: str) -> str:
+    """
+    The URL to fetch and cite: redirect wrappers that carry their target are unwrapped and tracking parameters
+    and fragments dropped, but host, path and the remaining query are left exactly as published - mobile, AMP
+    and per-host rewrites are guesses that only belong in `canonical_key`. Returns "" for non-http(s) URLs.
+    """
+    url = unwrap_redirect((url or "").strip())
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in {"http", "https"} or not parts.netloc:
+        return ""
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(key) or key.lower() in VARIANT_PARAMS
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc, parts.path or "/", urlencode(query, doseq=True), ""))
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of `url` for identity, the basis of `canonical_key`: redirect wrappers unwrapped, tracking
+    parameters, fragments and AMP variants removed, mobile subdomains folded into the main host, and per-host
+    query rules applied. Not guaranteed to exist as a page, so never fetch or cite it; use `clean_url` for that.
+    Returns "" for anything that is not an http(s) URL.
+    """
+    url = unwrap_redirect((url or "").strip())
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in {"http", "https"}:
+        return ""
+    host = normalize_host(parts.netloc)
+    if not host:
+        return ""
+    rule = _rule_for(_registered_host(host))
+
+    labels = host.split(".")
+    if (rule is None or rule.strip_mobile) and len(labels) > 2 and labels[0] in MOBILE_LABELS:
+        host = ".".join(labels[1:])
+    if rule is not None and rule.www is not None:
+        host = ("www." + _registered_host(host)) if rule.www else _registered_host(host)
+
+    try:
+        port = parts.port
+    except ValueError:
+        return ""
+    if port and (scheme, port) not in {("http", 80), ("https", 443)}:
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    path = _AMP_PATH.sub("", path) or "/"
+    if rule is not None:
+        for pattern, replacement in rule.path_rewrites:
+            path = re.sub(pattern, replacement, path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        if _is_tracking(key):
+            continue
+        if rule is not None and rule.keep_params is not None and key.lower() not in rule.keep_params:
+            continue
+        query.append((key, value))
+    query.sort()
+
+    return urlunsplit((scheme, host, path, urlencode(query, doseq=True), ""))
+
+
+@lru_cache(maxsize=65536)
+def canonical_key(url: str) -> str:
+    """Identity used for de-duplication: the canonical URL without scheme, www label or case differences in the host."""
+    canonical = canonicalize_url(url)
+    if not canonical:
+        return (url or "").strip().lower().rstrip("/")
+    parts = urlsplit(canonical)
+    host = _registered_host(parts.netloc)
+    return f"{host}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def needs_resolution(url: str) -> bool:
+    """True for link shorteners and aggregator links whose target is only known after following the redirect."""
+    return _registered_host(normalize_host(urlsplit(url).netloc)) in RESOLVE_ONLY_HOSTS
@@ -0,0 +1,147 @@
+"""
+Find the best ANALYSIS_BATCH_MAX_DOCUMENTS against a local fake Anthropic Messages server.
+
+The fake server charges a fixed per-request overhead, a prefill cost per input token and a decode cost per output
+token, and only serves `--concurrency` requests at once (the provider's rate limit). A share of batch responses is
+deliberately malformed so the single-document fallback is exercised. Documents flow through the same MicroBatcher
+and AnalysisAgent.run_batch the report pipeline uses, from 8 concurrent analysis workers.
+
+Run from the backend directory: python -m benchmarks.bench_batch_extraction [documents]
+"""
+from __future__ import annotations
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from anthropic import Anthropic
+
+from app.agents.analysis_agent import AnalysisAgent, estimate_tokens
+from app.config import settings
+from app.services.extraction_cache import ExtractionCache
+from app.services.micro_batcher import MicroBatcher
+
+REQUEST_OVERHEAD = 0.15
+PREFILL_SECONDS_PER_TOKEN = 0.00002
+DECODE_SECONDS_PER_TOKEN = 0.002
+CONCURRENCY = 4
+BATCH_FAILURE_RATE = 0.05
+WORKERS = 8
+_DOCUMENT = re.compile(r'<document index="(\d+)">')
+
+
+def _insight(index: int | None) -> dict:
+    payload = {
+        "market_size_usd_billion": 42.0,
+        "cagr_percent": 7.5,
+        "drivers": ["Fleet electrification mandates", "Falling battery pack prices"],
+        "restraints": ["Grid interconnection delays"],
+        "trends": ["Megawatt charging for heavy trucks"],
+        "key_companies": ["ChargePoint", "Tesla", "ABB"],
+        "regulatory_notes": ["NEVI formula program requirements"],
+        "confidence_score": 0.7,
+    }
+    if index is not None:
+        payload["index"] = index
+    return payload
+
+
+class FakeMessages(BaseHTTPRequestHandler):
+    slots = threading.Semaphore(CONCURRENCY)
+    rng = random.Random(5)
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][0]["content"]
+        indices = [int(i) for i in _DOCUMENT.findall(prompt)]
+        if indices:
+            with self.lock:
+                broken = self.rng.random() < BATCH_FAILURE_RATE
+            text = json.dumps([_insight(i) for i in indices])
+            if broken:
+                text = text[: len(text) // 2]
+        else:
+            text = json.dumps(_insight(None))
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        with self.slots:
+            time.sleep(REQUEST_OVERHEAD + input_tokens * PREFILL_SECONDS_PER_TOKEN + output_tokens * DECODE_SECONDS_PER_TOKEN)
+        payload = json.dumps(
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def documents(count: int) -> list[str]:
+    rng = random.Random(9)
+    words = ["charging", "market", "grid", "fleet", "revenue", "growth", "policy", "utility", "battery", "station"]
+    return [
+        " ".join(rng.choice(words) for _ in range(1000)) + f" The market reached ${rng.randint(5, 90)} billion."
+        for _ in range(count)
+    ]
+
+
+def run_once(base_url: str, docs: list[str], batch_size: int) -> tuple[float, dict]:
+    settings.analysis_batch_max_documents = batch_size
+    settings.analysis_batch_max_input_tokens = 1_000_000
+    client = Anthropic(api_key="bench", base_url=base_url, http_client=httpx.Client(timeout=60), max_retries=0)
+    agent = AnalysisAgent(client=client)
+    agent.cache = ExtractionCache(enabled=False)
+    batcher = MicroBatcher(lambda texts: agent.run_batch(texts, "EV Charging", "United States"), batch_size, 0.25)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        results = list(pool.map(batcher.submit, docs))
+    elapsed = time.perf_counter() - started
+    assert len(results) == len(docs) and all(r.get("drivers") for r in results)
+    return elapsed, agent.stats
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 45
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeMessages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    docs = documents(count)
+    print(
+        f"{count} documents, {WORKERS} analysis workers, provider concurrency {CONCURRENCY}, "
+        f"{BATCH_FAILURE_RATE:.0%} malformed batch responses"
+    )
+    print(f"{'batch':>5} {'seconds':>8} {'requests':>8} {'fallbacks':>9} {'input tok':>10} {'output tok':>10}")
+    best = None
+    for batch_size in (1, 2, 3, 4, 6, 8):
+        elapsed, stats = run_once(base_url, docs, batch_size)
+        print(
+            f"{batch_size:>5} {elapsed:>8.2f} {stats['llm_calls']:>8} {stats['batch_fallbacks']:>9} "
+            f"{stats['input_tokens']:>10} {stats['output_tokens']:>10}"
+        )
+        if best is None or elapsed < best[1]:
+            best = (batch_size, elapsed)
+    server.shutdown()
+    print(f"\nfastest batch size: {best[0]} ({best[1]:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare the legacy substring scans with the compiled domain matcher.
+
+Run from the backend directory: python -m benchmarks.bench_domain_matcher [url_count]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+from app.market_intel.contracts import ALLOWED_SOURCE_PATTERNS, DISALLOWED_SOURCE_PATTERNS
+from app.utils.domain_matcher import (
+    AUTHORITY_HINTS,
+    BLOCKED_DOMAINS,
+    STRICT_AUTHORITY_DOMAINS,
+    DomainFlag,
+    DomainMatcher,
+    build_default_matcher,
+    classify_url,
+)
+
+HOSTS = [
+    "www.oecd.org",
+    "data.worldbank.org",
+    "www.imf.org",
+    "ec.europa.eu",
+    "news.un.org",
+    "www.sec.gov",
+    "www.gov.uk",
+    "www.ons.gov.uk",
+    "data.gov.in",
+    "abs.gov.au",
+    "www.insee.gouv.fr",
+    "www.statcan.gc.ca",
+    "www.reuters.com",
+    "www.bloomberg.com",
+    "www.youtube.com",
+    "fund.example.com",
+    "en.wikipedia.org",
+    "medium.com",
+    "www.fedex.com",
+    "blog.startup.io",
+    "www.statista.com",
+    "research.university.edu",
+    "www.marketsandmarkets.com",
+    "www.grandviewresearch.com",
+]
+
+
+def synthetic_urls(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    urls = []
+    for i in range(count):
+        host = rng.choice(HOSTS)
+        if rng.random() < 0.3:
+            host = f"sub{rng.randint(1, 500)}.{host.removeprefix('www.')}"
+        urls.append(f"https://{host}/report/{i}?page={rng.randint(1, 9)}")
+    return urls
+
+
+def legacy_classify(url: str) -> tuple[bool, bool, bool, int]:
+    domain = urlparse(url).netloc.lower()
+    blocked = any(b in domain for b in BLOCKED_DOMAINS)
+    strict = any(h in domain for h in STRICT_AUTHORITY_DOMAINS)
+    hint = any(h in domain for h in AUTHORITY_HINTS)
+    candidate = url.lower()
+    if any(p in candidate for p in DISALLOWED_SOURCE_PATTERNS):
+        score = 1
+    elif any(p in candidate for p in ALLOWED_SOURCE_PATTERNS):
+        score = 5
+    else:
+        score = 3
+    return blocked, strict, hint, score
+
+
+def compiled_classify(matcher: DomainMatcher, url: str) -> tuple[bool, int]:
+    match = matcher.match_url(url)
+    return bool(match.flags), match.tier
+
+
+def cached_classify(url: str) -> tuple[bool, int]:
+    match = classify_url(url)
+    return bool(match.flags), match.tier
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    urls = synthetic_urls(count)
+    matcher = build_default_matcher()
+
+    start = time.perf_counter()
+    for url in urls:
+        legacy_classify(url)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        compiled_classify(matcher, url)
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        cached_classify(url)
+    cached_seconds = time.perf_counter() - start
+
+    print(f"urls: {count}")
+    print(f"legacy substring scans: {legacy_seconds:.3f}s ({count / legacy_seconds:,.0f} urls/s)")
+    print(f"compiled label trie:    {compiled_seconds:.3f}s ({count / compiled_seconds:,.0f} urls/s)")
+    print(f"compiled + host cache:  {cached_seconds:.3f}s ({count / cached_seconds:,.0f} urls/s)")
+    print(f"speedup: {legacy_seconds / compiled_seconds:.2f}x uncached, {legacy_seconds / cached_seconds:.2f}x cached")
+
+    print("\nsemantics differences (legacy substring vs exact suffix):")
+    for host in HOSTS:
+        legacy = legacy_classify(f"https://{host}/")
+        match = matcher.match_host(host)
+        compiled = (
+            bool(match.flags & DomainFlag.BLOCKED),
+            bool(match.flags & DomainFlag.STRICT_AUTHORITY),
+            bool(match.flags & DomainFlag.AUTHORITY_HINT),
+        )
+        if legacy[:3] != compiled:
+            print(f"  {host}: legacy blocked/strict/hint={legacy[:3]} compiled={compiled} tier={match.tier}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Check that failed LLM attempts hand their token reservation back to the shared rate limiter.
+
+Each attempt reserves the caller's estimate (prompt + max_tokens) in the Redis token bucket. A call that is
+rate limited a few times and then succeeds should leave the bucket short by what the successful attempt used,
+not by every reservation made along the way. Runs the sync and async governor paths against the Redis at
+REDIS_URL, or fakeredis when that is installed and no Redis is reachable, and prints the bucket after each.
+
+Run from the backend directory: python -m benchmarks.bench_governor_retry [failures]
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from app.config import settings
+from app.services.kv_store import get_redis_client
+from app.services.llm_governor import LlmGovernor
+from app.services.rate_limiter import RedisTokenBucketLimiter
+
+TOKENS_PER_MINUTE = 50_000
+RESERVED = 8_000
+USED = 1_200
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def _redis():
+    client = get_redis_client()
+    if client is not None:
+        return client
+    try:
+        import fakeredis
+    except ImportError:
+        raise SystemExit("needs a Redis at REDIS_URL (or fakeredis installed)")
+    return fakeredis.FakeRedis()
+
+
+def _flaky(failures: int):
+    state = {"calls": 0}
+
+    def attempt():
+        state["calls"] += 1
+        if state["calls"] <= failures:
+            raise RateLimited("429 Too Many Requests")
+        return SimpleNamespace(usage=SimpleNamespace(input_tokens=USED - 200, output_tokens=200))
+
+    return attempt, state
+
+
+def _bucket(client, limiter: RedisTokenBucketLimiter, model: str) -> float:
+    return float(client.hget(limiter._key("bench", model), "tokens") or TOKENS_PER_MINUTE)
+
+
+def main() -> None:
+    failures = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    settings.llm_max_retries = max(settings.llm_max_retries, failures)
+    settings.llm_backoff_base_seconds = 0.01
+    settings.llm_backoff_max_seconds = 0.05
+    client = _redis()
+    limits = {"bench": {"requests_per_minute": 1_000, "tokens_per_minute": TOKENS_PER_MINUTE}}
+    limiter = RedisTokenBucketLimiter(client, limits=limits, prefix="insightforge:bench_governor_retry:")
+    governor = LlmGovernor(limiter)
+    print(f"{failures} rate-limited attempts then success; {RESERVED} tokens reserved per attempt, {USED} used")
+
+    for mode in ("sync", "async"):
+        model = f"model-{mode}"
+        client.delete(limiter._key("bench", model))
+        fn, state = _flaky(failures)
+        if mode == "sync":
+            governor.call("bench", model, fn, caller="bench", tokens=RESERVED)
+        else:
+
+            async def afn():
+                return fn()
+
+            asyncio.run(governor.acall("bench", model, afn, caller="bench", tokens=RESERVED))
+        left = _bucket(client, limiter, model)
+        short = TOKENS_PER_MINUTE - left
+        print(
+            f"  {mode:<5} attempts {state['calls']}  bucket {left:,.0f}/{TOKENS_PER_MINUTE:,}  short by {short:,.0f} "
+            f"(without refunds: {USED + failures * RESERVED:,})"
+        )
+        # Refill during the run only makes the shortfall smaller.
+        assert short <= USED + 1, f"{mode}: failed attempts kept their reservation"
+        client.delete(limiter._key("bench", model))
+    print("failed attempts refunded: OK")
+
+
+if __name__ == "__main__":
+    main()
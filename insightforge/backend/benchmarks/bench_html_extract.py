@@ -0,0 +1,146 @@
+"""
+Compare the HTML-to-text extractors (BeautifulSoup, streaming stdlib parser, lxml) for speed and output parity.
+
+The built-in fixture corpus is generated deterministically: article pages wrapped in navigation, cookie banners,
+share bars, sidebars and footers, with script/style noise, inside the body and wrapper classes WordPress-style
+themes use ("no-sidebar", "site has-sidebar"). Every boilerplate block carries a marker token so leakage can be
+counted, article recall is measured against the known article text, and pages that lost most of it are counted.
+
+Run from the backend directory: python -m benchmarks.bench_html_extract [page_count | fixture_dir]
+(A directory of saved .html pages reports speed and word overlap with the BeautifulSoup output instead.)
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from app.utils.html_text import EXTRACTORS, SoupTextExtractor, TextExtractor, lxml_html
+
+BUDGET = 12_000
+WORDS = [
+    "market", "revenue", "growth", "charging", "battery", "fleet", "utility", "policy", "forecast", "capacity",
+    "investment", "demand", "supply", "regional", "operators", "pricing", "segment", "adoption", "grid", "share",
+]
+BOILERPLATE_MARKER = "zzboiler"
+# (body class, page wrapper class): layout state classes that must not be mistaken for a sidebar or menu.
+LAYOUTS = [
+    ("", "page"),
+    ("home page-template no-sidebar", "site"),
+    ("single single-post", "site has-sidebar"),
+    ("page with-sidebar", "site-content"),
+    ("archive has-sidebar no-menu", "wrapper"),
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(8, 18))
+    return f"{' '.join(words).capitalize()} rose {rng.randint(2, 40)}% to ${rng.randint(1, 900)}M in {rng.randint(2019, 2026)}."
+
+
+def _boiler(rng: random.Random, words: int = 12) -> str:
+    return " ".join(f"{BOILERPLATE_MARKER}{rng.randint(0, 999)}" for _ in range(words))
+
+
+def synthetic_page(rng: random.Random) -> tuple[str, str]:
+    paragraphs = [" ".join(_sentence(rng) for _ in range(rng.randint(3, 7))) for _ in range(rng.randint(6, 40))]
+    menu = "".join(f"<li><a href='/s{i}'>{_boiler(rng, 2)}</a>" for i in range(rng.randint(20, 80)))
+    related = "".join(f"<div class='card'><a href='/r{i}'>{_boiler(rng, 6)}</a></div>" for i in range(12))
+    script = "var config = {" + ",".join(f"'k{i}': {i}" for i in range(400)) + "};"
+    article = "".join(f"<p>{p}</p>\n" for p in paragraphs)
+    body_class, wrapper_class = rng.choice(LAYOUTS)
+    html = f"""<!DOCTYPE html>
+<html><head><title>EV charging outlook</title><style>body {{ color: #333 }} .nav {{ display: flex }}</style>
+<script>{script}</script></head>
+<body class="{body_class}"><div class="{wrapper_class}">
+<div id="cookie-banner" class="consent overlay"><p>{_boiler(rng, 30)}</p><button>Accept all</button></div>
+<header class="site-header"><nav class="main-nav"><ul>{menu}</ul></nav></header>
+<div class="breadcrumb">{_boiler(rng, 4)}</div>
+<main><article><h1>EV charging outlook</h1>
+<div class="share-bar"><a>{_boiler(rng, 3)}</a></div>
+{article}</article>
+<aside class="sidebar">{related}</aside>
+<div class="newsletter-signup"><form><label>{_boiler(rng, 8)}</label><input type="email"></form></div>
+</main>
+<footer><p>{_boiler(rng, 40)}</p></footer>
+<script>{script}</script>
+</div></body></html>"""
+    return html, " ".join(paragraphs)
+
+
+def _words(text: str) -> list[str]:
+    return text.lower().split()
+
+
+def article_recall(output: str, article: str) -> float:
+    """Share of the article words that fit the budget which made it into the output (order-insensitive)."""
+    expected = _words(article)[: len(_words(output))]
+    if not expected:
+        return 1.0
+    got: dict[str, int] = {}
+    for word in _words(output):
+        got[word] = got.get(word, 0) + 1
+    hits = 0
+    for word in expected:
+        if got.get(word, 0) > 0:
+            got[word] -= 1
+            hits += 1
+    return hits / len(expected)
+
+
+def boilerplate_share(output: str) -> float:
+    words = _words(output)
+    return sum(1 for w in words if w.startswith(BOILERPLATE_MARKER)) / len(words) if words else 0.0
+
+
+def overlap_with(reference: str, output: str) -> float:
+    ref = set(_words(reference))
+    out = set(_words(output))
+    return len(ref & out) / len(out) if out else 1.0
+
+
+def run(extractor: TextExtractor, pages: list[str], repeats: int = 3) -> tuple[float, list[str]]:
+    best = float("inf")
+    outputs: list[str] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = [extractor.extract(html, BUDGET) for html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def main() -> None:
+    arg = sys.argv[1] if len(sys.argv) > 1 else "200"
+    fixture_dir = Path(arg)
+    if fixture_dir.is_dir():
+        pages = [p.read_text(encoding="utf-8", errors="replace") for p in sorted(fixture_dir.glob("*.html"))]
+        articles: list[str] = []
+    else:
+        rng = random.Random(7)
+        corpus = [synthetic_page(rng) for _ in range(int(arg))]
+        pages = [html for html, _ in corpus]
+        articles = [article for _, article in corpus]
+
+    size_mb = sum(len(p) for p in pages) / 1e6
+    print(f"{len(pages)} pages, {size_mb:.1f} MB of HTML, budget {BUDGET} chars; lxml installed: {lxml_html is not None}")
+
+    baseline_seconds, baseline = run(SoupTextExtractor(), pages)
+    for name, cls in EXTRACTORS.items():
+        if name == "lxml" and lxml_html is None:
+            continue
+        seconds, outputs = run(cls(), pages)
+        line = f"  {name:<10} {seconds * 1000:8.1f} ms  {baseline_seconds / seconds:5.2f}x vs soup"
+        if articles:
+            recalls = [article_recall(o, a) for o, a in zip(outputs, articles)]
+            leak = sum(boilerplate_share(o) for o in outputs) / len(pages)
+            lost = sum(1 for r in recalls if r < 0.5)
+            line += f"  article recall {sum(recalls) / len(pages):.3f}  boilerplate share {leak:.3f}  pages lost {lost}"
+        else:
+            overlap = sum(overlap_with(b, o) for b, o in zip(baseline, outputs)) / len(pages)
+            line += f"  words also in soup output {overlap:.3f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare text[:6000] truncation with PassageSelector on synthetic cleaned_text documents.
+
+Each document mixes navigation/preamble text, filler paragraphs, distractor figures and one key paragraph with
+the market size and CAGR at a random position. An extraction "hits" when both key figures are inside the excerpt
+sent to the model; tokens are estimated at 4 characters per token.
+
+Run from the backend directory: python -m benchmarks.bench_passage_selection [documents]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from app.agents.analysis_agent import estimate_tokens
+from app.agents.passage_selector import PassageSelector
+
+INDUSTRY = "Electric Vehicle Charging"
+GEOGRAPHY = "United States"
+BUDGET_CHARS = 6000
+NAV = ["Home", "News", "Markets", "Sectors", "Subscribe", "Sign in", "Newsletters", "Events", "Podcasts", "Contact"]
+FILLER = [
+    "Industry participants continue to evaluate partnerships and go-to-market options.",
+    "Analysts note that execution and customer experience remain key differentiators.",
+    "Stakeholders are monitoring supply chain conditions and permitting timelines closely.",
+    "Several operators announced leadership changes and new regional offices this quarter.",
+    "The report draws on interviews with executives, installers and fleet managers.",
+]
+
+
+def document(rng: random.Random) -> tuple[str, str, str]:
+    size, cagr = f"{rng.randint(5, 95)}.{rng.randint(0, 9)}", f"{rng.randint(3, 25)}.{rng.randint(0, 9)}"
+    key = (
+        f"The {INDUSTRY.lower()} market in the {GEOGRAPHY} was valued at USD {size} billion in 2024 and is "
+        f"projected to expand at a CAGR of {cagr}% through 2030, driven by fleet electrification."
+    )
+    preamble = " ".join(rng.choice(NAV) for _ in range(rng.randint(150, 600)))
+    body = [" ".join(rng.choice(FILLER) for _ in range(rng.randint(3, 6))) for _ in range(rng.randint(20, 45))]
+    for _ in range(rng.randint(1, 3)):
+        body.insert(
+            rng.randrange(len(body)),
+            f"The company was founded in {rng.randint(1950, 2015)} and employs {rng.randint(50, 9000)} people.",
+        )
+    body.insert(rng.randrange(len(body)), key)
+    return f"{preamble}. " + " ".join(body), f"USD {size} billion", f"{cagr}%"
+
+
+def measure(label: str, excerpts: list[str], docs: list[tuple[str, str, str]], seconds: float) -> None:
+    hits = sum(1 for excerpt, (_, size, cagr) in zip(excerpts, docs) if size in excerpt and cagr in excerpt)
+    tokens = sum(estimate_tokens(e) for e in excerpts) / len(excerpts)
+    print(
+        f"  {label:<20} hit rate {hits / len(docs):6.1%}   tokens/extraction {tokens:7.0f}   "
+        f"{seconds * 1000 / len(docs):6.2f} ms/doc"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = random.Random(21)
+    # The scraper caps cleaned_text at 12,000 characters, so that is what the agent sees.
+    docs = [(text[:12000], size, cagr) for text, size, cagr in (document(rng) for _ in range(count))]
+    docs = [d for d in docs if d[1] in d[0] and d[2] in d[0]]
+    print(f"{len(docs)} documents, avg {sum(len(d[0]) for d in docs) / len(docs):.0f} chars, budget {BUDGET_CHARS} chars")
+
+    started = time.perf_counter()
+    truncated = [text[:BUDGET_CHARS] for text, _, _ in docs]
+    measure("text[:6000]", truncated, docs, time.perf_counter() - started)
+
+    selector = PassageSelector(INDUSTRY, GEOGRAPHY)
+    started = time.perf_counter()
+    selected = [selector.select(text, BUDGET_CHARS) for text, _, _ in docs]
+    measure("passage selection", selected, docs, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
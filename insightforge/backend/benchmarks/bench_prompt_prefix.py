@@ -0,0 +1,187 @@
+"""
+Check that the cacheable prompt prefixes stay byte-stable across calls and show cached vs uncached input tokens.
+
+A local fake Anthropic Messages server records the system blocks of every request and simulates prompt caching:
+the bytes up to each `cache_control` breakpoint are a cache entry, a later request starting with the same bytes
+reads them back, anything else is written. It reports usage the way the API does (`input_tokens`,
+`cache_read_input_tokens`, `cache_creation_input_tokens`). The real API only caches prefixes of at least
+`min_tokens` (1024 for Sonnet); the fake caches everything unless a minimum is given, and the estimated prefix
+sizes are printed so the gap is visible.
+
+Drives AnalysisAgent (single and batched extractions for two reports) and ClaudeApiExecutionEngine (all six
+market-intel packets for two scopes, the first scope twice), then asserts:
+- every extraction call, single or batched, in either report, sends the same prefix;
+- every market-intel call sends the same shared-rules block, and a repeated scope sends identical prefixes.
+
+Run from the backend directory: python -m benchmarks.bench_prompt_prefix [min_tokens]
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from collections import defaultdict
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from anthropic import Anthropic
+
+from app.agents.analysis_agent import AnalysisAgent, estimate_tokens
+from app.market_intel.contracts import ResearchScope
+from app.market_intel.engines import ClaudeApiExecutionEngine
+from app.market_intel.prompts import build_agent_prompt_packets
+from app.services.extraction_cache import ExtractionCache
+from app.services.prompt_cache import PROMPT_CACHING_BETA
+
+INSIGHT = {
+    "market_size_usd_billion": 42.0,
+    "cagr_percent": 7.5,
+    "drivers": ["Fleet electrification mandates"],
+    "restraints": ["Grid interconnection delays"],
+    "trends": ["Megawatt charging"],
+    "key_companies": ["ChargePoint"],
+    "regulatory_notes": [],
+    "confidence_score": 0.7,
+}
+
+
+class FakeCachingMessages(BaseHTTPRequestHandler):
+    min_tokens = 0
+    cache: set[str] = set()
+    requests: list[dict] = []
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        system = body.get("system") or []
+        user = body["messages"][0]["content"]
+        cached = written = prefix_tokens = 0
+        digest = sha256()
+        with self.lock:
+            for block in system:
+                digest.update(block["text"].encode("utf-8") + b"\x00")
+                prefix_tokens += estimate_tokens(block["text"])
+                if "cache_control" not in block or prefix_tokens < self.min_tokens:
+                    continue
+                key = digest.hexdigest()
+                if key in self.cache:
+                    cached = prefix_tokens
+                else:
+                    self.cache.add(key)
+                    written = prefix_tokens - cached
+            self.requests.append(
+                {
+                    "beta": self.headers.get("anthropic-beta"),
+                    "blocks": [sha256(b["text"].encode("utf-8")).hexdigest()[:12] for b in system],
+                    "breakpoints": sum(1 for b in system if "cache_control" in b),
+                    "prefix_tokens": prefix_tokens,
+                    "user": user,
+                }
+            )
+        input_tokens = prefix_tokens - cached - written + estimate_tokens(user)
+        documents = user.count("<document index=")
+        text = json.dumps([{**INSIGHT, "index": i} for i in range(documents)] if documents else INSIGHT)
+        payload = json.dumps(
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": input_tokens,
+                    "cache_read_input_tokens": cached,
+                    "cache_creation_input_tokens": written,
+                    "output_tokens": estimate_tokens(text),
+                },
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def _client(base_url: str) -> Anthropic:
+    return Anthropic(api_key="bench", base_url=base_url, http_client=httpx.Client(timeout=30), max_retries=0)
+
+
+def _print_usage(label: str, usage: dict) -> None:
+    total = usage["input_tokens"] + usage["cached_input_tokens"] + usage["cache_write_input_tokens"]
+    print(
+        f"  {label:<36} uncached {usage['input_tokens']:>7}  cache read {usage['cached_input_tokens']:>7}  "
+        f"cache write {usage['cache_write_input_tokens']:>6}  ({usage['cached_input_tokens'] / max(total, 1):.0%} cached)"
+    )
+
+
+def run_analysis(base_url: str) -> list[dict]:
+    start = len(FakeCachingMessages.requests)
+    for industry, geography in (("EV Charging", "United States"), ("Cold Chain Logistics", "India")):
+        agent = AnalysisAgent(client=_client(base_url))
+        agent.cache = ExtractionCache(enabled=False)
+        docs = [f"{industry} revenue reached USD {n}.5 billion in 2024, growing 8.{n}% a year. " * 30 for n in range(6)]
+        agent.run(docs[0], industry, geography)
+        agent.run_batch(docs[1:4], industry, geography)
+        agent.run_batch(docs[4:], industry, geography)
+        _print_usage(f"analysis: {industry}", agent.stats)
+    return FakeCachingMessages.requests[start:]
+
+
+def run_market_intel(base_url: str) -> tuple[list[dict], list[dict]]:
+    start = len(FakeCachingMessages.requests)
+    scopes = [
+        ResearchScope("EV Charging", "United States", 2020, 2025),
+        ResearchScope("EV Charging", "United States", 2020, 2025),
+        ResearchScope("Cold Chain Logistics", "India", 2019, 2024),
+    ]
+    usage: list[dict] = []
+    for scope in scopes:
+        engine = ClaudeApiExecutionEngine(client=_client(base_url))
+        engine.execute(build_agent_prompt_packets(scope))
+        usage.extend(engine.usage)
+        totals = defaultdict(int)
+        for call in engine.usage:
+            for key in ("input_tokens", "cached_input_tokens", "cache_write_input_tokens"):
+                totals[key] += call[key]
+        _print_usage(f"market intel: {scope.industry} {scope.start_year}", totals)
+    return FakeCachingMessages.requests[start:], usage
+
+
+def main() -> None:
+    FakeCachingMessages.min_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCachingMessages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"fake provider min cacheable prefix: {FakeCachingMessages.min_tokens} tokens")
+
+    analysis = run_analysis(base_url)
+    market, market_usage = run_market_intel(base_url)
+    server.shutdown()
+
+    assert all(r["beta"] == PROMPT_CACHING_BETA and r["breakpoints"] for r in analysis + market), "caching not requested"
+    prefixes = {tuple(r["blocks"]) for r in analysis}
+    assert len(prefixes) == 1, f"extraction prefix changed across calls: {prefixes}"
+    assert not any(r["user"].startswith("You extract") for r in analysis), "instructions leaked into the suffix"
+    print(f"\nanalysis: {len(analysis)} calls, 1 distinct prefix, ~{analysis[0]['prefix_tokens']} prefix tokens")
+
+    shared = {r["blocks"][0] for r in market}
+    assert len(shared) == 1, f"shared rules block changed across calls: {shared}"
+    first, repeat = market_usage[:6], market_usage[6:12]
+    assert [c["prefix"] for c in first] == [c["prefix"] for c in repeat], "repeated scope sent different prefixes"
+    sizes = sorted(r["prefix_tokens"] for r in market)
+    print(
+        f"market intel: {len(market)} calls, 1 shared-rules block, {len({c['prefix'] for c in market_usage})} distinct "
+        f"full prefixes, ~{sizes[0]}-{sizes[-1]} prefix tokens"
+    )
+    print("prefix bytes stable across calls: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Compare the legacy scorer + full sorts with SourceRanker.top_k as used by _finalize_results.
+
+Both score identically, so the selected sources must match exactly; only the time should differ.
+
+Run from the backend directory: python -m benchmarks.bench_source_ranker [candidate_count]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from app.agents.source_ranker import SourceRanker
+from app.utils.domain_matcher import DomainFlag, classify_host
+
+INDUSTRY = "Electric Vehicle Charging"
+GEOGRAPHY = "United States"
+WORDS = [
+    "market", "size", "forecast", "cagr", "electric", "vehicle", "charging", "united", "states", "growth",
+    "battery", "grid", "policy", "report", "outlook", "trend", "analysis", "regulatory", "station", "fleet",
+    "revenue", "investment", "utility", "network", "adoption", "survey", "news", "quarterly", "results",
+]
+HOSTS = [
+    "www.reuters.com", "www.bloomberg.com", "www.energy.gov", "www.iea.org", "www.statista.com",
+    "www.marketsandmarkets.com", "electrek.co", "www.cnbc.com", "www.oecd.org", "example.com",
+]
+CURATED = [
+    "https://www.worldbank.org/en/topic/industry",
+    "https://www.oecd.org/industry",
+    "https://www.imf.org/en/Publications/WEO",
+    "https://ec.europa.eu/eurostat",
+]
+
+
+def synthetic_candidates(count: int, hosts: list[str], seed: int = 11) -> list[dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        host = rng.choice(hosts)
+        if rng.random() < 0.5:
+            host = f"site{rng.randint(1, count // 4 or 1)}.{host.removeprefix('www.')}"
+        items.append(
+            {
+                "title": " ".join(rng.choices(WORDS, k=rng.randint(4, 10))).title(),
+                "url": f"https://{host}/{'-'.join(rng.choices(WORDS, k=3))}/{i}",
+                "domain": host,
+                "published_at": f"{rng.choice([2021, 2022, 2023, 2024, 2025, 2026])}-0{rng.randint(1, 9)}-01",
+                "snippet": " ".join(rng.choices(WORDS, k=rng.randint(8, 30))),
+            }
+        )
+    return items
+
+
+def curated_fallback(limit: int) -> list[dict]:
+    return [
+        {
+            "title": f"{INDUSTRY} Research Source {idx} ({GEOGRAPHY})",
+            "url": url,
+            "domain": url.split("/")[2],
+            "published_at": "",
+            "snippet": "",
+            "relevance_score": 0.5,
+        }
+        for idx, url in enumerate(CURATED[:limit], start=1)
+    ]
+
+
+def legacy_score(items: list[dict]) -> list[dict]:
+    industry_terms = {t.lower() for t in INDUSTRY.split()}
+    geo_terms = {t.lower() for t in GEOGRAPHY.split()}
+    intent_terms = {"market", "size", "forecast", "cagr", "industry", "analysis", "trend", "regulatory"}
+    year = str(datetime.utcnow().year)
+    scored = []
+    for item in items:
+        text = f"{item['title'].lower()} {item['snippet'].lower()} {item['url'].lower()}"
+        hits = sum(1 for t in industry_terms if t in text)
+        hits += sum(1 for t in geo_terms if t in text)
+        hits += sum(1 for t in intent_terms if t in text)
+        authority = 2 if classify_host(item["domain"]).flags & DomainFlag.AUTHORITY_HINT else 0
+        fresh = 1 if year in str(item.get("published_at", "")) else 0
+        scored.append({**item, "relevance_score": max(0.0, min(1.0, round((hits + authority + fresh) / 18.0, 3)))})
+    return sorted(scored, key=lambda x: x["relevance_score"], reverse=True)
+
+
+def legacy_diversity(items: list[dict], per_domain_limit: int = 2) -> list[dict]:
+    out, counts = [], {}
+    for item in items:
+        if counts.get(item["domain"], 0) >= per_domain_limit:
+            continue
+        out.append(item)
+        counts[item["domain"]] = counts.get(item["domain"], 0) + 1
+    return out
+
+
+def legacy_finalize(items: list[dict], limit: int) -> list[dict]:
+    diversified = legacy_diversity(legacy_score(items))
+    if len(diversified) < max(6, limit // 2):
+        diversified.extend(curated_fallback(limit))
+        seen, deduped = set(), []
+        for item in diversified:
+            key = item["url"].lower().rstrip("/")
+            if key not in seen:
+                seen.add(key)
+                deduped.append(item)
+        diversified = legacy_diversity(legacy_score(deduped))
+    return diversified[:limit]
+
+
+def ranker_finalize(items: list[dict], limit: int) -> list[dict]:
+    return SourceRanker(INDUSTRY, GEOGRAPHY).top_k(
+        items, limit, per_domain_limit=2, min_results=max(6, limit // 2), fallback=lambda: curated_fallback(limit)
+    )
+
+
+def timed(fn, items: list[dict], limit: int, repeats: int) -> tuple[float, list[dict]]:
+    best = float("inf")
+    result: list[dict] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(items, limit)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    limit = 18
+    cases = {
+        "diverse pool": synthetic_candidates(count, HOSTS),
+        # Few distinct domains, so the per-domain cap leaves too few results and the curated fallback kicks in.
+        "fallback pool": synthetic_candidates(count, ["example.com", "www.reuters.com"], seed=3),
+    }
+    for label, items in cases.items():
+        if label == "fallback pool":
+            for item in items:
+                item["domain"] = item["url"].split("/")[2].split(".", 1)[-1]
+        legacy_seconds, legacy = timed(legacy_finalize, items, limit, repeats=3)
+        ranker_seconds, ranked = timed(ranker_finalize, items, limit, repeats=3)
+        overlap = len({x["url"] for x in legacy} & {x["url"] for x in ranked})
+        same = [(x["url"], x["relevance_score"]) for x in legacy] == [(x["url"], x["relevance_score"]) for x in ranked]
+        print(f"\n{label}: {len(items)} candidates, top {limit}")
+        print(f"  legacy score + sort + diversity: {legacy_seconds * 1000:8.1f} ms")
+        print(f"  SourceRanker heap top-k:         {ranker_seconds * 1000:8.1f} ms")
+        print(
+            f"  speedup: {legacy_seconds / ranker_seconds:.2f}x; top-{limit} overlap with legacy: "
+            f"{overlap}/{len(legacy)}, identical order and scores: {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Compare blocking and streamed market-intel agent calls against a local fake Anthropic Messages server.
+
+The fake server answers every agent with its output contract as JSON, followed - like the real model often
+does - by a few hundred tokens of explanatory prose, decoding at a fixed rate per token. One agent's response is
+cut off by max_tokens before its object closes. Blocking mode waits for the whole response; streaming mode feeds
+the text through IncrementalJsonObject, closes the stream when the object closes and keeps the fields of the
+truncated response. Prints time to first usable field and to a complete result per agent, and how many tokens
+the server actually generated before the client hung up.
+
+Run from the backend directory: python -m benchmarks.bench_streaming_cutoff [seconds_per_token]
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from anthropic import Anthropic
+
+from app.agents.analysis_agent import estimate_tokens
+from app.config import settings
+from app.market_intel.contracts import ResearchScope
+from app.market_intel.engines import ClaudeApiExecutionEngine
+from app.market_intel.prompts import build_agent_prompt_packets
+
+TRAILING_PROSE = (
+    "Notes on methodology: the figures above combine published company filings with industry association "
+    "estimates, and where sources disagreed the more conservative value was used. "
+) * 12
+TRUNCATED_AGENT = "validation_credibility"
+CHUNK_CHARS = 16
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+class FakeStreamingMessages(BaseHTTPRequestHandler):
+    seconds_per_token = 0.002
+    generated_tokens = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        contract_block = body["system"][-1]["text"]
+        contract = json.loads(contract_block[contract_block.index("\n") + 1 :])
+        text = json.dumps(contract, indent=1)
+        stop_reason = "end_turn"
+        if "credibility_score" in contract_block:
+            # Simulate a response that runs out of max_tokens inside the last field.
+            text, stop_reason = text[: text.rindex('"assumptions_and_adjustments"') + 60], "max_tokens"
+        else:
+            text = f"{text}\n\n{TRAILING_PROSE}"
+        usage = {"input_tokens": estimate_tokens(json.dumps(body["system"])), "output_tokens": 1}
+        if not body.get("stream"):
+            self._generate(len(text))
+            self._json(body, text, stop_reason, {**usage, "output_tokens": estimate_tokens(text)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        message = {
+            "id": "msg_fake",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": usage,
+        }
+        block = {"type": "text", "text": ""}
+        try:
+            self.wfile.write(_sse("message_start", {"type": "message_start", "message": message}))
+            start_block = {"type": "content_block_start", "index": 0, "content_block": block}
+            self.wfile.write(_sse("content_block_start", start_block))
+            for start in range(0, len(text), CHUNK_CHARS):
+                chunk = text[start : start + CHUNK_CHARS]
+                self._generate(len(chunk))
+                delta = {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": chunk}}
+                self.wfile.write(_sse("content_block_delta", delta))
+                self.wfile.flush()
+            self.wfile.write(_sse("content_block_stop", {"type": "content_block_stop", "index": 0}))
+            final = {
+                "type": "message_delta",
+                "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+                "usage": {"output_tokens": estimate_tokens(text)},
+            }
+            self.wfile.write(_sse("message_delta", final))
+            self.wfile.write(_sse("message_stop", {"type": "message_stop"}))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client closed the stream; generation stops here.
+
+    def _generate(self, chars: int) -> None:
+        tokens = max(1, chars // 4)
+        time.sleep(tokens * self.seconds_per_token)
+        with self.lock:
+            FakeStreamingMessages.generated_tokens += tokens
+
+    def _json(self, body: dict, text: str, stop_reason: str, usage: dict) -> None:
+        payload = json.dumps(
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "stop_sequence": None,
+                "usage": usage,
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def run(base_url: str, streaming: bool) -> tuple[ClaudeApiExecutionEngine, dict, int]:
+    settings.market_intel_streaming = streaming
+    FakeStreamingMessages.generated_tokens = 0
+    client = Anthropic(api_key="bench", base_url=base_url, http_client=httpx.Client(timeout=60), max_retries=0)
+    engine = ClaudeApiExecutionEngine(client=client)
+    results = engine.execute(build_agent_prompt_packets(ResearchScope("EV Charging", "United States", 2020, 2025)))
+    time.sleep(0.2)  # Let the server notice closed streams before reading its counter.
+    return engine, {r.agent_name: r.payload for r in results}, FakeStreamingMessages.generated_tokens
+
+
+def main() -> None:
+    FakeStreamingMessages.seconds_per_token = float(sys.argv[1]) if len(sys.argv) > 1 else 0.002
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStreamingMessages)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    blocking, blocking_payloads, blocking_tokens = run(base_url, streaming=False)
+    streamed, streamed_payloads, streamed_tokens = run(base_url, streaming=True)
+    server.shutdown()
+
+    print(f"{'agent':<26} {'blocking s':>10} {'first field s':>13} {'streamed s':>10} {'cut off':>8}  payload")
+    for before, after in zip(blocking.usage, streamed.usage):
+        name = after["agent_name"]
+        payload = streamed_payloads[name]
+        status = "partial" if payload.get("partial_output") else ("parsed" if "parse_error" not in payload else "error")
+        print(
+            f"{name:<26} {before['complete_seconds']:>10.2f} {after['first_result_seconds'] or 0:>13.2f} "
+            f"{after['complete_seconds']:>10.2f} {str(after['stopped_early']):>8}  {status} "
+            f"(blocking: {'error' if 'parse_error' in blocking_payloads[name] else 'parsed'})"
+        )
+    total_before = sum(u["complete_seconds"] for u in blocking.usage)
+    total_after = sum(u["complete_seconds"] for u in streamed.usage)
+    print(
+        f"\ntotal {total_before:.2f}s -> {total_after:.2f}s; tokens generated {blocking_tokens} -> {streamed_tokens}"
+    )
+
+
+if __name__ == "__main__":
+    main()